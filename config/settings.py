@@ -14,13 +14,88 @@ HF_MODELS = {
     "code": "meta-llama/Llama-3.3-70B-Instruct",
 }
 
+# LLM client pool — one keep-alive connection pool shared by every core/ai caller
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "90"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+
+# Max in-flight requests per model; override per model with "model=cap,model=cap"
+LLM_MODEL_CONCURRENCY = int(os.environ.get("LLM_MODEL_CONCURRENCY", "8"))
+LLM_MODEL_CONCURRENCY_OVERRIDES: dict[str, int] = {
+    name.strip(): int(cap)
+    for name, cap in (
+        item.rsplit("=", 1)
+        for item in os.environ.get("LLM_MODEL_CONCURRENCY_OVERRIDES", "").split(",")
+        if "=" in item
+    )
+}
+
+# Rewrite cache — content-addressed store of rewrite_html LLM results ("off" disables)
+REWRITE_CACHE_PATH = os.environ.get("REWRITE_CACHE_PATH", ".cache/rewrite_cache.sqlite3")
+REWRITE_CACHE_TTL_SECONDS = int(os.environ.get("REWRITE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+REWRITE_CACHE_MAX_ENTRIES = int(os.environ.get("REWRITE_CACHE_MAX_ENTRIES", "5000"))
+
+# Rewrite chunking — source chars per LLM call, and chunks rewritten in parallel
+REWRITE_CHUNK_MAX_CHARS = int(os.environ.get("REWRITE_CHUNK_MAX_CHARS", "1500"))
+REWRITE_CHUNK_CONCURRENCY = int(os.environ.get("REWRITE_CHUNK_CONCURRENCY", "4"))
+
 # Rate limiting: max calls per window
 RATE_LIMIT_MAX_CALLS = int(os.environ.get("RATE_LIMIT_MAX_CALLS", "10"))
 RATE_LIMIT_WINDOW_SECONDS = int(os.environ.get("RATE_LIMIT_WINDOW_SECONDS", "60"))
 
+# Rate limiter memory bounds: max tracked keys (LRU beyond this), idle-key sweep interval
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_SWEEP_SECONDS = int(os.environ.get("RATE_LIMIT_SWEEP_SECONDS", "60"))
+
+# Rate limiter store: "memory" (per process), "sqlite" (shared by workers on a host), "redis"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.environ.get("RATE_LIMIT_SQLITE_PATH", ".cache/rate_limits.sqlite3")
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+
 # Cooldown between AI calls (seconds)
 AI_COOLDOWN_SECONDS = int(os.environ.get("AI_COOLDOWN_SECONDS", "30"))
 
+# db.py read cache — optional SQLite file shared by all workers on a host ("off" = per-process only)
+CACHE_SHARED_PATH = os.environ.get("CACHE_SHARED_PATH", "off")
+# Per-process memory budget for cached Projects (other db caches get a quarter each)
+PROJECT_CACHE_MAX_MB = int(os.environ.get("PROJECT_CACHE_MAX_MB", "64"))
+CACHE_SWEEP_SECONDS = int(os.environ.get("CACHE_SWEEP_SECONDS", "30"))
+
+# Published sites — encoded pages on local disk, shared by workers; row re-checked this often
+PUBLISHED_STORE_PATH = os.environ.get("PUBLISHED_STORE_PATH", ".cache/published")
+PUBLISHED_REVALIDATE_SECONDS = int(os.environ.get("PUBLISHED_REVALIDATE_SECONDS", "300"))
+
+# /raw-asset manifest — content hashes kept between restarts so startup doesn't rehash template/
+RAW_ASSET_MANIFEST_PATH = os.environ.get("RAW_ASSET_MANIFEST_PATH", ".cache/raw_asset_manifest.json")
+
+# Template image derivatives — resized WebP/AVIF copies served by /raw-asset ("off" disables).
+# Formats are offered in order; AVIF is much slower to encode, so it's opt-in.
+# IMAGE_DERIVATIVES_WARM=1 generates them all in a background thread at startup.
+IMAGE_DERIVATIVES_PATH = os.environ.get("IMAGE_DERIVATIVES_PATH", ".cache/derivatives")
+IMAGE_DERIVATIVE_FORMATS = os.environ.get("IMAGE_DERIVATIVE_FORMATS", "webp")
+IMAGE_DERIVATIVES_WARM = os.environ.get("IMAGE_DERIVATIVES_WARM", "0") == "1"
+
+# Build-time template manifest (scripts/build_template_manifest.py), "off" always scans template/
+TEMPLATE_MANIFEST_PATH = os.environ.get("TEMPLATE_MANIFEST_PATH", ".cache/template_manifest.json")
+
+# Shared template blob — immutable per-template artifacts written once by the master
+# process and mmapped by every worker ("off" keeps per-worker caches); TEMPLATE_PRELOAD=0
+# skips building it at startup. Workers keep only this many parsed skeletons in memory.
+TEMPLATE_BLOB_PATH = os.environ.get("TEMPLATE_BLOB_PATH", ".cache/template_blob.bin")
+TEMPLATE_PRELOAD = os.environ.get("TEMPLATE_PRELOAD", "1") == "1"
+TEMPLATE_SKELETON_CACHE = int(os.environ.get("TEMPLATE_SKELETON_CACHE", "32"))
+
+# Pre-rendered template thumbnails (scripts/build_thumbnails.py), "off" disables
+TEMPLATE_THUMBNAILS_PATH = os.environ.get("TEMPLATE_THUMBNAILS_PATH", ".cache/template_thumbnails")
+
+# Static export — a hashed-asset bundle per published version for a static server/CDN ("off" disables);
+# STATIC_EXPORT_BASE_URL is where that directory is served from
+STATIC_EXPORT_PATH = os.environ.get("STATIC_EXPORT_PATH", "off")
+STATIC_EXPORT_BASE_URL = os.environ.get("STATIC_EXPORT_BASE_URL", "/static-sites")
+
 # Supabase
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
@@ -0,0 +1,194 @@
+"""Process-wide LLM client: one pooled, keep-alive connection set for every core/ai caller.
+
+Building an OpenAI client per call means a fresh connection pool and TLS
+handshake to the HF router on every generation. Callers go through
+chat_completion() instead, which reuses a single client and caps the number
+of in-flight requests per model.
+
+achat_completion() is the async twin for request handlers: it awaits the
+HTTP call on the event loop instead of parking a worker thread for the
+whole generation.
+"""
+
+import asyncio
+import threading
+
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+from config.settings import (
+    HF_API_KEY,
+    HF_BASE_URL,
+    LLM_TIMEOUT_SECONDS,
+    LLM_CONNECT_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_MODEL_CONCURRENCY,
+    LLM_MODEL_CONCURRENCY_OVERRIDES,
+)
+
+_client: OpenAI | None = None
+_client_lock = threading.Lock()
+
+_model_slots: dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+_async_client: AsyncOpenAI | None = None
+_async_model_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _timeout(total: float) -> httpx.Timeout:
+    return httpx.Timeout(total, connect=min(LLM_CONNECT_TIMEOUT_SECONDS, total))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def get_client() -> OpenAI:
+    """Return the shared OpenAI-compatible client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    base_url=HF_BASE_URL,
+                    api_key=HF_API_KEY,
+                    max_retries=LLM_MAX_RETRIES,
+                    timeout=_timeout(LLM_TIMEOUT_SECONDS),
+                    http_client=DefaultHttpxClient(
+                        limits=_limits(),
+                        timeout=_timeout(LLM_TIMEOUT_SECONDS),
+                    ),
+                )
+    return _client
+
+
+def model_concurrency(model: str) -> int:
+    """Max in-flight requests allowed for a model."""
+    return max(1, LLM_MODEL_CONCURRENCY_OVERRIDES.get(model, LLM_MODEL_CONCURRENCY))
+
+
+def _model_slot(model: str) -> threading.BoundedSemaphore:
+    slot = _model_slots.get(model)
+    if slot is None:
+        with _slots_lock:
+            slot = _model_slots.setdefault(model, threading.BoundedSemaphore(model_concurrency(model)))
+    return slot
+
+
+def chat_completion(
+    model: str,
+    messages: list[dict],
+    *,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    **params,
+):
+    """
+    Run a chat completion through the shared client.
+
+    Blocks while the model is at its concurrency cap. `timeout` and
+    `max_retries` override the process defaults for this call only; the
+    override shares the same connection pool.
+    """
+    client = _with_overrides(get_client(), timeout, max_retries)
+    with _model_slot(model):
+        return client.chat.completions.create(model=model, messages=messages, **params)
+
+
+def _with_overrides(client, timeout: float | None, max_retries: int | None):
+    if timeout is None and max_retries is None:
+        return client
+    options: dict = {}
+    if timeout is not None:
+        options["timeout"] = _timeout(timeout)
+    if max_retries is not None:
+        options["max_retries"] = max_retries
+    return client.with_options(**options)
+
+
+# ── async ──────────────────────────────────────────────────────────────────
+
+def get_async_client() -> AsyncOpenAI:
+    """Return the shared async client. Must be called from the server's event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            base_url=HF_BASE_URL,
+            api_key=HF_API_KEY,
+            max_retries=LLM_MAX_RETRIES,
+            timeout=_timeout(LLM_TIMEOUT_SECONDS),
+            http_client=DefaultAsyncHttpxClient(
+                limits=_limits(),
+                timeout=_timeout(LLM_TIMEOUT_SECONDS),
+            ),
+        )
+    return _async_client
+
+
+def _async_model_slot(model: str) -> asyncio.Semaphore:
+    slot = _async_model_slots.get(model)
+    if slot is None:
+        slot = _async_model_slots.setdefault(model, asyncio.Semaphore(model_concurrency(model)))
+    return slot
+
+
+async def achat_completion(
+    model: str,
+    messages: list[dict],
+    *,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    **params,
+):
+    """Async chat completion through the shared async client (same caps as chat_completion)."""
+    client = _with_overrides(get_async_client(), timeout, max_retries)
+    async with _async_model_slot(model):
+        return await client.chat.completions.create(model=model, messages=messages, **params)
+
+
+async def astream_chat_completion(
+    model: str,
+    messages: list[dict],
+    *,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    **params,
+):
+    """Yield content deltas of a streamed chat completion. Holds the model slot until the stream ends."""
+    client = _with_overrides(get_async_client(), timeout, max_retries)
+    async with _async_model_slot(model):
+        stream = await client.chat.completions.create(
+            model=model, messages=messages, stream=True, **params
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+
+def close() -> None:
+    """Close pooled sync connections (shutdown / tests). The next call reopens the pool."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose() -> None:
+    """Close pooled async connections. The next call reopens the pool."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+    _async_model_slots.clear()
@@ -3,9 +3,8 @@
 import json
 from pathlib import Path
 
-from openai import OpenAI
-
-from config.settings import HF_API_KEY, HF_MODELS, HF_BASE_URL
+from config.settings import HF_MODELS
+from core.ai.client import chat_completion, achat_completion
 from core.models.brand_memory import BrandMemory
 from core.ai.schemas import SitePlan, SectionPlan, CopyBlock
 from core.errors import AIGenerationError
@@ -51,21 +50,37 @@ def _parse_response(raw: str) -> dict:
         raise AIGenerationError("copy_writer", f"Invalid JSON: {e}") from e
 
 
+def _request(memory: BrandMemory, templates_summary: str) -> dict:
+    """Arguments for chat_completion / achat_completion."""
+    return {
+        "model": HF_MODELS["copy"],
+        "messages": [{"role": "user", "content": _build_prompt(memory, templates_summary)}],
+        "max_retries": 5,
+        "max_tokens": 4000,
+    }
+
+
 def run_copy_writer(memory: BrandMemory, templates_summary: str) -> SitePlan:
     """Call LLM to pick template + write copy. Returns a SitePlan with copy_blocks."""
-    prompt = _build_prompt(memory, templates_summary)
+    try:
+        response = chat_completion(**_request(memory, templates_summary))
+    except Exception as e:
+        raise AIGenerationError("copy_writer", str(e)) from e
 
-    client = OpenAI(base_url=HF_BASE_URL, api_key=HF_API_KEY, max_retries=5)
+    return _build_plan(response.choices[0].message.content, memory)
+
+
+async def run_copy_writer_async(memory: BrandMemory, templates_summary: str) -> SitePlan:
+    """Async variant of run_copy_writer — awaits the LLM instead of blocking a thread."""
     try:
-        response = client.chat.completions.create(
-            model=HF_MODELS["copy"],
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=4000,
-        )
+        response = await achat_completion(**_request(memory, templates_summary))
     except Exception as e:
         raise AIGenerationError("copy_writer", str(e)) from e
 
-    raw_text = response.choices[0].message.content
+    return _build_plan(response.choices[0].message.content, memory)
+
+
+def _build_plan(raw_text: str, memory: BrandMemory) -> SitePlan:
     data = _parse_response(raw_text)
 
     try:
@@ -1,8 +1,7 @@
 from pathlib import Path
 
-from openai import OpenAI
-
-from config.settings import HF_API_KEY, HF_MODELS, HF_BASE_URL
+from config.settings import HF_MODELS
+from core.ai.client import chat_completion, achat_completion
 from core.models.brand_memory import BrandMemory
 from core.ai.schemas import CSSOutput
 from core.errors import AIGenerationError, AIValidationError
@@ -51,20 +50,37 @@ def _validate_css(css: str) -> None:
         raise AIValidationError(issues)
 
 
+def _request(html: str, memory: BrandMemory) -> dict:
+    """Arguments for chat_completion / achat_completion."""
+    return {
+        "model": HF_MODELS["code"],
+        "messages": [{"role": "user", "content": _build_prompt(html, memory)}],
+        "max_retries": 5,
+        "max_tokens": 4000,
+    }
+
+
 def run_css_generator(html: str, memory: BrandMemory) -> CSSOutput:
     """Call LLM via HF Inference (Qwen2.5) to generate CSS."""
-    prompt = _build_prompt(html, memory)
+    try:
+        response = chat_completion(**_request(html, memory))
+    except Exception as e:
+        raise AIGenerationError("css_generator", str(e)) from e
+
+    return _to_output(response.choices[0].message.content)
+
 
-    client = OpenAI(base_url=HF_BASE_URL, api_key=HF_API_KEY, max_retries=5)
+async def run_css_generator_async(html: str, memory: BrandMemory) -> CSSOutput:
+    """Async variant of run_css_generator — awaits the LLM instead of blocking a thread."""
     try:
-        response = client.chat.completions.create(
-            model=HF_MODELS["code"],
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=4000,
-        )
+        response = await achat_completion(**_request(html, memory))
     except Exception as e:
         raise AIGenerationError("css_generator", str(e)) from e
 
-    raw_text = _strip_markdown_fences(response.choices[0].message.content)
+    return _to_output(response.choices[0].message.content)
+
+
+def _to_output(raw: str) -> CSSOutput:
+    raw_text = _strip_markdown_fences(raw)
     _validate_css(raw_text)
     return CSSOutput(css=raw_text)
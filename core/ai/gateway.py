@@ -1,11 +1,12 @@
+import asyncio
 from datetime import datetime, timezone
 
 from core.models.user import User
 from core.models.project import Project
 from core.ai.schemas import SitePlan
-from core.ai.planner import run_planner
-from core.ai.html_generator import run_html_generator
-from core.ai.css_generator import run_css_generator
+from core.ai.planner import run_planner, run_planner_async
+from core.ai.html_generator import run_html_generator, run_html_generator_async
+from core.ai.css_generator import run_css_generator, run_css_generator_async
 from core.models.site_version import SiteVersion
 from core.state_machine.states import ProjectState
 from core.state_machine.engine import transition, transition_to_error
@@ -14,7 +15,7 @@ from core.limits.rate_limits import check_rate_limit, record_call
 from core.limits.cooldowns import check_cooldown
 from core.errors import AIGenerationError, TrialExpiredError
 from core.billing.entitlements import can_generate_site
-from core.ai.copy_writer import run_copy_writer
+from core.ai.copy_writer import run_copy_writer, run_copy_writer_async
 from core.ai.template_loader import get_templates_summary
 from core.ai.template_renderer import render_template
 
@@ -33,33 +34,60 @@ def generate_plan(project: Project, user: User) -> SitePlan:
     Enforces: state -> limits -> cooldown -> rate limit -> AI call -> validate -> increment -> transition.
     The ONLY entry point for planner AI calls.
     """
-    # 1. State check: must be in MEMORY_READY
-    # (transition() will enforce this via is_valid_transition)
+    _check_before_call(project, user, "planner")
+
+    # 5. Call planner
+    try:
+        plan = run_planner(project.brand_memory)
+    except Exception as e:
+        transition_to_error(project)
+        raise AIGenerationError("planner", str(e)) from e
+
+    return _finish_plan(project, user, plan)
+
+
+async def generate_plan_async(project: Project, user: User) -> SitePlan:
+    """Async variant of generate_plan — only the LLM call runs on the event loop.
+
+    Guards and bookkeeping touch the rate-limit backend, so they stay in a thread.
+    """
+    await asyncio.to_thread(_check_before_call, project, user, "planner")
+
+    try:
+        plan = await run_planner_async(project.brand_memory)
+    except Exception as e:
+        transition_to_error(project)
+        raise AIGenerationError("planner", str(e)) from e
+
+    return await asyncio.to_thread(_finish_plan, project, user, plan)
+
+
+def _check_before_call(project: Project, user: User, action: str) -> None:
+    # 1. State check is enforced later by transition() via is_valid_transition
 
     # 2. Trial check (Time-Bomb)
     check_credits(user)
 
     # 3. Limit check
-    check_ai_limit(project.ai_usage, "planner")
+    check_ai_limit(project.ai_usage, action)
 
     # 4. Cooldown & Rate limit checks
     check_cooldown(project.ai_usage)
     check_rate_limit(user.id)
 
-    # 5. Call planner
-    try:
-        plan = run_planner(project.brand_memory)
-    except Exception as e:
-        transition_to_error(project)
-        raise AIGenerationError("planner", str(e)) from e
 
+def _record_usage(project: Project, user: User, action: str) -> None:
+    increment_usage(project.ai_usage, action)
+    project.ai_usage.last_ai_call_at = datetime.now(timezone.utc)
+    record_call(user.id)
+
+
+def _finish_plan(project: Project, user: User, plan: SitePlan) -> SitePlan:
     # 6. Persist plan on project
     project.site_plan = plan
 
     # 7. Increment usage + record call
-    increment_usage(project.ai_usage, "planner")
-    project.ai_usage.last_ai_call_at = datetime.now(timezone.utc)
-    record_call(user.id)
+    _record_usage(project, user, "planner")
 
     # 8. Transition state: MEMORY_READY -> PLAN_READY
     transition(project, ProjectState.PLAN_READY)
@@ -74,15 +102,7 @@ def generate_site(project: Project, user: User) -> SiteVersion:
     Two internal LLM calls (HTML then CSS), but ONE usage increment for the user.
     The ONLY entry point for site generation AI calls.
     """
-    # 1. Trial check (Time-Bomb)
-    check_credits(user)
-
-    # 2. Limit check
-    check_ai_limit(project.ai_usage, "generation")
-
-    # 3. Cooldown & Rate limit checks
-    check_cooldown(project.ai_usage)
-    check_rate_limit(user.id)
+    _check_before_call(project, user, "generation")
 
     # 4. Generate HTML
     try:
@@ -98,19 +118,40 @@ def generate_site(project: Project, user: User) -> SiteVersion:
         transition_to_error(project)
         raise AIGenerationError("css_generator", str(e)) from e
 
+    return _finish_site(project, user, html_output.html, css_output.css)
+
+
+async def generate_site_async(project: Project, user: User) -> SiteVersion:
+    """Async variant of generate_site — only the LLM calls run on the event loop."""
+    await asyncio.to_thread(_check_before_call, project, user, "generation")
+
+    try:
+        html_output = await run_html_generator_async(project.site_plan, project.brand_memory)
+    except Exception as e:
+        transition_to_error(project)
+        raise AIGenerationError("html_generator", str(e)) from e
+
+    try:
+        css_output = await run_css_generator_async(html_output.html, project.brand_memory)
+    except Exception as e:
+        transition_to_error(project)
+        raise AIGenerationError("css_generator", str(e)) from e
+
+    return await asyncio.to_thread(_finish_site, project, user, html_output.html, css_output.css)
+
+
+def _finish_site(project: Project, user: User, html: str, css: str) -> SiteVersion:
     # 6. Create site version
     current_version = project.site_version.version if project.site_version else 0
     site_version = SiteVersion(
-        html=html_output.html,
-        css=css_output.css,
+        html=html,
+        css=css,
         version=current_version + 1,
     )
     project.site_version = site_version
 
     # 7. Increment usage + record call
-    increment_usage(project.ai_usage, "generation")
-    project.ai_usage.last_ai_call_at = datetime.now(timezone.utc)
-    record_call(user.id)
+    _record_usage(project, user, "generation")
 
     # 8. Transition state: PLAN_APPROVED -> SITE_GENERATED
     transition(project, ProjectState.SITE_GENERATED)
@@ -123,15 +164,8 @@ def generate_and_render(project: Project, user: User) -> SiteVersion:
     Template flow: AI picks template + writes copy (1 LLM call), then Jinja2 renders (no LLM).
     Transitions MEMORY_READY -> SITE_GENERATED directly.
     """
-    # 1. Trial check
-    check_credits(user)
-
-    # 2. Limit check (counts as one generation call)
-    check_ai_limit(project.ai_usage, "generation")
-
-    # 3. Cooldown & Rate limit
-    check_cooldown(project.ai_usage)
-    check_rate_limit(user.id)
+    # 1-3. Trial, limit (counts as one generation call), cooldown & rate limit
+    _check_before_call(project, user, "generation")
 
     # 4. Load templates summary
     templates_summary = get_templates_summary()
@@ -143,6 +177,25 @@ def generate_and_render(project: Project, user: User) -> SiteVersion:
         transition_to_error(project)
         raise AIGenerationError("copy_writer", str(e)) from e
 
+    return _render_plan(project, user, plan)
+
+
+async def generate_and_render_async(project: Project, user: User) -> SiteVersion:
+    """Async variant of generate_and_render — the copy writer call is awaited, Jinja rendering runs in a thread."""
+    await asyncio.to_thread(_check_before_call, project, user, "generation")
+
+    templates_summary = await asyncio.to_thread(get_templates_summary)
+
+    try:
+        plan = await run_copy_writer_async(project.brand_memory, templates_summary)
+    except Exception as e:
+        transition_to_error(project)
+        raise AIGenerationError("copy_writer", str(e)) from e
+
+    return await asyncio.to_thread(_render_plan, project, user, plan)
+
+
+def _render_plan(project: Project, user: User, plan: SitePlan) -> SiteVersion:
     # 6. Set plan + template on project
     project.site_plan = plan
     project.template_id = plan.selected_template
@@ -159,9 +212,7 @@ def generate_and_render(project: Project, user: User) -> SiteVersion:
     project.site_version = site_version
 
     # 8. Increment usage + record call
-    increment_usage(project.ai_usage, "generation")
-    project.ai_usage.last_ai_call_at = datetime.now(timezone.utc)
-    record_call(user.id)
+    _record_usage(project, user, "generation")
 
     # 9. Transition: MEMORY_READY -> SITE_GENERATED (shortcut)
     transition(project, ProjectState.SITE_GENERATED)
@@ -2,9 +2,8 @@ import json
 import re
 from pathlib import Path
 
-from openai import OpenAI
-
-from config.settings import HF_API_KEY, HF_MODELS, HF_BASE_URL
+from config.settings import HF_MODELS
+from core.ai.client import chat_completion, achat_completion
 from core.models.brand_memory import BrandMemory
 from core.ai.schemas import SitePlan, HTMLOutput
 from core.errors import AIGenerationError, AIValidationError
@@ -85,21 +84,38 @@ def _validate_html(html: str) -> None:
         raise AIValidationError(issues)
 
 
+def _request(plan: SitePlan, memory: BrandMemory) -> dict:
+    """Arguments for chat_completion / achat_completion."""
+    return {
+        "model": HF_MODELS["code"],
+        "messages": [{"role": "user", "content": _build_prompt(plan, memory)}],
+        "max_retries": 5,
+        "max_tokens": 8000,
+    }
+
+
 def run_html_generator(plan: SitePlan, memory: BrandMemory) -> HTMLOutput:
     """Call LLM via HF Inference (Qwen2.5) to generate HTML."""
-    prompt = _build_prompt(plan, memory)
+    try:
+        response = chat_completion(**_request(plan, memory))
+    except Exception as e:
+        raise AIGenerationError("html_generator", str(e)) from e
+
+    return _to_output(response.choices[0].message.content)
+
 
-    client = OpenAI(base_url=HF_BASE_URL, api_key=HF_API_KEY, max_retries=5)
+async def run_html_generator_async(plan: SitePlan, memory: BrandMemory) -> HTMLOutput:
+    """Async variant of run_html_generator — awaits the LLM instead of blocking a thread."""
     try:
-        response = client.chat.completions.create(
-            model=HF_MODELS["code"],
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=8000,
-        )
+        response = await achat_completion(**_request(plan, memory))
     except Exception as e:
         raise AIGenerationError("html_generator", str(e)) from e
 
-    raw_text = _strip_markdown_fences(response.choices[0].message.content)
+    return _to_output(response.choices[0].message.content)
+
+
+def _to_output(raw: str) -> HTMLOutput:
+    raw_text = _strip_markdown_fences(raw)
     raw_text = _strip_style_tags(raw_text)
     _validate_html(raw_text)
     return HTMLOutput(html=raw_text)
@@ -1,9 +1,8 @@
 import json
 from pathlib import Path
 
-from openai import OpenAI
-
-from config.settings import HF_API_KEY, HF_MODELS, HF_BASE_URL
+from config.settings import HF_MODELS
+from core.ai.client import chat_completion, achat_completion
 from core.models.brand_memory import BrandMemory
 from core.ai.schemas import SitePlan, SectionPlan, validate_site_plan
 from core.errors import AIGenerationError
@@ -67,21 +66,37 @@ def _parse_response(raw: str) -> SitePlan:
     return plan
 
 
+def _request(memory: BrandMemory) -> dict:
+    """Arguments for chat_completion / achat_completion."""
+    return {
+        "model": HF_MODELS["copy"],
+        "messages": [{"role": "user", "content": _build_prompt(memory)}],
+        "max_retries": 5,
+        "max_tokens": 4000,
+    }
+
+
+def _to_plan(raw_text: str) -> SitePlan:
+    plan = _parse_response(raw_text)
+    validate_site_plan(plan)
+    return plan
+
+
 def run_planner(memory: BrandMemory) -> SitePlan:
     """Call LLM via HF Inference (DeepSeek-V3) to generate a site plan."""
-    prompt = _build_prompt(memory)
+    try:
+        response = chat_completion(**_request(memory))
+    except Exception as e:
+        raise AIGenerationError("planner", str(e)) from e
+
+    return _to_plan(response.choices[0].message.content)
+
 
-    client = OpenAI(base_url=HF_BASE_URL, api_key=HF_API_KEY, max_retries=5)
+async def run_planner_async(memory: BrandMemory) -> SitePlan:
+    """Async variant of run_planner — awaits the LLM instead of blocking a thread."""
     try:
-        response = client.chat.completions.create(
-            model=HF_MODELS["copy"],
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=4000,
-        )
+        response = await achat_completion(**_request(memory))
     except Exception as e:
         raise AIGenerationError("planner", str(e)) from e
 
-    raw_text = response.choices[0].message.content
-    plan = _parse_response(raw_text)
-    validate_site_plan(plan)
-    return plan
+    return _to_plan(response.choices[0].message.content)
@@ -0,0 +1,220 @@
+"""Rate-limit storage backends.
+
+    memory  — SlidingWindowLimiter, per process (default; limits multiply with workers)
+    sqlite  — one WAL database file shared by every worker on the host
+    redis   — any Redis-protocol server, shared across hosts
+
+The shared backends count in fixed windows that start at a key's first hit,
+using an atomic increment-with-expiry, so concurrent workers can never both
+slip under the limit. If a shared backend fails, the request is allowed and
+a warning is logged; a rate limiter should never take the site down.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+from config.settings import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_SQLITE_PATH,
+    RATE_LIMIT_REDIS_URL,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_SWEEP_SECONDS,
+)
+from core.limits.sliding_window import SlidingWindowLimiter
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+
+# Delete expired SQLite rows at most once per this many writes
+_PURGE_EVERY = 500
+
+
+class RateLimitBackend(Protocol):
+    def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        """Count a hit; True when the key is over its limit."""
+    def count(self, key: str, window_seconds: float) -> int: ...
+    def record(self, key: str, window_seconds: float) -> None: ...
+    def reset(self, key: str | None = None) -> None: ...
+    def stats(self) -> dict: ...
+
+
+class SQLiteBackend:
+    """Fixed-window counters in a SQLite table; one upsert per hit."""
+
+    def __init__(self, path: str | Path, namespace: str = ""):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.errors = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=5, isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY,"
+            " count INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        count = self._incr(key, window_seconds)
+        return count is not None and count > limit
+
+    def count(self, key: str, window_seconds: float) -> int:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?",
+                    (self._key(key, window_seconds), time.time()),
+                ).fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error as exc:
+            self._failed(exc)
+            return 0
+
+    def record(self, key: str, window_seconds: float) -> None:
+        self._incr(key, window_seconds)
+
+    def reset(self, key: str | None = None) -> None:
+        # Prefix match with substr, not LIKE — "_" and "%" are common in client keys
+        prefix = f"{self.namespace}{key}:" if key is not None else self.namespace
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM rate_limits WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            keys = self._conn.execute(
+                "SELECT COUNT(*) FROM rate_limits WHERE substr(key, 1, ?) = ?",
+                (len(self.namespace), self.namespace),
+            ).fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "keys": keys,
+            "approx_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "errors": self.errors,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _key(self, key: str, window_seconds: float) -> str:
+        return f"{self.namespace}{key}:{window_seconds:g}"
+
+    def _incr(self, key: str, window_seconds: float) -> int | None:
+        now = time.time()
+        try:
+            with self._lock:
+                # A single statement is atomic across every connection to the file
+                (count,) = self._conn.execute(
+                    "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, 1, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET"
+                    "  count = CASE WHEN expires_at <= ? THEN 1 ELSE count + 1 END,"
+                    "  expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END"
+                    " RETURNING count",
+                    (self._key(key, window_seconds), now + window_seconds, now, now),
+                ).fetchone()
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+            return count
+        except sqlite3.Error as exc:
+            self._failed(exc)
+            return None
+
+    def _failed(self, exc: Exception) -> None:
+        self.errors += 1
+        log.warning("[rate_limit] sqlite backend error (allowing request): %s", exc)
+
+
+class RedisBackend:
+    """
+    Fixed-window counters on a Redis-protocol server.
+
+    `client` needs get / delete / scan_iter and pipeline(transaction=True)
+    with set(..., ex=, nx=) / incr / execute — redis-py satisfies this, as
+    does any stand-in implementing the same calls.
+    """
+
+    def __init__(self, client, namespace: str = ""):
+        self.client = client
+        self.namespace = f"rl:{namespace}"
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: str, namespace: str = "") -> "RedisBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url), namespace)
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        count = self._incr(key, window_seconds)
+        return count is not None and count > limit
+
+    def count(self, key: str, window_seconds: float) -> int:
+        try:
+            value = self.client.get(self._key(key, window_seconds))
+            return int(value) if value is not None else 0
+        except Exception as exc:
+            self._failed(exc)
+            return 0
+
+    def record(self, key: str, window_seconds: float) -> None:
+        self._incr(key, window_seconds)
+
+    def reset(self, key: str | None = None) -> None:
+        pattern = f"{self.namespace}{key}:*" if key is not None else f"{self.namespace}*"
+        keys = list(self.client.scan_iter(match=pattern))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "errors": self.errors}
+
+    def _key(self, key: str, window_seconds: float) -> str:
+        return f"{self.namespace}{key}:{window_seconds:g}"
+
+    def _incr(self, key: str, window_seconds: float) -> int | None:
+        redis_key = self._key(key, window_seconds)
+        try:
+            # SET NX starts the window with its expiry; INCR keeps the TTL
+            pipe = self.client.pipeline(transaction=True)
+            pipe.set(redis_key, 0, ex=max(1, int(window_seconds)), nx=True)
+            pipe.incr(redis_key)
+            return int(pipe.execute()[-1])
+        except Exception as exc:
+            self._failed(exc)
+            return None
+
+    def _failed(self, exc: Exception) -> None:
+        self.errors += 1
+        log.warning("[rate_limit] redis backend error (allowing request): %s", exc)
+
+
+def make_backend(namespace: str) -> RateLimitBackend:
+    """Backend selected by RATE_LIMIT_BACKEND. `namespace` keeps limiters sharing a store apart."""
+    name = RATE_LIMIT_BACKEND.lower()
+    if name == "sqlite":
+        path = Path(RATE_LIMIT_SQLITE_PATH)
+        if not path.is_absolute():
+            path = _ROOT / path
+        return SQLiteBackend(path, namespace=f"{namespace}:")
+    if name == "redis":
+        return RedisBackend.from_url(RATE_LIMIT_REDIS_URL, namespace=f"{namespace}:")
+    if name != "memory":
+        log.warning("[rate_limit] unknown RATE_LIMIT_BACKEND=%r — using memory", RATE_LIMIT_BACKEND)
+    return SlidingWindowLimiter(RATE_LIMIT_MAX_KEYS, RATE_LIMIT_SWEEP_SECONDS)
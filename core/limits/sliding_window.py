@@ -0,0 +1,113 @@
+"""Bounded in-memory sliding-window counters.
+
+Each key keeps a deque of hit timestamps, pruned from the left in O(1).
+Keys live in LRU order under a hard cap, and idle keys (no hit within their
+window) are swept out periodically, so per-visitor keys such as
+"site:{ip}" cannot accumulate forever.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class SlidingWindowLimiter:
+    def __init__(self, max_keys: int, sweep_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # {key: (window_seconds, deque[monotonic_timestamp])}, least recently used first
+        self._keys: OrderedDict[str, tuple[float, deque]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        """Record a hit unless the key is at its limit. Returns True when limited."""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._window(key, window_seconds, now)
+            if len(hits) >= limit:
+                return True
+            hits.append(now)
+            return False
+
+    def count(self, key: str, window_seconds: float) -> int:
+        """Hits recorded for key within the window."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                return 0
+            return len(self._prune(entry[1], now - window_seconds))
+
+    def record(self, key: str, window_seconds: float) -> None:
+        """Record a hit without checking a limit."""
+        now = time.monotonic()
+        with self._lock:
+            self._window(key, window_seconds, now).append(now)
+
+    def reset(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(key, None)
+
+    def stats(self) -> dict:
+        """Key count, stored timestamps, approximate memory, and eviction counters."""
+        with self._lock:
+            timestamps = sum(len(hits) for _, hits in self._keys.values())
+            approx_bytes = sys.getsizeof(self._keys) + sum(
+                sys.getsizeof(key) + sys.getsizeof(hits) + 24 * len(hits)
+                for key, (_, hits) in self._keys.items()
+            )
+            return {
+                "backend": "memory",
+                "keys": len(self._keys),
+                "max_keys": self.max_keys,
+                "timestamps": timestamps,
+                "approx_bytes": approx_bytes,
+                "evicted_idle": self.evicted_idle,
+                "evicted_lru": self.evicted_lru,
+            }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ── internals (caller holds the lock) ──────────────────────────────────
+
+    def _window(self, key: str, window_seconds: float, now: float) -> deque:
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = (window_seconds, deque())
+            self._keys[key] = entry
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self.evicted_lru += 1
+        else:
+            self._keys.move_to_end(key)
+            if entry[0] != window_seconds:
+                entry = (max(entry[0], window_seconds), entry[1])
+                self._keys[key] = entry
+        return self._prune(entry[1], now - window_seconds)
+
+    @staticmethod
+    def _prune(hits: deque, cutoff: float) -> deque:
+        while hits and hits[0] < cutoff:
+            hits.popleft()
+        return hits
+
+    def _sweep(self, now: float) -> None:
+        idle = [
+            key for key, (window, hits) in self._keys.items()
+            if not hits or hits[-1] <= now - window
+        ]
+        for key in idle:
+            del self._keys[key]
+        self.evicted_idle += len(idle)
+        self._next_sweep = now + self.sweep_interval
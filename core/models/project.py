@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import Callable, ClassVar
 
 from core.state_machine.states import ProjectState
 from core.models.brand_memory import BrandMemory
@@ -8,6 +9,45 @@ from core.models.site_version import SiteVersion
 from core.ai.schemas import SitePlan
 
 
+class _NotLoaded:
+    """Marker for a field the db layer left out of its SELECT."""
+
+    def __repr__(self) -> str:
+        return "NOT_LOADED"
+
+    def __reduce__(self):
+        return "NOT_LOADED"  # unpickles to the module singleton
+
+
+NOT_LOADED = _NotLoaded()
+
+
+class _Lazy:
+    """
+    Field that may hold NOT_LOADED: the first read calls Project.lazy_loader
+    and keeps the result, so the column is only fetched when it is used.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.attr = f"_{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return None  # dataclass default
+        value = obj.__dict__.get(self.attr)
+        if value is NOT_LOADED:
+            loader = type(obj).lazy_loader
+            value = loader(obj, self.name) if loader else None
+            obj.__dict__[self.attr] = value
+        return value
+
+    def __set__(self, obj, value) -> None:
+        if value is self:
+            value = None  # __init__ passes the field default through as-is
+        obj.__dict__[self.attr] = value
+
+
 @dataclass
 class Project:
     id: str
@@ -16,8 +56,16 @@ class Project:
     brand_memory: BrandMemory | None = None
     ai_usage: AIUsage = field(default_factory=AIUsage)
     site_plan: SitePlan | None = None
-    site_version: SiteVersion | None = None
+    # The page HTML — usually most of the row, so db.get_project loads it lazily
+    site_version: SiteVersion | None = field(default=_Lazy("site_version"), repr=False)
     template_id: str | None = None
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     published_at: datetime | None = None
+
+    # (project, field name) -> value; installed by user_app.db
+    lazy_loader: ClassVar[Callable[["Project", str], object] | None] = None
+
+    def is_loaded(self, name: str) -> bool:
+        """False while a lazy field is still NOT_LOADED."""
+        return self.__dict__.get(f"_{name}", None) is not NOT_LOADED
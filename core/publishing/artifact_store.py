@@ -0,0 +1,138 @@
+"""
+Local disk copy of published SiteArtifacts, shared by every worker on a host.
+
+Layout per page:
+
+    {root}/{page_id}/v{version}.html      identity body
+    {root}/{page_id}/v{version}.html.gz   gzip body
+    {root}/{page_id}/v{version}.html.br   brotli body (when available)
+    {root}/{page_id}/CURRENT              {"version", "etag", "encodings", "source"}
+
+CURRENT is replaced atomically after the bodies are written, so readers
+never see a half-published version. Its (inode, mtime) is the store's
+stamp: a stat() is enough to tell whether a cached copy is still current.
+Bodies are mmapped read-only, so however many workers serve a site the
+bytes live once, in the OS page cache. "source" is an opaque marker of the
+row the artifact was built from (the page's updated_at), for revalidation.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import shutil
+from pathlib import Path
+
+from core.publishing.artifacts import SiteArtifact
+
+log = logging.getLogger(__name__)
+
+# (st_ino, st_mtime_ns) of CURRENT
+Stamp = tuple[int, int]
+
+_PAGE_ID_RE = re.compile(r"[\w-]+")
+_SUFFIXES = {"identity": ".html", "gzip": ".html.gz", "br": ".html.br"}
+
+
+class ArtifactStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def stamp(self, page_id: str) -> Stamp | None:
+        """Stamp of the page's current artifact, or None when there is none."""
+        path = self._pointer(page_id)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def get(self, page_id: str) -> tuple[Stamp, SiteArtifact] | None:
+        """The current artifact with mmapped bodies, and the stamp it was read at."""
+        path = self._pointer(page_id)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                meta = json.loads(f.read())
+            version = int(meta["version"])
+            bodies = {
+                coding: _map(path.parent / f"v{version}{_SUFFIXES[coding]}")
+                for coding in meta["encodings"]
+            }
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("[artifact_store] unreadable artifact for %s: %s", page_id, exc)
+            return None
+        return (st.st_ino, st.st_mtime_ns), SiteArtifact(version=version, etag=meta["etag"], bodies=bodies)
+
+    def source(self, page_id: str) -> str | None:
+        """The source marker the current artifact was stored with, or None."""
+        path = self._pointer(page_id)
+        if path is None:
+            return None
+        try:
+            return json.loads(path.read_bytes()).get("source")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def put(self, page_id: str, artifact: SiteArtifact, source: str | None = None) -> None:
+        """Write the bodies, switch CURRENT to them, then delete older versions."""
+        pointer = self._pointer(page_id)
+        if pointer is None:
+            raise ValueError(f"invalid page id {page_id!r}")
+        page_dir = pointer.parent
+        page_dir.mkdir(parents=True, exist_ok=True)
+
+        keep = {"CURRENT"}
+        for coding, body in artifact.bodies.items():
+            name = f"v{artifact.version}{_SUFFIXES[coding]}"
+            _write_atomic(page_dir / name, bytes(body))
+            keep.add(name)
+        meta = {
+            "version": artifact.version,
+            "etag": artifact.etag,
+            "encodings": sorted(artifact.bodies),
+            "source": source,
+        }
+        _write_atomic(pointer, json.dumps(meta).encode())
+
+        for old in page_dir.iterdir():
+            if old.name not in keep and not old.name.startswith("."):
+                old.unlink(missing_ok=True)
+
+    def touch(self, page_id: str) -> None:
+        """Mark the current artifact as revalidated now."""
+        path = self._pointer(page_id)
+        if path is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def drop(self, page_id: str) -> None:
+        path = self._pointer(page_id)
+        if path is not None and path.parent.exists():
+            shutil.rmtree(path.parent, ignore_errors=True)
+
+    def _pointer(self, page_id: str) -> Path | None:
+        if not page_id or not _PAGE_ID_RE.fullmatch(page_id):
+            return None
+        return self.root / page_id / "CURRENT"
+
+
+def _map(path: Path):
+    """Read-only view of a file's bytes (mmapped; b"" for an empty file)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -0,0 +1,108 @@
+"""
+Pre-encoded bodies for one published site version.
+
+A published page only changes when its site_version does, so the rendered
+HTML, its strong ETag and the gzip / brotli encodings are computed once per
+version and served as-is. Each encoding is its own representation, so it is
+served under its own ETag (see coding_etag). Brotli needs the optional `brotli` package; without
+it only gzip and identity are offered.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+
+from core.publishing.renderer import render_final_page
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+# Preferred first when the client accepts several
+_ENCODINGS = ("br", "gzip")
+_ETAG_SUFFIXES = {"gzip": "-gz", "br": "-br"}
+
+
+@dataclass(frozen=True)
+class SiteArtifact:
+    version: int
+    etag: str  # of the identity body; see etag_for
+    bodies: dict[str, bytes]  # {"identity": ..., "gzip": ..., "br": ...}
+
+    def negotiate(self, accept_encoding: str) -> tuple[str, bytes]:
+        """(content-coding, body) for an Accept-Encoding header value."""
+        coding = pick_coding(accept_encoding, self.bodies)
+        return coding, self.bodies[coding]
+
+    def etag_for(self, coding: str) -> str:
+        """ETag of the body served with this content-coding."""
+        return coding_etag(self.etag, coding)
+
+    def matches(self, if_none_match: str, coding: str = "identity") -> bool:
+        """True when an If-None-Match header value covers the ETag of that coding's body."""
+        return etag_matches(if_none_match, self.etag_for(coding))
+
+
+def build_site_artifact(html: str, css: str, version: int) -> SiteArtifact:
+    """Render the page and encode it every way we serve it."""
+    return encode_site(render_final_page(html, css), version)
+
+
+def encode_site(rendered_html: str, version: int) -> SiteArtifact:
+    """Encode an already rendered page."""
+    body = rendered_html.encode("utf-8")
+    bodies = {
+        "identity": body,
+        # mtime=0 keeps the bytes (and anything hashed from them) deterministic
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+    etag = f'"v{version}-{hashlib.sha256(body).hexdigest()[:32]}"'
+    return SiteArtifact(version=version, etag=etag, bodies=bodies)
+
+
+# ── HTTP helpers (shared with /raw-asset) ──────────────────────────────────
+
+def pick_coding(accept_encoding: str, available) -> str:
+    """Best of br/gzip that the client accepts and available has, else "identity"."""
+    accepted = accepted_codings(accept_encoding)
+    return next((c for c in _ENCODINGS if c in accepted and c in available), "identity")
+
+
+def coding_etag(etag: str, coding: str) -> str:
+    """
+    ETag for one content-coding of a representation: '"<tag>-gz"' / '"<tag>-br"'.
+    Identity keeps the plain tag — the encoded bodies differ byte for byte,
+    so they must not share a strong ETag with it or with each other.
+    """
+    suffix = _ETAG_SUFFIXES.get(coding)
+    if suffix is None or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}{suffix}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True when an If-None-Match header value covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+def accepted_codings(header: str) -> set[str]:
+    """Content-codings an Accept-Encoding value allows — exact tokens, q=0 excluded."""
+    accepted = set()
+    for item in header.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip())
+    return accepted
@@ -0,0 +1,182 @@
+"""
+Static export of published pages — a self-contained bundle per version
+that any static file server or CDN can serve without the Python workers.
+
+    {root}/{page_id}/v{version}/index.html           (+ .gz, .br)
+    {root}/{page_id}/v{version}/styles.<hash>.css    (+ .gz)
+    {root}/{page_id}/v{version}/assets/<name>.<hash><ext>
+    {root}/{page_id}/current -> v{version}
+
+The head's inline <style> blocks become one fingerprinted stylesheet, and
+every /raw-asset/ reference (HTML and CSS) is hard-linked (or copied) into
+assets/ under a content-hashed name, so everything but index.html can be
+served with `Cache-Control: immutable`. srcset entries (/raw-asset/...?w=N)
+get the resized derivative, kept in the original's format since a static
+server can't negotiate on Accept. `current` is swapped atomically
+once the bundle is complete.
+
+So index.html is not byte-identical to what /sites/<page_id> serves: it
+starts from the same rendered page, but styles are external and asset URLs
+point into the bundle. What holds is that the bundle renders the same page.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+
+from core.publishing.artifacts import encode_site
+from core.raw_template import derivatives
+from core.raw_template.asset_manifest import get_manifest
+
+log = logging.getLogger(__name__)
+
+_HEAD_RE = re.compile(r"<head\b[^>]*>(.*?)</head>", re.IGNORECASE | re.DOTALL)
+_STYLE_RE = re.compile(r"<style\b[^>]*>(.*?)</style>\s*", re.IGNORECASE | re.DOTALL)
+_RAW_ASSET_RE = re.compile(r"/raw-asset/([^\"'()\s?#]+)(?:\?w=(\d+))?")
+
+
+def export_site(
+    rendered_html: str,
+    page_id: str,
+    version: int,
+    out_root: str | Path,
+    template_root: str | Path,
+    base_url: str = "",
+) -> Path:
+    """
+    Write the bundle for one published version and point `current` at it.
+
+    base_url is where out_root is served from (e.g. "https://cdn.example.com/sites");
+    stylesheet and asset URLs are absolute and versioned under it, so the
+    page works whether it is reached as .../{page_id}, .../{page_id}/ or
+    .../{page_id}/current/index.html. Returns the bundle dir.
+    """
+    if not re.fullmatch(r"[\w-]+", page_id or ""):
+        raise ValueError(f"invalid page id {page_id!r}")
+    page_dir = Path(out_root) / page_id
+    bundle = page_dir / f"v{version}"
+    tmp = page_dir / f".v{version}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    (tmp / "assets").mkdir(parents=True)
+
+    url_prefix = f"{base_url.rstrip('/')}/{page_id}/v{version}"
+    assets = _AssetLinker(Path(template_root), tmp / "assets", f"{url_prefix}/assets")
+    html, css = _extract_head_css(rendered_html)
+    if css:
+        css = _RAW_ASSET_RE.sub(assets.rewrite, css)
+        css_name = f"styles.{_digest(css.encode())}.css"
+        _write(tmp / css_name, css.encode("utf-8"), compress=True)
+        html = html.replace(_CSS_LINK_MARKER, f'<link rel="stylesheet" href="{url_prefix}/{css_name}">\n', 1)
+    html = _RAW_ASSET_RE.sub(assets.rewrite, html)
+
+    artifact = encode_site(html, version)
+    (tmp / "index.html").write_bytes(artifact.bodies["identity"])
+    for coding, suffix in (("gzip", ".gz"), ("br", ".br")):
+        if coding in artifact.bodies:
+            (tmp / f"index.html{suffix}").write_bytes(artifact.bodies[coding])
+
+    shutil.rmtree(bundle, ignore_errors=True)
+    os.replace(tmp, bundle)
+    _point_current(page_dir, bundle.name)
+    log.info("[static_export] %s v%d — %d assets, css %s", page_id, version, assets.count, bool(css))
+    return bundle
+
+
+def remove_export(out_root: str | Path, page_id: str) -> None:
+    """Delete every exported version of a page."""
+    if re.fullmatch(r"[\w-]+", page_id or ""):
+        shutil.rmtree(Path(out_root) / page_id, ignore_errors=True)
+
+
+# ── internals ──────────────────────────────────────────────────────────────
+
+_CSS_LINK_MARKER = "\x00okenaba-css\x00"
+
+
+def _extract_head_css(html: str) -> tuple[str, str]:
+    """Move the head's <style> blocks into one stylesheet, marking where the first one was."""
+    head = _HEAD_RE.search(html)
+    if head is None:
+        return html, ""
+    blocks: list[str] = []
+
+    def _take(m: re.Match) -> str:
+        blocks.append(m.group(1).strip("\n"))
+        return _CSS_LINK_MARKER if len(blocks) == 1 else ""
+
+    inner = _STYLE_RE.sub(_take, head.group(1))
+    if not blocks:
+        return html, ""
+    html = html[:head.start(1)] + inner + html[head.end(1):]
+    return html, "\n".join(blocks) + "\n"
+
+
+class _AssetLinker:
+    """Rewrites /raw-asset/ URLs to {url_prefix}/<name>.<hash><ext>, linking each file in once."""
+
+    def __init__(self, template_root: Path, dest: Path, url_prefix: str):
+        self.template_root = template_root.resolve()
+        self.dest = dest
+        self.url_prefix = url_prefix
+        self.count = 0
+        self._done: dict[str, str] = {}
+
+    def rewrite(self, m: re.Match) -> str:
+        rel, width = m.group(1), m.group(2)
+        key = f"{rel}?w={width}" if width else rel
+        if key not in self._done:
+            self._done[key] = self._link(rel, int(width) if width else None) or m.group(0)
+        return self._done[key]
+
+    def _link(self, rel: str, width: int | None = None) -> str | None:
+        src = (self.template_root / rel).resolve()
+        if not src.is_file() or not src.is_relative_to(self.template_root):
+            log.warning("[static_export] missing asset /raw-asset/%s — left as-is", rel)
+            return None
+        stem = src.stem
+        if width:
+            resized = _resized(rel, width)
+            if resized is None:
+                return self._link(rel)
+            src, stem = Path(resized[0]), f"{stem}-{resized[1]}"
+        with open(src, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()[:12]
+        name = f"{stem}.{digest}{src.suffix}"
+        target = self.dest / name
+        if not target.exists():
+            try:
+                os.link(src, target)
+            except OSError:  # different filesystem, or links unsupported
+                shutil.copy2(src, target)
+            self.count += 1
+        return f"{self.url_prefix}/{name}"
+
+
+def _resized(rel: str, width: int) -> tuple[str, int] | None:
+    """(path, width) of the template image at rel scaled to width's bucket, in its own format."""
+    entry = get_manifest().get(rel)
+    choice = derivatives.choose(entry, width, "") if entry is not None else None
+    derived = derivatives.ensure(entry, *choice) if choice is not None else None
+    return (derived.path, choice[0]) if derived is not None else None
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write(path: Path, data: bytes, compress: bool = False) -> None:
+    path.write_bytes(data)
+    if compress:
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def _point_current(page_dir: Path, target: str) -> None:
+    link = page_dir / "current"
+    tmp = page_dir / f".current.{os.getpid()}.tmp"
+    tmp.unlink(missing_ok=True)
+    os.symlink(target, tmp)
+    os.replace(tmp, link)
@@ -25,3 +25,27 @@ def upload_site(storage_client, project_id: str, version: int, rendered_html: st
     )
 
     return path
+
+
+def upload_site_encodings(storage_client, storage_path: str, artifact, bucket: str) -> list[str]:
+    """
+    Upload the pre-compressed bodies of a SiteArtifact next to the HTML
+    (index.html.gz, index.html.br), so a static host or CDN can serve them
+    without recompressing.
+
+    Returns:
+        The storage paths written
+    """
+    suffixes = {"gzip": ".gz", "br": ".br"}
+    paths = []
+    for coding, suffix in suffixes.items():
+        body = artifact.bodies.get(coding)
+        if body is None:
+            continue
+        storage_client.from_(bucket).upload(
+            path=storage_path + suffix,
+            file=body,
+            file_options={"content-type": "text/html", "upsert": "true"},
+        )
+        paths.append(storage_path + suffix)
+    return paths
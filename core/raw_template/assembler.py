@@ -1,23 +1,19 @@
 """Assemble the final HTML: inject images, inline CSS/JS, fix asset paths."""
 
 import re
-from pathlib import Path
 from functools import lru_cache
 
-from core.raw_template.slot_analyzer import detect_slot, _CSS_URL_RE as _SLOT_CSS_URL_RE
-
-
-@lru_cache(maxsize=128)
-def _read_file(path: str) -> str:
-    """Cached disk read — template files never change at runtime."""
-    p = Path(path)
-    return p.read_text(encoding="utf-8", errors="ignore") if p.exists() else ""
+from core.raw_template.derivatives import srcset, template_widths
+from core.raw_template.slot_analyzer import detect_slot, display_sizes, _CSS_URL_RE as _SLOT_CSS_URL_RE
+from core.raw_template.template_blob import read_template_file as _read_file
 
 _IMG_SRC_RE = re.compile(
     r'(<img\b[^>]*\bsrc=["\'])assets/([^"\']+)(["\'][^>]*/?>)',
     re.IGNORECASE | re.DOTALL,
 )
 _ALT_RE    = re.compile(r'\balt=["\']([^"\']*)["\']', re.IGNORECASE)
+_SIZES_RE  = re.compile(r'(?<![\w-])sizes\s*=', re.IGNORECASE)
+_WIDTH_RE  = re.compile(r'(?<![\w-])width=["\']?(\d+)(?:px)?["\']?(?=[\s/>])', re.IGNORECASE)
 _LINK_RE   = re.compile(
     r'<link\b[^>]*\bhref=["\'][^"\']*styles\.css["\'][^>]*/?>(\s*</link>)?',
     re.IGNORECASE,
@@ -27,6 +23,47 @@ _JS_TAG_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Everything assemble() touches, matched in one left-to-right scan
+_ASSEMBLE_RE = re.compile(
+    r'(?P<img>' + _IMG_SRC_RE.pattern + r')'
+    r'|(?P<link>' + _LINK_RE.pattern + r')'
+    r'|(?P<js>' + _JS_TAG_RE.pattern + r')'
+    r'|(?P<head></head>)'
+    r'|(?P<body></body>)',
+    re.IGNORECASE | re.DOTALL,
+)
+_IMG_GROUP = _ASSEMBLE_RE.groupindex["img"]
+
+
+class PageBuilder:
+    """
+    Output fragments of one page, tagged by origin.
+
+    Pieces are only joined once, in html(); byte_counts() reports the UTF-8
+    size contributed by each kind ("html", "text", "css", "js", "extra").
+    """
+
+    __slots__ = ("_parts", "_kinds")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._kinds: list[str] = []
+
+    def add(self, fragment: str, kind: str = "html") -> None:
+        if fragment:
+            self._parts.append(fragment)
+            self._kinds.append(kind)
+
+    def html(self) -> str:
+        return "".join(self._parts)
+
+    def byte_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for fragment, kind in zip(self._parts, self._kinds):
+            counts[kind] = counts.get(kind, 0) + len(fragment.encode("utf-8"))
+        counts["total"] = sum(counts.values())
+        return counts
+
 
 def assemble(
     template: dict,
@@ -35,74 +72,171 @@ def assemble(
     base_asset_url: str = "/raw-asset",
     primary_color: str = "",
     secondary_color: str = "",
+    body_extra: str = "",
 ) -> str:
     """
     1. Replace img src with uploaded URLs or absolute asset routes.
     2. Inline CSS (fix url() references).
     3. Override :root color variables with user's brand colors.
-    4. Inline JS.
+    4. Inline JS, then body_extra (e.g. a contact footer) before </body>.
     5. Return self-contained HTML string.
     """
-    html = rewritten_html
+    return assemble_page(
+        template, rewritten_html, image_map, base_asset_url,
+        primary_color, secondary_color, body_extra,
+    ).html()
+
+
+def assemble_page(
+    template: dict,
+    rewritten_html: str,
+    image_map: dict[str, str],
+    base_asset_url: str = "/raw-asset",
+    primary_color: str = "",
+    secondary_color: str = "",
+    body_extra: str = "",
+) -> PageBuilder:
+    """assemble() as an unjoined PageBuilder — one scan over rewritten_html."""
+    asset_base = f"{base_asset_url}/{template['id']}/assets"
+    css_parts = _split_css(template["css_path"])
+    js = _read_file(template["js_path"])
+
+    page = PageBuilder()
+    head_done = body_done = False
+    pos = 0
+    for m in _ASSEMBLE_RE.finditer(rewritten_html):
+        kind = m.lastgroup
+        if kind == "img":
+            prefix, filename, suffix = m.group(_IMG_GROUP + 1, _IMG_GROUP + 2, _IMG_GROUP + 3)
+            alt_m = _ALT_RE.search(m.group(0))
+            alt = (alt_m.group(1) if alt_m else "").lower()
+            slot = detect_slot(alt, filename)
+            url = _uploaded_url(image_map, filename, slot)
+            widths, sizes = (), ""
+            if not url:
+                url = f"{asset_base}/{filename}"
+                widths = _srcset_widths(template["id"], m.group(0), filename)
+                sizes = _srcset_sizes(m.group(0), slot) if widths else ""
+            page.add(rewritten_html[pos:m.start()])
+            page.add(img_tag(prefix, url, suffix, widths, sizes))
+        elif kind == "link":
+            # Only drop the external stylesheet when we have one to inline
+            if not css_parts:
+                continue
+            page.add(rewritten_html[pos:m.start()])
+        elif kind == "js":
+            if not js:
+                continue
+            page.add(rewritten_html[pos:m.start()])
+        elif kind == "head":
+            if head_done or m.group(0) != "</head>":
+                continue
+            head_done = True
+            page.add(rewritten_html[pos:m.start()])
+            add_head_end(page, css_parts, image_map, asset_base, primary_color, secondary_color)
+        else:
+            if body_done or m.group(0) != "</body>":
+                continue
+            body_done = True
+            page.add(rewritten_html[pos:m.start()])
+            add_body_end(page, js, body_extra)
+        pos = m.end()
+    page.add(rewritten_html[pos:])
+    return page
+
+
+# ── fragments shared with skeleton.py ──────────────────────────────────────
+
+@lru_cache(maxsize=128)
+def _split_css(css_path: str) -> tuple:
+    """Stylesheet as literals interleaved with (filename, stem, slot) url(assets/...) holes."""
+    css = _read_file(css_path)
+    parts: list = []
+    pos = 0
+    for m in _SLOT_CSS_URL_RE.finditer(css):
+        filename = m.group(1)
+        parts.append(css[pos:m.start()])
+        parts.append((filename, filename.lower().rsplit(".", 1)[0], detect_slot("", filename)))
+        pos = m.end()
+    parts.append(css[pos:])
+    return tuple(p for p in parts if p != "")
+
 
-    html = _inject_images(html, image_map, template["id"], base_asset_url)
-    html = _inline_css(html, template, base_asset_url, image_map)
+def add_head_end(
+    page: PageBuilder,
+    css_parts: tuple,
+    image_map: dict,
+    asset_base: str,
+    primary_color: str,
+    secondary_color: str,
+) -> None:
+    """Inlined stylesheet, brand color override, then </head>."""
+    if css_parts:
+        page.add("<style>\n", "css")
+        for part in css_parts:
+            if type(part) is str:
+                page.add(part, "css")
+            else:
+                filename, stem, slot = part
+                url = (image_map.get(stem) or image_map.get(slot)) if image_map else None
+                page.add(f'url("{url or f"{asset_base}/{filename}"}")', "css")
+        page.add("\n</style>\n", "css")
     if primary_color:
-        html = _inject_color_override(html, primary_color, secondary_color)
-    html = _inline_js(html, template)
+        page.add(_color_override(primary_color, secondary_color), "extra")
+    page.add("</head>")
 
-    return html
 
+def add_body_end(page: PageBuilder, js: str, body_extra: str) -> None:
+    """Inlined JS, body_extra, then </body>."""
+    if js:
+        page.add(f"<script>\n{js}\n</script>\n", "js")
+    if body_extra:
+        page.add(body_extra + "\n", "extra")
+    page.add("</body>")
 
-# ── helpers ────────────────────────────────────────────────────────────────
 
-def _inject_images(html: str, image_map: dict, tpl_id: str, base: str) -> str:
-    def _replace(m):
-        prefix   = m.group(1)
-        filename = m.group(2)
-        suffix   = m.group(3)
-        alt_m    = _ALT_RE.search(m.group(0))
-        alt      = (alt_m.group(1) if alt_m else "").lower()
-
-        # Exact stem match first (e.g. "musthave-3" → user's uploaded photo #3)
-        # then fall back to slot-type match (e.g. "musthave" → single upload for all)
-        stem = filename.lower().rsplit(".", 1)[0]
-        slot = detect_slot(alt, filename)
-        url  = image_map.get(stem) or image_map.get(slot) or f"{base}/{tpl_id}/assets/{filename}"
+def img_tag(prefix: str, url: str, suffix: str, widths: tuple[int, ...], sizes: str = "") -> str:
+    """
+    The <img> with its src set — plus a srcset over the resized derivatives
+    when widths is given, and sizes so browsers don't assume 100vw.
+    """
+    if not widths:
         return f"{prefix}{url}{suffix}"
+    quote = suffix[0]
+    extra = f" sizes={quote}{sizes}{quote}" if sizes else ""
+    return f"{prefix}{url}{quote} srcset={quote}{srcset(url, widths)}{quote}{extra}{suffix[1:]}"
 
-    return _IMG_SRC_RE.sub(_replace, html)
 
+# ── helpers ────────────────────────────────────────────────────────────────
 
-def _inline_css(html: str, template: dict, base: str, image_map: dict | None = None) -> str:
-    css_path = template["css_path"]
-    css = _read_file(css_path)
-    if not css:
-        return html
+def _srcset_widths(template_id: str, tag: str, filename: str) -> tuple[int, ...]:
+    # Leave tags that already carry their own srcset alone
+    if "srcset" in tag.lower():
+        return ()
+    return template_widths(template_id, filename)
 
-    def _replace_css_url(m):
-        filename = m.group(1)
-        if image_map:
-            stem = filename.lower().rsplit(".", 1)[0]
-            slot = detect_slot("", filename)
-            url = image_map.get(stem) or image_map.get(slot)
-            if url:
-                return f'url("{url}")'
-        return f'url("{base}/{template["id"]}/assets/{filename}")'
 
-    css = _SLOT_CSS_URL_RE.sub(_replace_css_url, css)
+def _srcset_sizes(tag: str, slot: str) -> str:
+    # The template's own sizes wins; an explicit pixel width is exact; else the slot's usual width
+    if _SIZES_RE.search(tag):
+        return ""
+    m = _WIDTH_RE.search(tag)
+    if m:
+        return f"{m.group(1)}px"
+    return display_sizes(slot)
+
 
-    # Remove existing external stylesheet links
-    html = _LINK_RE.sub("", html)
-    # Inject before </head>
-    html = html.replace("</head>", f"<style>\n{css}\n</style>\n</head>", 1)
-    return html
+def _uploaded_url(image_map: dict, filename: str, slot: str) -> str | None:
+    # Exact stem match first (e.g. "musthave-3" → user's uploaded photo #3)
+    # then fall back to slot-type match (e.g. "musthave" → single upload for all)
+    stem = filename.lower().rsplit(".", 1)[0]
+    return image_map.get(stem) or image_map.get(slot)
 
 
-def _inject_color_override(html: str, primary: str, secondary: str) -> str:
-    """Inject a :root override after the inlined stylesheet so brand colors win."""
+def _color_override(primary: str, secondary: str) -> str:
+    """A :root override placed after the inlined stylesheet so brand colors win."""
     dark = secondary if secondary else _darken_hex(primary)
-    override = (
+    return (
         "<style>\n"
         ":root {\n"
         f"  --primary-color: {primary};\n"
@@ -112,7 +246,6 @@ def _inject_color_override(html: str, primary: str, secondary: str) -> str:
         "}\n"
         "</style>\n"
     )
-    return html.replace("</head>", override + "</head>", 1)
 
 
 def _darken_hex(hex_color: str, factor: float = 0.75) -> str:
@@ -123,12 +256,3 @@ def _darken_hex(hex_color: str, factor: float = 0.75) -> str:
     g = int(int(h[2:4], 16) * factor)
     b = int(int(h[4:6], 16) * factor)
     return f"#{min(r,255):02x}{min(g,255):02x}{min(b,255):02x}"
-
-
-def _inline_js(html: str, template: dict) -> str:
-    js = _read_file(template["js_path"])
-    if not js:
-        return html
-    html = _JS_TAG_RE.sub("", html)
-    html = html.replace("</body>", f"<script>\n{js}\n</script>\n</body>", 1)
-    return html
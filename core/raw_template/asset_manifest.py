@@ -0,0 +1,181 @@
+"""
+Manifest of the files /raw-asset/ may serve, built once per process.
+
+Every regular file under template/ is recorded with its stat result, a
+strong content-hash ETag and its media type, so a request is a dict lookup:
+no Path.resolve() or stat() per hit, and anything not in the manifest
+(including ../ escapes) simply isn't found. Text assets also get gzip and,
+with the optional `brotli` package, brotli bodies compressed up front.
+
+Rehashing the ~180 MB tree on every worker start is wasted work, so hashes
+are kept in a small JSON file and reused while size and mtime are unchanged;
+the build-time template manifest seeds them on a fresh install.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from config.settings import RAW_ASSET_MANIFEST_PATH
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+TEMPLATE_ROOT = _ROOT / "template"
+
+MEDIA_TYPES = {
+    ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+    ".webp": "image/webp", ".gif": "image/gif", ".svg": "image/svg+xml",
+    ".css": "text/css", ".js": "application/javascript",
+    ".woff": "font/woff", ".woff2": "font/woff2", ".ttf": "font/ttf",
+}
+# Worth compressing ahead of time (images and fonts are already compressed)
+_TEXT_SUFFIXES = {".css", ".js", ".svg", ".html"}
+
+
+@dataclass(frozen=True)
+class AssetEntry:
+    path: str
+    stat: os.stat_result
+    etag: str
+    media_type: str
+    encodings: dict[str, bytes] = field(default_factory=dict)  # {"br": ..., "gzip": ...}
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+
+class AssetManifest:
+    def __init__(self, entries: dict[str, AssetEntry]):
+        self._entries = entries
+
+    def get(self, rel_path: str) -> AssetEntry | None:
+        return self._entries.get(rel_path)
+
+    def items(self):
+        return self._entries.items()
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._entries),
+            "bytes": sum(e.size for e in self._entries.values()),
+            "precompressed": sum(1 for e in self._entries.values() if e.encodings),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_manifest(
+    root: str | Path = TEMPLATE_ROOT,
+    hash_cache: str | Path | None = None,
+    known_hashes: dict[str, list] | None = None,
+) -> AssetManifest:
+    """
+    Walk root (not following symlinks) and record every regular, non-hidden file.
+    known_hashes ({rel: [size, mtime_ns, sha256]}) are trusted like hash_cache entries.
+    """
+    root = Path(root)
+    known = {**(known_hashes or {}), **_read_hash_cache(hash_cache)}
+    hashes: dict[str, list] = {}
+    entries: dict[str, AssetEntry] = {}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.startswith("."):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.lstat(path)
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            rel = Path(path).relative_to(root).as_posix()
+            cached = known.get(rel)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                digest = cached[2]
+            else:
+                with open(path, "rb") as f:
+                    digest = hashlib.file_digest(f, "sha256").hexdigest()
+            hashes[rel] = [st.st_size, st.st_mtime_ns, digest]
+
+            suffix = os.path.splitext(name)[1].lower()
+            entries[rel] = AssetEntry(
+                path=path,
+                stat=st,
+                etag=f'"{digest[:32]}"',
+                media_type=MEDIA_TYPES.get(suffix, "application/octet-stream"),
+                encodings=_precompress(path) if suffix in _TEXT_SUFFIXES else {},
+            )
+
+    if hashes != known:
+        _write_hash_cache(hash_cache, hashes)
+    return AssetManifest(entries)
+
+
+_manifest: AssetManifest | None = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> AssetManifest:
+    """Process-wide manifest of template/, built on first use (or at startup warmup)."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                from core.raw_template.template_manifest import file_hashes, read_template_manifest
+                path = Path(RAW_ASSET_MANIFEST_PATH)
+                templates = read_template_manifest()
+                _manifest = build_manifest(
+                    TEMPLATE_ROOT,
+                    path if path.is_absolute() else _ROOT / path,
+                    file_hashes(templates) if templates else None,
+                )
+                log.info("[raw-asset] manifest: %s", _manifest.stats())
+    return _manifest
+
+
+# ── helpers ────────────────────────────────────────────────────────────────
+
+def _precompress(path: str) -> dict[str, bytes]:
+    with open(path, "rb") as f:
+        body = f.read()
+    out = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+    # Only keep encodings that actually save bytes
+    return {coding: data for coding, data in out.items() if len(data) < len(body)}
+
+
+def _read_hash_cache(path) -> dict[str, list]:
+    if path is None:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_hash_cache(path, hashes: dict[str, list]) -> None:
+    if path is None:
+        return
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(hashes), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        log.warning("[raw-asset] could not save manifest hashes: %s", exc)
@@ -0,0 +1,250 @@
+"""
+Width-bucketed WebP/AVIF derivatives of template images.
+
+Template originals run to several MB (a 3 MB header.jpg behind a 300px
+picker card), so /raw-asset/<img>?w=640 serves the smallest bucket at
+least that wide, in the best format the request's Accept header allows,
+and the assembler gives every template <img> a srcset over the buckets.
+
+Derivatives are content-addressed by the original's hash:
+
+    {root}/{hash[:2]}/{hash}-{width}.{ext}
+
+so an edited original never serves a stale copy and identical files shared
+by several templates are converted once. They are made on first request
+(off the event loop), ahead of time by scripts/build_derivatives.py, or by
+a background thread at startup when IMAGE_DERIVATIVES_WARM is set.
+"""
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from config.settings import (
+    IMAGE_DERIVATIVE_FORMATS,
+    IMAGE_DERIVATIVES_PATH,
+    IMAGE_DERIVATIVES_WARM,
+)
+from core.raw_template.asset_manifest import AssetEntry, AssetManifest, get_manifest
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+
+WIDTHS = (320, 640, 1280, 1920)
+
+# format: (media type, file extension, PIL save options)
+_FORMATS = {
+    "avif": ("image/avif", "avif", {"quality": 55, "speed": 6}),
+    "webp": ("image/webp", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("image/jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    "png":  ("image/png", "png", {"optimize": True}),
+}
+# Originals we resize, and the format a derivative keeps when the client accepts nothing better
+_SOURCE_FORMATS = {"image/jpeg": "jpeg", "image/png": "png", "image/webp": "webp"}
+_Q_ZERO_RE = re.compile(r";\s*q=0(\.0*)?\s*$")
+
+
+@dataclass(frozen=True)
+class Derivative:
+    path: str
+    stat: os.stat_result
+    etag: str
+    media_type: str
+
+
+def derivative_root() -> Path | None:
+    """Where derivatives are written, or None when IMAGE_DERIVATIVES_PATH is "off"."""
+    if IMAGE_DERIVATIVES_PATH.lower() in ("", "off", "none"):
+        return None
+    path = Path(IMAGE_DERIVATIVES_PATH)
+    return path if path.is_absolute() else _ROOT / path
+
+
+def output_formats() -> tuple[str, ...]:
+    """Modern formats offered to clients, most preferred first."""
+    names = [f.strip().lower() for f in IMAGE_DERIVATIVE_FORMATS.split(",")]
+    return tuple(f for f in names if f in ("avif", "webp"))
+
+
+def resizable(entry: AssetEntry | None) -> bool:
+    """True when /raw-asset may answer for this file with a derivative."""
+    return (
+        entry is not None
+        and entry.media_type in _SOURCE_FORMATS
+        and derivative_root() is not None
+        and source_width(entry) is not None
+    )
+
+
+def source_width(entry: AssetEntry) -> int | None:
+    return _source_width(entry.path, entry.etag)
+
+
+def responsive_widths(entry: AssetEntry | None) -> tuple[int, ...]:
+    """
+    srcset widths for an original: the buckets narrower than it, then its own
+    width. Empty when there is nothing smaller worth offering.
+    """
+    if not resizable(entry):
+        return ()
+    width = source_width(entry)
+    if width <= WIDTHS[0]:
+        return ()
+    return tuple(w for w in WIDTHS if w < width) + (width,)
+
+
+def template_widths(template_id: str, filename: str) -> tuple[int, ...]:
+    """responsive_widths() for template/<template_id>/assets/<filename>."""
+    return responsive_widths(get_manifest().get(f"{template_id}/assets/{filename}"))
+
+
+def srcset(url: str, widths: tuple[int, ...]) -> str:
+    """srcset value for responsive_widths(): "<url>?w=320 320w, ..., <url> <full>w"."""
+    *buckets, full = widths
+    return ", ".join([f"{url}?w={w} {w}w" for w in buckets] + [f"{url} {full}w"])
+
+
+def choose(entry: AssetEntry, width: int | None, accept: str) -> tuple[int, str] | None:
+    """
+    (width, format) to answer a request with, or None to send the original.
+
+    width is the ?w= hint (None for the full-size image); it is rounded up
+    to a bucket and never past the original. The format is the first of
+    output_formats() the Accept header allows, else the original's own.
+    """
+    if not resizable(entry):
+        return None
+    original = source_width(entry)
+    target = original
+    if width:
+        target = min(next((w for w in WIDTHS if w >= width), WIDTHS[-1]), original)
+    accepted = _accepted_types(accept)
+    own = _SOURCE_FORMATS[entry.media_type]
+    fmt = next((f for f in output_formats() if _FORMATS[f][0] in accepted), own)
+    if target == original and fmt == own:
+        return None
+    return target, fmt
+
+
+_ready: dict[str, Derivative] = {}
+
+
+def cached(entry: AssetEntry, width: int, fmt: str) -> Derivative | None:
+    """The derivative if this process has already seen it — no disk access."""
+    return _ready.get(_key(entry, width, fmt))
+
+
+def ensure(entry: AssetEntry, width: int, fmt: str) -> Derivative | None:
+    """The derivative, generated if missing. None if it can't be made (the original is served instead)."""
+    root = derivative_root()
+    if root is None:
+        return None
+    key = _key(entry, width, fmt)
+    if key in _ready:
+        return _ready[key]
+    path = root / key[:2] / key
+    with _LOCKS[hash(key) % len(_LOCKS)]:
+        try:
+            if not path.exists():
+                _render(entry.path, path, width, fmt)
+            st = os.stat(path)
+        except (OSError, ValueError) as exc:
+            log.warning("[derivatives] could not make %s from %s: %s", key, entry.path, exc)
+            return None
+    derivative = Derivative(
+        path=str(path),
+        stat=st,
+        etag=f'"{key}"',
+        media_type=_FORMATS[fmt][0],
+    )
+    _ready[key] = derivative
+    return derivative
+
+
+def build_all(manifest: AssetManifest | None = None, formats: tuple[str, ...] | None = None) -> int:
+    """Generate every bucket in every format for every template image. Returns how many exist."""
+    manifest = manifest or get_manifest()
+    formats = formats or output_formats()
+    made = 0
+    for _, entry in manifest.items():
+        widths = responsive_widths(entry)
+        if not widths and resizable(entry):
+            widths = (source_width(entry),)  # small image — format conversion only
+        for width in widths:
+            for fmt in formats:
+                if ensure(entry, width, fmt) is not None:
+                    made += 1
+    return made
+
+
+def start_background_build() -> threading.Thread | None:
+    """Run build_all() in a daemon thread when IMAGE_DERIVATIVES_WARM is on."""
+    if not IMAGE_DERIVATIVES_WARM or derivative_root() is None:
+        return None
+
+    def _run() -> None:
+        try:
+            log.info("[derivatives] background build done: %d derivatives", build_all())
+        except Exception as exc:
+            log.warning("[derivatives] background build failed: %s", exc)
+
+    thread = threading.Thread(target=_run, name="image-derivatives", daemon=True)
+    thread.start()
+    return thread
+
+
+# ── helpers ────────────────────────────────────────────────────────────────
+
+_LOCKS = tuple(threading.Lock() for _ in range(16))
+
+
+@lru_cache(maxsize=4096)
+def _source_width(path: str, etag: str) -> int | None:
+    """Pixel width from the image header (etag keys the cache to the file's content)."""
+    try:
+        with Image.open(path) as im:
+            if getattr(im, "is_animated", False):
+                return None
+            return im.width
+    except (OSError, ValueError):
+        return None
+
+
+def _key(entry: AssetEntry, width: int, fmt: str) -> str:
+    digest = entry.etag.strip('"')
+    return f"{digest}-{width}.{_FORMATS[fmt][1]}"
+
+
+def _render(src: str, dest: Path, width: int, fmt: str) -> None:
+    _, _, options = _FORMATS[fmt]
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+        alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        if fmt == "jpeg" or not alpha:
+            im = im.convert("RGB")
+        elif im.mode != "RGBA":
+            im = im.convert("RGBA")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            im.save(tmp, format=fmt.upper(), **options)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+
+def _accepted_types(accept: str) -> set[str]:
+    return {
+        item.split(";")[0].strip()
+        for item in accept.lower().split(",")
+        if not _Q_ZERO_RE.search(item)
+    }
@@ -4,6 +4,10 @@ import re
 from pathlib import Path
 from functools import lru_cache
 
+from core.raw_template.template_blob import read_template_file, template_blob
+from core.raw_template.template_manifest import load_template_manifest
+from core.raw_template.thumbnails import thumbnail_is_screenshot, thumbnail_url
+
 _BASE = Path(__file__).parent.parent.parent / "template"
 
 CATEGORY_META = {
@@ -19,12 +23,22 @@ CATEGORY_META = {
 }
 
 _THUMB_PRIORITY = ("header", "hero", "banner", "about")
+_THUMB_WIDTH = 640  # picker/onboarding cards render well under this
+CARD_IMAGE_WIDTH = 640  # /tpl-card previews show a 1280px layout at roughly quarter scale
 
 
 @lru_cache(maxsize=1)
 def list_raw_templates() -> list[dict]:
+    """Every raw template — from the build-time manifest when it's current, else by scanning template/."""
+    manifest = load_template_manifest()
+    if manifest is None:
+        return scan_templates()
+    return [_from_manifest(entry) for entry in manifest["templates"]]
+
+
+def scan_templates(base: Path = _BASE) -> list[dict]:
     result = []
-    for cat_dir in sorted(_BASE.iterdir()):
+    for cat_dir in sorted(base.iterdir()):
         if not cat_dir.is_dir():
             continue
         cat = cat_dir.name
@@ -45,19 +59,40 @@ def list_raw_templates() -> list[dict]:
                 "css_path": str(tpl_dir / "styles.css"),
                 "js_path": str(tpl_dir / "main.js"),
                 "assets_dir": str(tpl_dir / "assets"),
-                "thumb_url": _find_thumb(tpl_dir, tpl_id),
+                "thumb_url": _card_thumb(tpl_id, _find_thumb(tpl_dir, tpl_id)),
+                "thumb_rendered": thumbnail_is_screenshot(tpl_id),
             })
     return result
 
 
+def _from_manifest(entry: dict) -> dict:
+    """A list_raw_templates() dict from a template_manifest.json entry — no disk access."""
+    tpl_id = entry["id"]
+    tpl_dir = _BASE / tpl_id
+    hero = f"/raw-asset/{tpl_id}/{entry['thumb']}?w={_THUMB_WIDTH}" if entry["thumb"] else None
+    return {
+        "id": tpl_id,
+        "category": entry["category"],
+        "name": entry["name"],
+        "meta": CATEGORY_META.get(entry["category"], {"icon": "📄", "label": entry["category"].title()}),
+        "html_path": str(tpl_dir / "index.html"),
+        "css_path": str(tpl_dir / "styles.css"),
+        "js_path": str(tpl_dir / "main.js"),
+        "assets_dir": str(tpl_dir / "assets"),
+        "thumb_url": _card_thumb(tpl_id, hero),
+        "thumb_rendered": thumbnail_is_screenshot(tpl_id),
+        "slots": entry["slots"],
+        "text_nodes": entry["text_nodes"],
+    }
+
+
 def get_raw_template(template_id: str) -> dict | None:
     return next((t for t in list_raw_templates() if t["id"] == template_id), None)
 
 
-@lru_cache(maxsize=128)
 def read_template_html(html_path: str) -> str:
-    """Cached disk read of a template's index.html — file never changes at runtime."""
-    return Path(html_path).read_text(encoding="utf-8", errors="ignore")
+    """A template's index.html (see template_blob.read_template_file)."""
+    return read_template_file(html_path)
 
 
 _LINK_CSS_RE   = re.compile(r'<link\b[^>]*href=["\'][^"\']*\.css["\'][^>]*/?>(\s*</link>)?', re.IGNORECASE)
@@ -66,17 +101,39 @@ _CSS_URL_RE    = re.compile(r'url\(["\']?assets/([^"\')\s]+)["\']?\)')
 _HTML_SRC_RE   = re.compile(r'(src=["\'])assets/', re.IGNORECASE)
 _HTML_HREF_RE  = re.compile(r'(href=["\'])assets/', re.IGNORECASE)
 _HTML_SRCSET_RE = re.compile(r'(srcset=["\'])assets/', re.IGNORECASE)
+_RASTER_URL_RE = re.compile(r'(/raw-asset/[^"\'()\s?#]+\.(?:jpe?g|png|webp))(?=["\')\s])', re.IGNORECASE)
 
 
-@lru_cache(maxsize=256)
-def get_template_srcdoc(tpl_id: str) -> str:
+def get_template_srcdoc(tpl_id: str, image_width: int | None = None) -> str:
     """
     Return a self-contained HTML string for use as an iframe srcdoc.
     Inlines CSS with absolute asset URLs, rewrites all relative asset
     references to absolute /raw-asset/ paths. Never uses <base> tag —
     srcdoc + <base> is unreliable across browsers.
-    Cached forever — template files never change at runtime.
+    image_width asks /raw-asset for resized images (?w=), for small previews.
+    Read from the shared template blob when preloaded, else built and cached.
     """
+    blob = template_blob()
+    if blob is not None:
+        html = blob.text(f"srcdoc/{tpl_id}/{image_width or 0}")
+        if html is not None:
+            return html
+    return _build_srcdoc(tpl_id, image_width)
+
+
+def build_preview_html(tpl_id: str, html_path: str) -> str:
+    """The template's own index.html with a <base> so its relative asset paths resolve under /raw-asset/."""
+    html = read_template_html(html_path)
+    base_tag = f'<base href="/raw-asset/{tpl_id}/">'
+    if "<head>" in html:
+        return html.replace("<head>", f"<head>{base_tag}", 1)
+    if "<HEAD>" in html:
+        return html.replace("<HEAD>", f"<HEAD>{base_tag}", 1)
+    return base_tag + html
+
+
+@lru_cache(maxsize=256)
+def _build_srcdoc(tpl_id: str, image_width: int | None = None) -> str:
     tpl = get_raw_template(tpl_id)
     if not tpl:
         return "<html><body></body></html>"
@@ -86,10 +143,8 @@ def get_template_srcdoc(tpl_id: str) -> str:
     html = read_template_html(tpl["html_path"])
 
     # Read and inline CSS with absolute asset URLs
-    css_path = Path(tpl["css_path"])
-    css = ""
-    if css_path.exists():
-        css = css_path.read_text(encoding="utf-8", errors="ignore")
+    css = read_template_file(tpl["css_path"])
+    if css:
         css = _CSS_URL_RE.sub(lambda m: f'url("{asset_base}/{m.group(1)}")', css)
 
     # Strip external stylesheet links and external JS
@@ -101,6 +156,10 @@ def get_template_srcdoc(tpl_id: str) -> str:
     html = _HTML_HREF_RE.sub(  lambda m: f'{m.group(1)}{asset_base}/', html)
     html = _HTML_SRCSET_RE.sub(lambda m: f'{m.group(1)}{asset_base}/', html)
 
+    if image_width:
+        html = _RASTER_URL_RE.sub(lambda m: f"{m.group(1)}?w={image_width}", html)
+        css = _RASTER_URL_RE.sub(lambda m: f"{m.group(1)}?w={image_width}", css)
+
     style_tag = f"<style>{css}</style>" if css else ""
 
     if "<head>" in html:
@@ -113,18 +172,34 @@ def get_template_srcdoc(tpl_id: str) -> str:
     return html
 
 
+def _card_thumb(tpl_id: str, hero: str | None) -> str | None:
+    """
+    Card poster: a screenshot thumbnail when one was built, else the template's
+    hero image — a schematic only stands in for templates without any image.
+    """
+    if thumbnail_is_screenshot(tpl_id):
+        return thumbnail_url(tpl_id)
+    return hero or thumbnail_url(tpl_id)
+
+
 def _find_thumb(tpl_dir: Path, tpl_id: str) -> str | None:
+    # Cards are small, so ask /raw-asset for a resized copy
+    img = hero_image(tpl_dir)
+    return f"/raw-asset/{tpl_id}/assets/{img.name}?w={_THUMB_WIDTH}" if img else None
+
+
+def hero_image(tpl_dir: Path) -> Path | None:
+    """The template's header/hero image (or its first image), if it has any."""
     assets = tpl_dir / "assets"
     if not assets.exists():
         return None
     imgs = [f for f in sorted(assets.iterdir())
             if f.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp")]
-    # Prefer header/hero image
     for priority in _THUMB_PRIORITY:
         for img in imgs:
             if priority in img.stem.lower():
-                return f"/raw-asset/{tpl_id}/assets/{img.name}"
-    return f"/raw-asset/{tpl_id}/assets/{imgs[0].name}" if imgs else None
+                return img
+    return imgs[0] if imgs else None
 
 
 def _fmt(name: str) -> str:
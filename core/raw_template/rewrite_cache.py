@@ -0,0 +1,143 @@
+"""Persistent content-addressed cache for rewrite_html LLM results.
+
+Keyed by a SHA-256 of everything that determines the LLM output (template id,
+extracted text payload, brand context, model, temperature), so an unchanged
+regeneration or a retry is answered from disk without spending tokens.
+Backed by SQLite in WAL mode so every worker on the host shares one cache.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config.settings import (
+    REWRITE_CACHE_PATH,
+    REWRITE_CACHE_TTL_SECONDS,
+    REWRITE_CACHE_MAX_ENTRIES,
+)
+
+_ROOT = Path(__file__).parent.parent.parent
+
+# Trim to max_entries at most once per this many writes — keeps put() O(1) amortised.
+_EVICT_EVERY = 50
+
+
+def cache_key(
+    template_id: str,
+    texts: dict[str, str],
+    context: str,
+    model: str,
+    temperature: float,
+) -> str:
+    """Stable content hash of a rewrite request."""
+    material = json.dumps(
+        [template_id, texts, context, model, temperature],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class RewriteCache:
+    """SQLite-backed key → JSON dict store with TTL and size-bounded LRU eviction."""
+
+    def __init__(self, path: str | Path, ttl_seconds: int, max_entries: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rewrites ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rewrites_last_used ON rewrites(last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM rewrites WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM rewrites WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE rewrites SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rewrites (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, now + self.ttl_seconds, now),
+            )
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        with self._lock:
+            self._evict(time.time())
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM rewrites WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM rewrites WHERE key IN ("
+            " SELECT key FROM rewrites ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rewrites").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: RewriteCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> RewriteCache | None:
+    """Process-wide cache instance, or None when disabled via REWRITE_CACHE_PATH=off."""
+    global _cache
+    if REWRITE_CACHE_PATH.lower() in ("", "off", "none"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = Path(REWRITE_CACHE_PATH)
+                if not path.is_absolute():
+                    path = _ROOT / path
+                _cache = RewriteCache(path, REWRITE_CACHE_TTL_SECONDS, REWRITE_CACHE_MAX_ENTRIES)
+    return _cache
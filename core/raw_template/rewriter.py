@@ -2,11 +2,20 @@
 
 import re
 import json
-from openai import OpenAI
-
-from config.settings import HF_API_KEY, HF_BASE_URL, HF_MODELS
+import asyncio
+import logging
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Callable
+
+from config.settings import HF_MODELS, REWRITE_CHUNK_MAX_CHARS, REWRITE_CHUNK_CONCURRENCY
+from core.ai.client import chat_completion, achat_completion, astream_chat_completion
 from core.models.brand_memory import BrandMemory
 from core.errors import AIGenerationError
+from core.raw_template.rewrite_cache import cache_key, get_cache
+
+log = logging.getLogger(__name__)
 
 _SYSTEM = """You are a professional website copywriter.
 You receive a JSON object where each key is a placeholder and each value is original website text.
@@ -26,9 +35,17 @@ _CODE_BLOCK_RE = re.compile(
 )
 _TEXT_NODE_RE = re.compile(r'>([^<>]+)<')
 _PLACEHOLDER_RE = re.compile(r'__T\d+__')
+_SECTION_RE = re.compile(r'<(?:section|header|footer)\b', re.IGNORECASE)
 
+_REQUEST_OPTS = {
+    "timeout": 90,
+    "max_retries": 2,
+    "temperature": 0.35,
+    "max_tokens": 4000,
+}
 
-def rewrite_html(html: str, memory: BrandMemory) -> str:
+
+def rewrite_html(html: str, memory: BrandMemory, template_id: str = "") -> str:
     """Extract text nodes, rewrite via LLM, inject back — HTML structure untouched."""
     # Remove code blocks so we don't extract JS/CSS as text
     stripped, code_blocks = _strip_code(html)
@@ -38,39 +55,356 @@ def rewrite_html(html: str, memory: BrandMemory) -> str:
     if not texts:
         return html
 
-    payload = json.dumps(texts, ensure_ascii=False)
-    prompt = f"Business Context:\n{_ctx(memory)}\n\nTexts to rewrite:\n{payload}"
+    chunks = _chunk_texts(templated, texts)
+    if len(chunks) == 1:
+        results = [_rewrite_chunk(chunks[0], memory, template_id)]
+    else:
+        def _safe(chunk: dict[str, str]):
+            try:
+                return _rewrite_chunk(chunk, memory, template_id)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(REWRITE_CHUNK_CONCURRENCY, len(chunks))) as pool:
+            results = list(pool.map(_safe, chunks))
+    rewritten = _merge_chunks(chunks, results)
+
+    result = _restore_texts(templated, rewritten)
+    result = _restore_code(result, code_blocks)
+    return result
+
+
+async def rewrite_html_async(html: str, memory: BrandMemory, template_id: str = "") -> str:
+    """Async variant of rewrite_html — awaits the LLM instead of blocking a thread."""
+    stripped, code_blocks = _strip_code(html)
+
+    templated, texts = _extract_texts(stripped)
+
+    if not texts:
+        return html
+
+    chunks = _chunk_texts(templated, texts)
+    slots = asyncio.Semaphore(REWRITE_CHUNK_CONCURRENCY)
+
+    async def _one(chunk: dict[str, str]) -> dict:
+        async with slots:
+            return await _rewrite_chunk_async(chunk, memory, template_id)
+
+    results = await asyncio.gather(*(_one(c) for c in chunks), return_exceptions=True)
+    rewritten = _merge_chunks(chunks, results)
+
+    result = _restore_texts(templated, rewritten)
+    result = _restore_code(result, code_blocks)
+    return result
+
+
+async def rewrite_html_stream(
+    html: str,
+    memory: BrandMemory,
+    on_pair: Callable[[str, str], None],
+    template_id: str = "",
+) -> str:
+    """
+    Streaming variant of rewrite_html_async.
+
+    Calls on_pair(key, text) for each rewritten __T<n>__ value as soon as it
+    is complete in the token stream, so callers can show progress long before
+    the full JSON object arrives. Chunks stream concurrently, so pairs from
+    different sections interleave. Returns the fully rewritten HTML.
+    """
+    stripped, code_blocks = _strip_code(html)
+
+    templated, texts = _extract_texts(stripped)
+
+    if not texts:
+        return html
+
+    rewritten = await rewrite_texts_stream(
+        _chunk_texts(templated, texts), memory, on_pair, template_id=template_id,
+    )
+
+    result = _restore_texts(templated, rewritten)
+    result = _restore_code(result, code_blocks)
+    return result
+
+
+async def rewrite_texts_stream(
+    chunks: list[dict[str, str]],
+    memory: BrandMemory,
+    on_pair: Callable[[str, str], None],
+    template_id: str = "",
+) -> dict:
+    """
+    Rewrite pre-extracted text chunks (see TemplateSkeleton.chunks), streaming
+    pairs to on_pair. Returns the merged {__T<n>__: text} map.
+    """
+    slots = asyncio.Semaphore(REWRITE_CHUNK_CONCURRENCY)
+
+    async def _one(chunk: dict[str, str]) -> dict:
+        key = _request_key(template_id, chunk, memory)
+        cached = await asyncio.to_thread(_cache_get, key)
+        if cached is not None:
+            for k, v in cached.items():
+                if k in chunk and isinstance(v, str) and v.strip():
+                    on_pair(k, v)
+            return cached
+        async with slots:
+            rewritten, complete = await _stream_rewrites(chunk, memory, on_pair)
+        if complete:
+            await asyncio.to_thread(_cache_put, key, rewritten)
+        return rewritten
+
+    results = await asyncio.gather(*(_one(c) for c in chunks), return_exceptions=True)
+    return _merge_chunks(chunks, results)
+
+
+# ── chunking ───────────────────────────────────────────────────────────────
+
+def _chunk_texts(
+    templated: str,
+    texts: dict[str, str],
+    max_chars: int | None = None,
+) -> list[dict[str, str]]:
+    """
+    Split texts into LLM-sized chunks along <section>/<header>/<footer> boundaries.
+
+    Adjacent small sections are packed together up to max_chars of source
+    text; a section bigger than that is split between its own text nodes.
+    Key order follows the document.
+    """
+    max_chars = max_chars or REWRITE_CHUNK_MAX_CHARS
+    bounds = [m.start() for m in _SECTION_RE.finditer(templated)]
+
+    sections: dict[int, dict[str, str]] = {}
+    for m in _PLACEHOLDER_RE.finditer(templated):
+        key = m.group(0)
+        if key in texts:
+            sections.setdefault(bisect_right(bounds, m.start()), {})[key] = texts[key]
+
+    chunks: list[dict[str, str]] = []
+    current: dict[str, str] = {}
+    size = 0
+    for section in sections.values():
+        section_size = sum(len(v) for v in section.values())
+        if current and size + section_size > max_chars:
+            chunks.append(current)
+            current, size = {}, 0
+        for key, text in section.items():
+            if current and size + len(text) > max_chars:
+                chunks.append(current)
+                current, size = {}, 0
+            current[key] = text
+            size += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _rewrite_chunk(chunk: dict[str, str], memory: BrandMemory, template_id: str) -> dict:
+    key = _request_key(template_id, chunk, memory)
+    rewritten = _cache_get(key)
+    if rewritten is None:
+        try:
+            resp = chat_completion(HF_MODELS["copy"], _messages(chunk, memory), **_REQUEST_OPTS)
+        except Exception as e:
+            raise AIGenerationError("content_rewriter", str(e)) from e
+
+        rewritten = _parse_rewritten(resp.choices[0].message.content)
+        _cache_put(key, rewritten)
+    return rewritten
+
+
+async def _rewrite_chunk_async(chunk: dict[str, str], memory: BrandMemory, template_id: str) -> dict:
+    key = _request_key(template_id, chunk, memory)
+    rewritten = await asyncio.to_thread(_cache_get, key)
+    if rewritten is None:
+        try:
+            resp = await achat_completion(HF_MODELS["copy"], _messages(chunk, memory), **_REQUEST_OPTS)
+        except Exception as e:
+            raise AIGenerationError("content_rewriter", str(e)) from e
+
+        rewritten = _parse_rewritten(resp.choices[0].message.content)
+        await asyncio.to_thread(_cache_put, key, rewritten)
+    return rewritten
+
+
+async def _stream_rewrites(
+    texts: dict[str, str],
+    memory: BrandMemory,
+    on_pair: Callable[[str, str], None],
+) -> tuple[dict, bool]:
+    """Stream the LLM response; return (rewritten, complete). Incomplete = JSON cut short."""
+    parser = _PairStreamParser()
+    received: dict[str, str] = {}
+    parts: list[str] = []
 
-    client = OpenAI(base_url=HF_BASE_URL, api_key=HF_API_KEY, max_retries=2)
     try:
-        resp = client.chat.completions.create(
-            model=HF_MODELS["copy"],
-            messages=[
-                {"role": "system", "content": _SYSTEM},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.35,
-            max_tokens=4000,
-            timeout=90,
-        )
+        stream = astream_chat_completion(HF_MODELS["copy"], _messages(texts, memory), **_REQUEST_OPTS)
+        async with aclosing(stream):
+            async for delta in stream:
+                parts.append(delta)
+                for k, v in parser.feed(delta):
+                    if k in texts and v.strip() and k not in received:
+                        received[k] = v
+                        on_pair(k, v)
     except Exception as e:
-        raise AIGenerationError("content_rewriter", str(e)) from e
+        if not received:
+            raise AIGenerationError("content_rewriter", str(e)) from e
+        log.warning("[rewriter] stream interrupted after %d texts: %s", len(received), e)
+        return received, False
 
-    raw = resp.choices[0].message.content or ""
-    raw = _clean_fences(raw)
+    try:
+        return _parse_rewritten("".join(parts)), True
+    except AIGenerationError:
+        if not received:
+            raise
+        # Truncated output (token cap) — keep every pair that did complete
+        log.warning("[rewriter] incomplete JSON, using %d streamed texts", len(received))
+        return received, False
+
+
+def _merge_chunks(chunks: list[dict[str, str]], results: list) -> dict:
+    """
+    Union of per-chunk rewrites. A failed chunk keeps its original texts;
+    the rewrite only fails when every chunk did.
+    """
+    merged: dict = {}
+    errors: list[Exception] = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            log.warning("[rewriter] chunk of %d texts failed: %s", len(chunk), result)
+            errors.append(result)
+            merged.update(chunk)
+            continue
+        merged.update({k: v for k, v in result.items() if k in chunk})
+    if errors and len(errors) == len(chunks):
+        err = errors[0]
+        if isinstance(err, AIGenerationError):
+            raise err
+        raise AIGenerationError("content_rewriter", str(err)) from err
+    return merged
+
+
+class _PairStreamParser:
+    """
+    Incremental parser for the flat {"__T0__": "...", ...} object the LLM returns.
+
+    feed() accepts arbitrary chunks and returns every key/value pair whose
+    value string closed within them. Markdown fences and whitespace are
+    ignored; non-string values are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._in_string = False
+        self._string_start = 0
+        self._escaped = False
+        self._is_value = False
+        self._last_struct = ""
+        self._pending_key: str | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self._buf += chunk
+        pairs: list[tuple[str, str]] = []
+        buf = self._buf
+        i = self._pos
+
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    pair = self._close_string(buf[self._string_start:i + 1])
+                    if pair:
+                        pairs.append(pair)
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._is_value = self._last_struct == ":"
+            elif ch in "{},:":
+                self._last_struct = ch
+                if ch in "{},":
+                    self._pending_key = None
+            i += 1
+
+        # Drop consumed input; keep only an unfinished string
+        if self._in_string:
+            self._buf = buf[self._string_start:]
+            self._pos = i - self._string_start
+            self._string_start = 0
+        else:
+            self._buf = ""
+            self._pos = 0
+        return pairs
+
+    def _close_string(self, literal: str) -> tuple[str, str] | None:
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError:
+            return None
+        self._last_struct = '"'
+        if not self._is_value:
+            self._pending_key = value
+            return None
+        key, self._pending_key = self._pending_key, None
+        return (key, value) if key is not None else None
+
+
+# ── cache ──────────────────────────────────────────────────────────────────
+
+def _request_key(template_id: str, texts: dict[str, str], memory: BrandMemory) -> str:
+    return cache_key(
+        template_id, texts, _ctx(memory),
+        HF_MODELS["copy"], _REQUEST_OPTS["temperature"],
+    )
+
+
+def _cache_get(key: str) -> dict | None:
+    """Cached LLM output for this request, or None. Cache errors never fail a generation."""
+    try:
+        cache = get_cache()
+        return cache.get(key) if cache is not None else None
+    except Exception as exc:
+        log.warning("[rewriter] cache read failed: %s", exc)
+        return None
+
+
+def _cache_put(key: str, rewritten: dict) -> None:
+    try:
+        cache = get_cache()
+        if cache is not None:
+            cache.put(key, rewritten)
+    except Exception as exc:
+        log.warning("[rewriter] cache write failed: %s", exc)
+
+
+def _messages(texts: dict[str, str], memory: BrandMemory) -> list[dict]:
+    payload = json.dumps(texts, ensure_ascii=False)
+    prompt = f"Business Context:\n{_ctx(memory)}\n\nTexts to rewrite:\n{payload}"
+    return [
+        {"role": "system", "content": _SYSTEM},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_rewritten(raw: str | None) -> dict:
+    raw = _clean_fences(raw or "")
 
     if not raw.strip():
         raise AIGenerationError("content_rewriter", "LLM returned empty response")
 
     try:
-        rewritten = json.loads(raw)
+        return json.loads(raw)
     except json.JSONDecodeError as e:
         raise AIGenerationError("content_rewriter", f"Invalid JSON: {e}") from e
 
-    result = _restore_texts(templated, rewritten)
-    result = _restore_code(result, code_blocks)
-    return result
-
 
 # ── helpers ────────────────────────────────────────────────────────────────
 
@@ -101,7 +435,8 @@ def _extract_texts(html: str) -> tuple[str, dict[str, str]]:
     def replacer(m: re.Match) -> str:
         text = m.group(1)
         stripped = text.strip()
-        if len(stripped) < 3:
+        # Skip short nodes and runs of stripped <script>/<style> tokens
+        if len(stripped) < 3 or "__CODE" in stripped:
             return m.group(0)
         key = f"__T{idx[0]}__"
         texts[key] = stripped
@@ -0,0 +1,206 @@
+"""
+Precompiled template skeleton — a raw template parsed once into literal
+segments and holes.
+
+Building a page from a raw template used to re-run the code-stripping,
+text-extraction, image, CSS and JS regexes over the same files on every
+generation. A TemplateSkeleton records all of that once per template:
+the HTML split at every text node, <img src="assets/..."> slot, </head>
+and </body>; the stylesheet split at every url(assets/...); and the JS
+blob. render() is then a single join over the precomputed parts.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from config.settings import TEMPLATE_SKELETON_CACHE
+from core.raw_template.assembler import (
+    PageBuilder,
+    add_body_end,
+    add_head_end,
+    img_tag,
+    _ALT_RE,
+    _IMG_SRC_RE,
+    _JS_TAG_RE,
+    _LINK_RE,
+    _read_file,
+    _split_css,
+    _srcset_sizes,
+    _srcset_widths,
+)
+from core.raw_template.loader import read_template_html
+from core.raw_template.rewriter import _chunk_texts, _extract_texts, _restore_code, _strip_code
+from core.raw_template.slot_analyzer import detect_slot
+from core.raw_template.template_blob import template_blob, template_id_for
+
+# Hole kinds in TemplateSkeleton.parts
+TEXT, IMAGE, HEAD_END, BODY_END = range(4)
+
+_HOLE_RE = re.compile(
+    r'(?P<text>__T\d+__)'
+    r'|(?P<img>' + _IMG_SRC_RE.pattern + r')'
+    r'|(?P<head></head>)'
+    r'|(?P<body></body>)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class TemplateSkeleton:
+    template_id: str
+    # Literal strings interleaved with hole tuples:
+    #   (TEXT, key) · (IMAGE, prefix, filename, suffix, stem, slot, srcset widths, sizes)
+    #   · (HEAD_END,) · (BODY_END,)
+    parts: tuple
+    # Stylesheet literals interleaved with (filename, stem, slot) url() holes
+    css_parts: tuple
+    js: str
+    texts: dict[str, str]            # original text per __T<n>__ key
+    body_keys: frozenset[str]        # keys of text nodes inside <body>
+    chunks: tuple[dict[str, str], ...]  # rewrite chunks, see rewriter._chunk_texts
+
+    def render(
+        self,
+        texts: dict[str, str] | None = None,
+        image_map: dict[str, str] | None = None,
+        base_asset_url: str = "/raw-asset",
+        primary_color: str = "",
+        secondary_color: str = "",
+        body_extra: str = "",
+    ) -> str:
+        """
+        Splice texts and images into the skeleton → self-contained HTML.
+
+        Keys missing from texts keep the template's original copy.
+        body_extra (e.g. a contact footer) goes right before </body>.
+        """
+        return self.build(
+            texts, image_map, base_asset_url, primary_color, secondary_color, body_extra,
+        ).html()
+
+    def build(
+        self,
+        texts: dict[str, str] | None = None,
+        image_map: dict[str, str] | None = None,
+        base_asset_url: str = "/raw-asset",
+        primary_color: str = "",
+        secondary_color: str = "",
+        body_extra: str = "",
+    ) -> PageBuilder:
+        """render() as an unjoined PageBuilder, for byte counts."""
+        texts = texts or {}
+        image_map = image_map or {}
+        asset_base = f"{base_asset_url}/{self.template_id}/assets"
+
+        page = PageBuilder()
+        for part in self.parts:
+            if type(part) is str:
+                page.add(part)
+                continue
+            kind = part[0]
+            if kind == TEXT:
+                value = texts.get(part[1])
+                page.add(value if isinstance(value, str) else self.texts[part[1]], "text")
+            elif kind == IMAGE:
+                _, prefix, filename, suffix, stem, slot, widths, sizes = part
+                url = image_map.get(stem) or image_map.get(slot)
+                if url:
+                    page.add(img_tag(prefix, url, suffix, ()))
+                else:
+                    page.add(img_tag(prefix, f"{asset_base}/{filename}", suffix, widths, sizes))
+            elif kind == HEAD_END:
+                add_head_end(page, self.css_parts, image_map, asset_base, primary_color, secondary_color)
+            else:
+                add_body_end(page, self.js, body_extra)
+        return page
+
+    def keyed_texts(self) -> dict[str, str]:
+        """
+        Original texts with every body text wrapped in <span data-ok-t="__T<n>__">,
+        so a live preview can swap each one in place as its rewrite arrives.
+        """
+        return {
+            key: f'<span data-ok-t="{key}">{text}</span>' if key in self.body_keys else text
+            for key, text in self.texts.items()
+        }
+
+
+def get_skeleton(template: dict) -> TemplateSkeleton:
+    """Skeleton for a raw template dict (see loader.list_raw_templates)."""
+    return _skeleton(template["id"], template["html_path"], template["css_path"], template["js_path"])
+
+
+@lru_cache(maxsize=TEMPLATE_SKELETON_CACHE)
+def _skeleton(tpl_id: str, html_path: str, css_path: str, js_path: str) -> TemplateSkeleton:
+    # Unpickled from the shared template blob when preloaded, so only the
+    # most recently used few stay resident; otherwise parsed from disk
+    blob = template_blob()
+    if blob is not None and template_id_for(html_path) == tpl_id:
+        skeleton = blob.load(f"skeleton/{tpl_id}")
+        if skeleton is not None:
+            return skeleton
+    return _build(tpl_id, html_path, css_path, js_path)
+
+
+def _build(tpl_id: str, html_path: str, css_path: str, js_path: str) -> TemplateSkeleton:
+    stripped, code_blocks = _strip_code(read_template_html(html_path))
+    templated, texts = _extract_texts(stripped)
+    chunks = tuple(_chunk_texts(templated, texts)) if texts else ()
+    html = _restore_code(templated, code_blocks)
+
+    css_parts = _split_css(css_path)
+    js = _read_file(js_path)
+    if css_parts:
+        html = _LINK_RE.sub("", html)
+    if js:
+        html = _JS_TAG_RE.sub("", html)
+
+    parts: list = []
+    body_keys: set[str] = set()
+    body_at = html.lower().find("<body")
+    head_done = body_done = False
+    pos = 0
+    for m in _HOLE_RE.finditer(html):
+        if m.group("head") is not None:
+            # Only the first </head> / </body> (case-sensitive) is a hole
+            if head_done or m.group("head") != "</head>":
+                continue
+            head_done = True
+            hole = (HEAD_END,)
+        elif m.group("body") is not None:
+            if body_done or m.group("body") != "</body>":
+                continue
+            body_done = True
+            hole = (BODY_END,)
+        elif m.group("text") is not None:
+            key = m.group("text")
+            if key not in texts:
+                continue
+            if m.start() > body_at:
+                body_keys.add(key)
+            hole = (TEXT, key)
+        else:
+            img = _IMG_SRC_RE.fullmatch(m.group("img"))
+            prefix, filename, suffix = img.groups()
+            alt_m = _ALT_RE.search(img.group(0))
+            alt = (alt_m.group(1) if alt_m else "").lower()
+            stem = filename.lower().rsplit(".", 1)[0]
+            slot = detect_slot(alt, filename)
+            widths = _srcset_widths(tpl_id, img.group(0), filename)
+            sizes = _srcset_sizes(img.group(0), slot) if widths else ""
+            hole = (IMAGE, prefix, filename, suffix, stem, slot, widths, sizes)
+        parts.append(html[pos:m.start()])
+        parts.append(hole)
+        pos = m.end()
+    parts.append(html[pos:])
+
+    return TemplateSkeleton(
+        template_id=tpl_id,
+        parts=tuple(p for p in parts if p != ""),
+        css_parts=css_parts,
+        js=js,
+        texts=texts,
+        body_keys=frozenset(body_keys),
+        chunks=chunks,
+    )
@@ -36,6 +36,9 @@ _SIZE_MAP = {
     "dest":      ("600 × 400 px",  "landscape"),
 }
 
+# sizes for slots we know nothing about: full width on phones, about half a desktop layout
+_DEFAULT_SIZES = "(max-width: 768px) 100vw, 50vw"
+
 _IMG_RE = re.compile(
     r'<img\b[^>]*\bsrc=["\']assets/([^"\']+)["\'][^>]*/?>',
     re.IGNORECASE | re.DOTALL,
@@ -45,7 +48,13 @@ _TRAIL_RE = re.compile(r'[-_]\d+$')
 _CSS_URL_RE = re.compile(r'url\(["\']?assets/([^"\')\s]+)["\']?\)', re.IGNORECASE)
 
 
-@lru_cache(maxsize=64)
+def template_slots(template: dict) -> list[dict]:
+    """Image slots of a list_raw_templates() dict — precomputed when it came from the template manifest."""
+    slots = template.get("slots")
+    return slots if slots is not None else analyze_slots(template["html_path"])
+
+
+@lru_cache(maxsize=128)
 def analyze_slots(html_path: str) -> list[dict]:
     """Return list of image slot dicts, one per unique slot type found in the HTML and CSS."""
     html = Path(html_path).read_text(encoding="utf-8", errors="ignore")
@@ -87,6 +96,20 @@ def analyze_slots(html_path: str) -> list[dict]:
     return list(slots.values())
 
 
+def display_sizes(slot: str) -> str:
+    """
+    A srcset `sizes` value for a slot, from its nominal width above: wide
+    slots span the viewport, the rest are capped at their own width.
+    """
+    spec = _SIZE_MAP.get(slot)
+    if spec is None:
+        return _DEFAULT_SIZES
+    width = int(spec[0].split()[0])
+    if width >= 1200:
+        return "100vw"
+    return f"(max-width: {width}px) 100vw, {width}px"
+
+
 def detect_slot(alt: str, filename: str) -> str:
     """Infer slot type from alt text or filename."""
     stem = filename.lower().rsplit(".", 1)[0]
@@ -0,0 +1,259 @@
+"""
+Read-only blob of every immutable per-template artifact, mmapped by workers.
+
+Each worker used to fill its own lru_caches with the same template data:
+raw HTML, CSS and JS, srcdoc documents with their inlined CSS, encoded
+/tpl-card bodies and parsed skeletons. Per-worker memory grew with the
+template library. Instead the master process (see preload_templates) writes them
+all once to a single file:
+
+    MAGIC | header length (8 bytes, big-endian) | JSON header | payload
+    header = {"version", "fingerprint", "entries": {key: [offset into payload, length]}, "meta": {...}}
+
+Every worker maps that file read-only, so the bytes live once in the OS
+page cache whatever the worker count. Lookups return memoryviews (which
+responses send as they are) or short-lived decoded copies, and only a
+small LRU of unpickled skeletons stays resident per worker.
+read_template_file() is the one reader of template sources; everything
+that used to keep its own cached copy goes through it.
+
+uvicorn starts its workers with spawn rather than fork, so copy-on-write
+sharing of a preloaded heap wouldn't survive; a shared mapping does.
+
+Keys: file/<id>/<index.html|styles.css|main.js> (text as read_text() gives it),
+srcdoc/<id>/<image_width or 0>, preview/<id>, card/<id>/<coding>,
+skeleton/<id> (pickled TemplateSkeleton).
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from config.settings import IMAGE_DERIVATIVES_PATH, TEMPLATE_BLOB_PATH
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+TEMPLATE_ROOT = _ROOT / "template"
+
+_MAGIC = b"OKTBLOB1"
+# Bump whenever what goes into the blob (or how it's rendered) changes
+_BLOB_VERSION = 3
+_SOURCE_FILES = ("index.html", "styles.css", "main.js")
+
+
+class TemplateBlob:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if bytes(view[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{self.path} is not a template blob")
+        start = len(_MAGIC) + 8
+        size = int.from_bytes(view[len(_MAGIC):start], "big")
+        header = json.loads(bytes(view[start:start + size]))
+        self.version: int = header["version"]
+        self.fingerprint: str = header["fingerprint"]
+        self.meta: dict = header["meta"]
+        self._entries: dict[str, list] = header["entries"]
+        self._view = view[start + size:]
+
+    def view(self, key: str) -> memoryview | None:
+        """Zero-copy bytes of an entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._view[offset:offset + length]
+
+    def text(self, key: str) -> str | None:
+        """An entry decoded as UTF-8 (a fresh copy — don't cache it)."""
+        data = self.view(key)
+        return str(data, "utf-8") if data is not None else None
+
+    def load(self, key: str):
+        """An unpickled entry."""
+        data = self.view(key)
+        return pickle.loads(data) if data is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": len(self._map), "path": str(self.path)}
+
+
+def blob_path() -> Path | None:
+    """Where the blob lives, or None when TEMPLATE_BLOB_PATH is "off"."""
+    if TEMPLATE_BLOB_PATH.lower() in ("", "off", "none"):
+        return None
+    path = Path(TEMPLATE_BLOB_PATH)
+    return path if path.is_absolute() else _ROOT / path
+
+
+def template_id_for(path: str | Path) -> str | None:
+    """<category>/<name> for a file directly inside a template dir under template/, else None."""
+    parent = Path(path).parent
+    if parent.parent.parent != TEMPLATE_ROOT:
+        return None
+    return f"{parent.parent.name}/{parent.name}"
+
+
+def source_key(path: str | Path) -> str | None:
+    """Blob key for a template's index.html, styles.css or main.js, else None."""
+    tpl_id = template_id_for(path)
+    name = Path(path).name
+    return f"file/{tpl_id}/{name}" if tpl_id is not None and name in _SOURCE_FILES else None
+
+
+def read_template_file(path: str | Path) -> str:
+    """
+    A template source file's text ("" when missing) — from the shared blob
+    when preloaded, else a cached disk read. Template files never change at runtime.
+    """
+    blob = template_blob()
+    key = source_key(path) if blob is not None else None
+    if key is not None:
+        text = blob.text(key)
+        if text is not None:
+            return text
+    return _read_disk(str(path))
+
+
+def source_fingerprint(templates: list[dict]) -> str:
+    """Changes whenever a template's html/css/js or assets/ listing does (stat only)."""
+    h = hashlib.sha256(f"{_BLOB_VERSION}:{IMAGE_DERIVATIVES_PATH}".encode())
+    for tpl in templates:
+        h.update(tpl["id"].encode())
+        for path in (tpl["html_path"], tpl["css_path"], tpl["js_path"], tpl["assets_dir"]):
+            try:
+                st = os.stat(path)
+                h.update(f"{st.st_size}:{st.st_mtime_ns};".encode())
+            except OSError:
+                h.update(b"-;")
+    return h.hexdigest()
+
+
+def build_template_blob(templates: list[dict], path: Path) -> Path:
+    """Render every artifact for templates and write the blob atomically."""
+    from core.publishing.artifacts import encode_site
+    from core.raw_template.loader import CARD_IMAGE_WIDTH, _build_srcdoc, build_preview_html
+    from core.raw_template.skeleton import _build
+
+    fingerprint = source_fingerprint(templates)
+    items: dict[str, bytes] = {}
+    meta: dict[str, str] = {}
+    for tpl in templates:
+        tpl_id = tpl["id"]
+        for src in (tpl["html_path"], tpl["css_path"], tpl["js_path"]):
+            key = source_key(src)
+            if key is not None and os.path.isfile(src):
+                items[key] = _read_disk(src).encode("utf-8")
+        for width in (None, CARD_IMAGE_WIDTH):
+            items[f"srcdoc/{tpl_id}/{width or 0}"] = _build_srcdoc(tpl_id, width).encode("utf-8")
+        items[f"preview/{tpl_id}"] = build_preview_html(tpl_id, tpl["html_path"]).encode("utf-8")
+        card = encode_site(_build_srcdoc(tpl_id, CARD_IMAGE_WIDTH), 0)
+        for coding, body in card.bodies.items():
+            items[f"card/{tpl_id}/{coding}"] = bytes(body)
+        meta[f"card/{tpl_id}"] = card.etag
+        skeleton = _build(tpl_id, tpl["html_path"], tpl["css_path"], tpl["js_path"])
+        items[f"skeleton/{tpl_id}"] = pickle.dumps(skeleton, protocol=pickle.HIGHEST_PROTOCOL)
+
+    entries: dict[str, list] = {}
+    offset = 0
+    for key, data in items.items():
+        entries[key] = [offset, len(data)]
+        offset += len(data)
+    header = json.dumps({
+        "version": _BLOB_VERSION, "fingerprint": fingerprint, "entries": entries, "meta": meta,
+    }).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(len(header).to_bytes(8, "big"))
+        f.write(header)
+        for data in items.values():
+            f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def preload_templates() -> TemplateBlob | None:
+    """
+    For the master process, before any worker starts: make sure a current
+    blob exists (rebuilding it if the templates changed) and map it.
+    """
+    from core.raw_template.loader import list_raw_templates
+
+    path = blob_path()
+    if path is None:
+        return None
+    templates = list_raw_templates()
+    current = _open(path)
+    if current is None or current.fingerprint != source_fingerprint(templates):
+        build_template_blob(templates, path)
+        log.info("[templates] preloaded %d templates into %s", len(templates), path)
+        _reset()
+    return template_blob()
+
+
+_blob: TemplateBlob | None = None
+_checked = False
+_blob_lock = threading.Lock()
+
+
+def template_blob() -> TemplateBlob | None:
+    """This process's mapping of the blob — None when it's off, missing or stale (callers then read disk)."""
+    global _blob, _checked
+    if not _checked:
+        with _blob_lock:
+            if not _checked:
+                _blob = _open_current()
+                _checked = True
+    return _blob
+
+
+# ── helpers ────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=256)
+def _read_disk(path: str) -> str:
+    p = Path(path)
+    return p.read_text(encoding="utf-8", errors="ignore") if p.exists() else ""
+
+
+def _open_current() -> TemplateBlob | None:
+    from core.raw_template.loader import list_raw_templates
+
+    path = blob_path()
+    blob = _open(path) if path is not None else None
+    if blob is None:
+        return None
+    if blob.fingerprint != source_fingerprint(list_raw_templates()):
+        log.warning("[templates] %s is stale — reading templates from disk", path)
+        return None
+    return blob
+
+
+def _open(path: Path) -> TemplateBlob | None:
+    try:
+        blob = TemplateBlob(path)
+    except (OSError, ValueError, KeyError) as exc:
+        if path.exists():
+            log.warning("[templates] unreadable template blob %s: %s", path, exc)
+        return None
+    return blob if blob.version == _BLOB_VERSION else None
+
+
+def _reset() -> None:
+    global _blob, _checked
+    with _blob_lock:
+        _blob, _checked = None, False
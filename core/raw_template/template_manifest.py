@@ -0,0 +1,189 @@
+"""
+Build-time manifest of the raw template library.
+
+Workers used to discover templates by walking template/, sorting every
+assets/ folder and reading every index.html for its image slots. A
+generated template_manifest.json replaces all of that with one file read.
+Per template it records the id, name, hero image, image slots, text-node
+count and the size, mtime and sha256 of every file:
+
+    {"version": 1, "templates": [{"id", "category", "name", "thumb",
+                                  "slots", "text_nodes", "files": {rel: [size, mtime_ns, sha256]}}]}
+
+Paths are relative to template/, so a manifest built in CI is valid in
+any checkout. Rebuild it with scripts/build_template_manifest.py, whose
+`--check` flag exits non-zero when it's stale.
+
+Staleness is judged from the files themselves. The quick check (on every
+load) compares the set of template dirs and each template's
+index.html/styles.css/main.js. The full check compares every recorded
+file and assets/ listing. A file whose mtime moved, e.g. after a fresh
+git checkout, is only stale if its hash changed too.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from config.settings import TEMPLATE_MANIFEST_PATH
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+TEMPLATE_ROOT = _ROOT / "template"
+
+MANIFEST_VERSION = 1
+_CORE_FILES = ("index.html", "styles.css", "main.js")
+
+
+def manifest_path() -> Path | None:
+    """Where the manifest lives, or None when TEMPLATE_MANIFEST_PATH is "off"."""
+    if TEMPLATE_MANIFEST_PATH.lower() in ("", "off", "none"):
+        return None
+    path = Path(TEMPLATE_MANIFEST_PATH)
+    return path if path.is_absolute() else _ROOT / path
+
+
+def build_template_manifest(root: str | Path = TEMPLATE_ROOT) -> dict:
+    """Scan root and describe every template in it (reads and hashes every file)."""
+    from core.raw_template import loader
+    from core.raw_template.skeleton import get_skeleton
+    from core.raw_template.slot_analyzer import analyze_slots
+
+    root = Path(root)
+    templates = []
+    for tpl in loader.scan_templates(root):
+        tpl_dir = Path(tpl["html_path"]).parent
+        hero = loader.hero_image(tpl_dir)
+        templates.append({
+            "id": tpl["id"],
+            "category": tpl["category"],
+            "name": tpl["name"],
+            "thumb": hero.relative_to(tpl_dir).as_posix() if hero else None,
+            "slots": analyze_slots(tpl["html_path"]),
+            "text_nodes": len(get_skeleton(tpl).texts),
+            "files": {rel: _describe(tpl_dir / rel) for rel in _template_files(tpl_dir)},
+        })
+    return {"version": MANIFEST_VERSION, "templates": templates}
+
+
+def write_template_manifest(manifest: dict, path: Path | None = None) -> Path | None:
+    path = path or manifest_path()
+    if path is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def read_template_manifest(path: Path | None = None) -> dict | None:
+    """The manifest as written, or None when missing, unreadable or of another version."""
+    path = path or manifest_path()
+    if path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def stale_templates(manifest: dict, root: str | Path = TEMPLATE_ROOT, full: bool = False) -> list[str]:
+    """
+    Ids of templates whose files no longer match the manifest (added and
+    removed templates included). Empty means the manifest is current.
+    """
+    root = Path(root)
+    recorded = {t["id"]: t for t in manifest["templates"]}
+    on_disk = set(_template_ids(root))
+    stale = sorted(on_disk.symmetric_difference(recorded))
+
+    for tpl_id in sorted(on_disk & recorded.keys()):
+        tpl_dir = root / tpl_id
+        files = recorded[tpl_id]["files"]
+        if full:
+            names = set(_template_files(tpl_dir))
+            if names != files.keys():
+                stale.append(tpl_id)
+                continue
+        else:
+            names = [n for n in _CORE_FILES if n in files or (tpl_dir / n).exists()]
+        if any(not _unchanged(tpl_dir / rel, files.get(rel)) for rel in names):
+            stale.append(tpl_id)
+    return stale
+
+
+def load_template_manifest() -> dict | None:
+    """The manifest if present and current (quick check), else None — callers then scan template/."""
+    manifest = read_template_manifest()
+    if manifest is None:
+        log.info("[templates] no template manifest — scanning template/ "
+                 "(build one with scripts/build_template_manifest.py)")
+        return None
+    stale = stale_templates(manifest)
+    if stale:
+        log.warning("[templates] template manifest is stale (%d templates, e.g. %s) — scanning template/",
+                    len(stale), stale[0])
+        return None
+    return manifest
+
+
+def file_hashes(manifest: dict) -> dict[str, list]:
+    """{path relative to template/: [size, mtime_ns, sha256]} for every recorded file."""
+    return {
+        f"{t['id']}/{rel}": info
+        for t in manifest["templates"]
+        for rel, info in t["files"].items()
+    }
+
+
+# ── helpers ────────────────────────────────────────────────────────────────
+
+def _template_ids(root: Path) -> list[str]:
+    """<category>/<name> for every dir with an index.html, as loader.scan_templates finds them."""
+    ids = []
+    for cat in sorted(os.listdir(root)):
+        cat_dir = root / cat
+        if not cat_dir.is_dir():
+            continue
+        for name in sorted(os.listdir(cat_dir)):
+            if not name.startswith(".") and (cat_dir / name / "index.html").is_file():
+                ids.append(f"{cat}/{name}")
+    return ids
+
+
+def _template_files(tpl_dir: Path) -> list[str]:
+    files = []
+    for dirpath, dirnames, filenames in os.walk(tpl_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if not name.startswith("."):
+                files.append(Path(dirpath, name).relative_to(tpl_dir).as_posix())
+    return files
+
+
+def _describe(path: Path) -> list:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns, _sha256(path)]
+
+
+def _unchanged(path: Path, info: list | None) -> bool:
+    try:
+        st = path.stat()
+    except OSError:
+        return info is None
+    if info is None or st.st_size != info[0]:
+        return False
+    return st.st_mtime_ns == info[1] or _sha256(path) == info[2]
+
+
+def _sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
@@ -0,0 +1,275 @@
+"""
+Pre-rendered card thumbnails — one small WebP per raw template.
+
+scripts/build_thumbnails.py renders every template once, using the first
+of these that works:
+
+1. a supplied screenshot: thumbnail.{webp,png,jpg,jpeg} in the template dir
+2. a headless Chromium screenshot, with the optional `playwright` package
+3. a schematic drawn with PIL — nav bar, hero image with the first heading,
+   a CTA in the template's --primary-color, and a row of cards
+
+Results are content-addressed by what they were made from:
+
+    {root}/{hash[:2]}/{hash}.webp
+    {root}/manifest.json    {template_id: {"file", "source", "bytes"}}
+
+so a rebuild only re-renders templates whose inputs changed. The files are
+served from /tpl-thumb/<hash>.webp with immutable caching. Only real
+screenshots (sources 1 and 2) replace the hero image as a card's
+"thumb_url" and set "thumb_rendered", letting cards skip the live preview
+until hover. A schematic looks alike for every template, so it is used
+only for templates without a hero image, and still in front of the
+on-view iframe.
+"""
+
+import hashlib
+import html as html_lib
+import io
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageOps
+
+from config.settings import TEMPLATE_THUMBNAILS_PATH
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:  # optional
+    sync_playwright = None
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+
+# Output size and quality — about 15–25 KB per card
+SIZE = (480, 300)
+_QUALITY = 70
+# Layout width templates are rendered at before scaling down
+_VIEWPORT = (1280, 800)
+# Bump to re-render everything after changing how thumbnails are drawn
+_RENDER_VERSION = "1"
+
+_SUPPLIED = ("thumbnail.webp", "thumbnail.png", "thumbnail.jpg", "thumbnail.jpeg")
+_FILE_RE = re.compile(r"[0-9a-f]{64}\.webp")
+_PRIMARY_RE = re.compile(r"--primary-color\s*:\s*(#[0-9a-fA-F]{3,8})\b")
+_H1_RE = re.compile(r"<h1\b[^>]*>(.*?)</h1>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def thumbnail_root() -> Path | None:
+    """Where thumbnails live, or None when TEMPLATE_THUMBNAILS_PATH is "off"."""
+    if TEMPLATE_THUMBNAILS_PATH.lower() in ("", "off", "none"):
+        return None
+    path = Path(TEMPLATE_THUMBNAILS_PATH)
+    return path if path.is_absolute() else _ROOT / path
+
+
+def thumbnail_url(template_id: str) -> str | None:
+    """/tpl-thumb/ URL of the template's pre-rendered thumbnail, if one was built."""
+    entry = _load_manifest().get(template_id)
+    return f"/tpl-thumb/{entry['file']}" if entry else None
+
+
+def thumbnail_is_screenshot(template_id: str) -> bool:
+    """True when the template's thumbnail shows the template itself (supplied or browser), not a schematic."""
+    entry = _load_manifest().get(template_id)
+    return bool(entry) and entry["source"] in ("supplied", "browser")
+
+
+def thumbnail_path(name: str) -> Path | None:
+    """File for a /tpl-thumb/<name> request — None for anything not shaped like one."""
+    root = thumbnail_root()
+    if root is None or not _FILE_RE.fullmatch(name):
+        return None
+    path = root / name[:2] / name
+    return path if path.is_file() else None
+
+
+def build_thumbnails(templates: list[dict], use_browser: bool = True) -> dict[str, dict]:
+    """
+    Render (or reuse) a thumbnail for every template and write the manifest.
+    templates are loader.list_raw_templates() dicts. Returns the manifest.
+    """
+    root = thumbnail_root()
+    if root is None:
+        return {}
+    from core.raw_template.loader import hero_image
+
+    browser = _Browser() if use_browser and sync_playwright is not None else None
+    manifest: dict[str, dict] = {}
+    try:
+        for tpl in templates:
+            tpl_dir = Path(tpl["html_path"]).parent
+            supplied = next((tpl_dir / n for n in _SUPPLIED if (tpl_dir / n).is_file()), None)
+            hero = hero_image(tpl_dir)
+            source = "supplied" if supplied else "browser" if browser else "schematic"
+            digest = _input_hash(source, tpl, supplied, hero)
+            name = f"{digest}.webp"
+            path = root / name[:2] / name
+            if not path.is_file():
+                try:
+                    if supplied:
+                        image = Image.open(supplied)
+                    elif browser:
+                        image = browser.screenshot(tpl["id"])
+                    else:
+                        image = render_schematic(tpl, hero)
+                    _save(image, path)
+                except Exception as exc:
+                    log.warning("[thumbnails] %s failed (%s): %s", tpl["id"], source, exc)
+                    continue
+            manifest[tpl["id"]] = {"file": name, "source": source, "bytes": path.stat().st_size}
+    finally:
+        if browser:
+            browser.close()
+
+    _write_manifest(root / "manifest.json", manifest)
+    _load_manifest.cache_clear()
+    return manifest
+
+
+def render_schematic(tpl: dict, hero: Path | None) -> Image.Image:
+    """Browser-free stand-in for a screenshot, drawn from the template's own colors, copy and hero image."""
+    width, height = _VIEWPORT
+    html = Path(tpl["html_path"]).read_text(encoding="utf-8", errors="ignore")
+    css_path = Path(tpl["css_path"])
+    css = css_path.read_text(encoding="utf-8", errors="ignore") if css_path.exists() else ""
+    m = _PRIMARY_RE.search(css)
+    primary = _color(m.group(1) if m else "", (37, 99, 235))
+
+    canvas = Image.new("RGB", _VIEWPORT, (255, 255, 255))
+    draw = ImageDraw.Draw(canvas)
+    nav_h, hero_bottom = 72, 560
+
+    # Hero: the template's own image, darkened so the heading reads
+    if hero is not None:
+        with Image.open(hero) as im:
+            im = im.convert("RGBA") if im.mode == "P" else im
+            photo = ImageOps.fit(im.convert("RGB"), (width, hero_bottom - nav_h))
+        photo = Image.blend(photo, Image.new("RGB", photo.size, (0, 0, 0)), 0.4)
+        canvas.paste(photo, (0, nav_h))
+    else:
+        draw.rectangle((0, nav_h, width, hero_bottom), fill=primary)
+
+    # Nav: logo mark and links
+    draw.rectangle((0, 0, width, nav_h), fill=(255, 255, 255))
+    draw.ellipse((48, 20, 80, 52), fill=primary)
+    draw.rounded_rectangle((92, 28, 220, 44), radius=8, fill=(40, 40, 48))
+    for i in range(4):
+        x = width - 520 + i * 110
+        draw.rounded_rectangle((x, 30, x + 80, 42), radius=6, fill=(170, 170, 180))
+
+    # Heading and CTA
+    font = _font(60)
+    y = 200
+    for line in _wrap(_first_heading(html) or tpl["name"], 28)[:3]:
+        draw.text((80, y), line, font=font, fill=(255, 255, 255))
+        y += 72
+    draw.rounded_rectangle((80, y + 24, 320, y + 84), radius=12, fill=primary)
+
+    # A row of cards below the fold line
+    for i in range(3):
+        x = 80 + i * 380
+        draw.rounded_rectangle((x, 600, x + 340, height - 20), radius=16, fill=(241, 243, 247))
+        draw.rectangle((x + 24, 632, x + 120, 640), fill=primary)
+        draw.rounded_rectangle((x + 24, 664, x + 300, 676), radius=6, fill=(200, 203, 212))
+        draw.rounded_rectangle((x + 24, 692, x + 260, 704), radius=6, fill=(200, 203, 212))
+    return canvas
+
+
+# ── helpers ────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=1)
+def _load_manifest() -> dict[str, dict]:
+    root = thumbnail_root()
+    if root is None:
+        return {}
+    try:
+        with open(root / "manifest.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _input_hash(source: str, tpl: dict, supplied: Path | None, hero: Path | None) -> str:
+    h = hashlib.sha256(f"{_RENDER_VERSION}:{source}:{SIZE}".encode())
+    inputs = [supplied] if supplied else [Path(tpl["html_path"]), Path(tpl["css_path"])]
+    if source == "schematic" and hero is not None:
+        inputs.append(hero)
+    for path in inputs:
+        if path.is_file():
+            with open(path, "rb") as f:
+                h.update(hashlib.file_digest(f, "sha256").digest())
+    return h.hexdigest()
+
+
+def _save(image: Image.Image, path: Path) -> None:
+    """Cover-crop to SIZE (from the top, like a viewport) and write WebP atomically."""
+    with image:
+        thumb = ImageOps.fit(image.convert("RGB"), SIZE, Image.LANCZOS, centering=(0.5, 0.0))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    thumb.save(tmp, "WEBP", quality=_QUALITY, method=6)
+    os.replace(tmp, path)
+
+
+def _color(value: str, default: tuple) -> tuple:
+    try:
+        return ImageColor.getrgb(value)[:3]
+    except ValueError:
+        return default
+
+
+def _first_heading(html: str) -> str:
+    m = _H1_RE.search(html)
+    if not m:
+        return ""
+    return " ".join(html_lib.unescape(_TAG_RE.sub(" ", m.group(1))).split())
+
+
+def _wrap(text: str, width: int) -> list[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    return lines + [line] if line else lines
+
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has only the fixed bitmap font
+        return ImageFont.load_default()
+
+
+class _Browser:
+    """One headless Chromium for the whole build, loading each template straight from disk."""
+
+    def __init__(self):
+        self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch()
+        self._page = self._browser.new_page(viewport={"width": _VIEWPORT[0], "height": _VIEWPORT[1]})
+
+    def screenshot(self, tpl_id: str) -> Image.Image:
+        tpl_dir = _ROOT / "template" / tpl_id
+        self._page.goto((tpl_dir / "index.html").as_uri(), wait_until="networkidle")
+        return Image.open(io.BytesIO(self._page.screenshot(type="png")))
+
+    def close(self) -> None:
+        self._browser.close()
+        self._pw.stop()
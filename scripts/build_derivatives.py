@@ -0,0 +1,30 @@
+"""
+Admin utility: pre-generate the resized WebP/AVIF copies of every template
+image, so no visitor waits for one to be made on first request.
+Usage: uv run python scripts/build_derivatives.py [formats, e.g. "webp,avif"]
+"""
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from core.raw_template import derivatives
+
+
+def build(formats: str | None = None):
+    root = derivatives.derivative_root()
+    if root is None:
+        print("IMAGE_DERIVATIVES_PATH is off — nothing to do.")
+        return
+
+    chosen = tuple(f.strip() for f in formats.split(",")) if formats else derivatives.output_formats()
+    print(f"Building {', '.join(chosen)} derivatives in {root}...")
+    made = derivatives.build_all(formats=chosen)
+    print(f"Done — {made} derivatives.")
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else None)
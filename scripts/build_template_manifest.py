@@ -0,0 +1,50 @@
+"""
+Build step: regenerate the template manifest (see
+core/raw_template/template_manifest.py) that workers load instead of
+scanning template/. Re-run after adding or editing templates.
+Usage: uv run python scripts/build_template_manifest.py [--check [--full]]
+  --check   only report whether the manifest is current (exit 1 if stale)
+  --full    with --check, compare every asset file, not just html/css/js
+"""
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from core.raw_template.template_manifest import (
+    build_template_manifest,
+    manifest_path,
+    read_template_manifest,
+    stale_templates,
+    write_template_manifest,
+)
+
+
+def check(full: bool = False) -> int:
+    manifest = read_template_manifest()
+    if manifest is None:
+        print(f"No usable manifest at {manifest_path()}.")
+        return 1
+    stale = stale_templates(manifest, full=full)
+    if stale:
+        print(f"Stale — {len(stale)} templates changed: {', '.join(stale)}")
+        return 1
+    print(f"Current — {len(manifest['templates'])} templates.")
+    return 0
+
+
+def build() -> int:
+    if manifest_path() is None:
+        print("TEMPLATE_MANIFEST_PATH is off — nothing to do.")
+        return 0
+    manifest = build_template_manifest()
+    path = write_template_manifest(manifest)
+    files = sum(len(t["files"]) for t in manifest["templates"])
+    print(f"Wrote {path} — {len(manifest['templates'])} templates, {files} files.")
+    return 0
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(check(full="--full" in sys.argv))
+    sys.exit(build())
@@ -0,0 +1,33 @@
+"""
+Build step: render a small WebP thumbnail for every raw template (see
+core/raw_template/thumbnails.py). Re-run after adding or editing templates;
+unchanged templates are skipped.
+Usage: uv run python scripts/build_thumbnails.py [--no-browser]
+"""
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from core.raw_template.loader import list_raw_templates
+from core.raw_template.thumbnails import build_thumbnails, thumbnail_root
+
+
+def build(use_browser: bool = True):
+    root = thumbnail_root()
+    if root is None:
+        print("TEMPLATE_THUMBNAILS_PATH is off — nothing to do.")
+        return
+
+    templates = list_raw_templates()
+    print(f"Rendering thumbnails for {len(templates)} templates into {root}...")
+    manifest = build_thumbnails(templates, use_browser=use_browser)
+    sources: dict[str, int] = {}
+    for entry in manifest.values():
+        sources[entry["source"]] = sources.get(entry["source"], 0) + 1
+    total = sum(e["bytes"] for e in manifest.values())
+    print(f"Done — {len(manifest)} thumbnails {sources}, {total // max(len(manifest), 1)} bytes average.")
+
+
+if __name__ == "__main__":
+    build(use_browser="--no-browser" not in sys.argv)
@@ -0,0 +1,33 @@
+"""
+Admin utility: write the static export bundle for every published page
+(e.g. after enabling STATIC_EXPORT_PATH on an existing install).
+Usage: uv run python scripts/export_sites.py
+"""
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from user_app.db import get_client
+from user_app.services.publish_service import export_static, static_export_root
+
+
+def export_all():
+    root = static_export_root()
+    if root is None:
+        print("STATIC_EXPORT_PATH is off — nothing to do.")
+        return
+
+    result = get_client().table("pages").select("id").eq("state", "published").execute()
+    print(f"Exporting {len(result.data)} published pages to {root}...")
+    for row in result.data:
+        bundle = export_static(row["id"])
+        print(f"  {row['id']}: {bundle or 'skipped'}")
+    print("Done.")
+
+
+if __name__ == "__main__":
+    export_all()
@@ -339,7 +339,9 @@ function validateAndSubmit() {
         goal.focus();
         return false;
     }
-    return showLoading('Building your site...');
+    var form = name ? name.closest('form') : null;
+    var livePreview = form ? form.getAttribute('data-live-preview') : null;
+    return showLoading('Building your site...', livePreview);
 }
 
 // --- Preview ---
@@ -436,15 +438,23 @@ function escapeHtml(text) {
 
 // --- Loading Overlay ---
 
-function showLoading(message) {
+function showLoading(message, previewUrl) {
     var overlay = document.createElement('div');
     overlay.className = 'loading-overlay';
     overlay.innerHTML =
-        '<div class="loading-card">' +
+        '<div class="loading-card' + (previewUrl ? ' loading-card--preview' : '') + '">' +
         '<div class="loading-spinner"></div>' +
         '<div class="loading-message">' + escapeHtml(message) + '</div>' +
         '<div class="loading-subtext">This may take a moment</div>' +
         '</div>';
+    if (previewUrl) {
+        // Live preview: the iframe fills in rewritten copy as it streams in
+        var frame = document.createElement('iframe');
+        frame.className = 'loading-preview';
+        frame.title = 'Live preview';
+        frame.src = previewUrl;
+        overlay.firstChild.appendChild(frame);
+    }
     document.body.appendChild(overlay);
     return true;
 }
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the supabase client — the subset of the query
+    builder that user_app.db uses, over plain lists of row dicts.
+
+    Every executed SELECT is logged in `selects` (its column list, or "count"
+    for head/count-only queries) and every UPDATE payload in `updates`.
+    """
+
+    def __init__(self, **tables: list[dict]):
+        self.tables = {name: list(rows) for name, rows in tables.items()}
+        self.selects: list[str] = []
+        self.updates: list[dict] = []
+
+    def table(self, name: str) -> "FakeQuery":
+        return FakeQuery(self, self.tables.setdefault(name, []))
+
+
+class FakeQuery:
+    def __init__(self, client: FakeSupabase, rows: list[dict]):
+        self.client = client
+        self.rows = rows
+        self.op = "select"
+        self.cols = "*"
+        self.head = False
+        self.payload = None
+        self.filters = []
+        self.sort = None
+        self.window = None
+
+    def select(self, cols: str = "*", count=None, head=None):
+        self.op, self.cols, self.head = "select", cols, bool(head)
+        return self
+
+    def update(self, data: dict):
+        self.op, self.payload = "update", data
+        return self
+
+    def insert(self, data):
+        self.op, self.payload = "insert", data
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, col, value):
+        self.filters.append(lambda r: r.get(col) == value)
+        return self
+
+    def neq(self, col, value):
+        self.filters.append(lambda r: r.get(col) != value)
+        return self
+
+    def order(self, col, desc=False):
+        self.sort = (col, desc)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def limit(self, n):
+        self.window = (0, n)
+        return self
+
+    def execute(self):
+        if self.op == "insert":
+            new = self.payload if isinstance(self.payload, list) else [self.payload]
+            self.rows.extend(dict(r) for r in new)
+            return SimpleNamespace(data=[dict(r) for r in new], count=None)
+
+        matched = [r for r in self.rows if all(f(r) for f in self.filters)]
+        if self.op == "update":
+            self.client.updates.append(self.payload)
+            for row in matched:
+                row.update(self.payload)
+            return SimpleNamespace(data=[dict(r) for r in matched], count=None)
+        if self.op == "delete":
+            self.rows[:] = [r for r in self.rows if r not in matched]
+            return SimpleNamespace(data=matched, count=None)
+
+        self.client.selects.append("count" if self.head else self.cols)
+        if self.head:
+            return SimpleNamespace(data=[], count=len(matched))
+        if self.sort:
+            col, desc = self.sort
+            matched.sort(key=lambda r: r.get(col) or "", reverse=desc)
+        if self.window:
+            matched = matched[slice(*self.window)]
+        cols = None if self.cols == "*" else [c.strip() for c in self.cols.split(",")]
+        data = [dict(r) if cols is None else {c: r.get(c) for c in cols} for r in matched]
+        return SimpleNamespace(data=data, count=None)
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """An empty FakeSupabase wired in as user_app.db's client; seed it via .tables."""
+    from user_app import db
+
+    client = FakeSupabase()
+    monkeypatch.setattr(db, "get_client", lambda: client)
+    return client
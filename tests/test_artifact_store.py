@@ -0,0 +1,91 @@
+import gzip
+import os
+
+from core.publishing.artifact_store import ArtifactStore
+from core.publishing.artifacts import build_site_artifact
+from user_app import db
+
+
+_HTML = "<html><head></head><body>" + "<p>published</p>" * 100 + "</body></html>"
+
+
+def test_store_roundtrip_and_version_switch(tmp_path):
+    store = ArtifactStore(tmp_path)
+    assert store.stamp("p1") is None and store.get("p1") is None
+
+    store.put("p1", build_site_artifact(_HTML, "", 1))
+    stamp, artifact = store.get("p1")
+    assert stamp == store.stamp("p1")
+    assert bytes(artifact.bodies["identity"]).startswith(b"<html>")
+    assert gzip.decompress(artifact.bodies["gzip"]) == bytes(artifact.bodies["identity"])
+
+    store.put("p1", build_site_artifact(_HTML.replace("published", "v2"), "", 2))
+    assert store.get("p1")[1].version == 2
+    assert not any(p.name.startswith("v1.") for p in (tmp_path / "p1").iterdir())
+
+    store.drop("p1")
+    assert store.stamp("p1") is None
+    assert store.stamp("../etc") is None
+
+
+def test_hot_path_makes_no_db_calls(tmp_path, monkeypatch, fake_supabase):
+    fake_supabase.tables["pages"] = [{
+        "id": "p1", "user_id": "u1", "state": "published",
+        "site_version": {"html": _HTML, "css": "", "version": 4, "is_published": True},
+    }]
+    monkeypatch.setattr(db, "_ARTIFACT_STORE", ArtifactStore(tmp_path))
+    db._invalidate("p1", "u1")
+
+    artifact = db.get_site_artifact("p1")
+    assert artifact.version == 4
+    cold = len(fake_supabase.selects)
+    for _ in range(5):
+        assert db.get_site_artifact("p1").etag == artifact.etag
+    assert len(fake_supabase.selects) == cold
+
+    # Another worker on the host reads the same disk copy without the DB
+    db._ARTIFACT_CACHE.invalidate("p1")
+    assert db.get_site_artifact("p1").etag == artifact.etag
+    assert len(fake_supabase.selects) == cold
+
+    # A write drops the published copy everywhere on the host
+    db._invalidate("p1", "u1")
+    assert db._ARTIFACT_STORE.stamp("p1") is None
+
+
+def _age(store, page_id):
+    """Make the stored copy look due for revalidation."""
+    os.utime(store.root / page_id / "CURRENT", ns=(1, 1))
+
+
+def test_revalidation_rebuilds_after_a_save_elsewhere(tmp_path, monkeypatch, fake_supabase):
+    row = {
+        "id": "p1", "user_id": "u1", "state": "published", "updated_at": "2026-01-01T00:00:00+00:00",
+        "site_version": {"html": _HTML, "css": "", "version": 4, "is_published": True},
+    }
+    fake_supabase.tables["pages"] = [row]
+    store = ArtifactStore(tmp_path)
+    monkeypatch.setattr(db, "_ARTIFACT_STORE", store)
+    db._invalidate("p1", "u1")
+
+    first = db.get_site_artifact("p1")
+    assert store.source("p1") == row["updated_at"]
+
+    # Unchanged row: the copy is kept and only re-stamped
+    _age(store, "p1")
+    assert db.get_site_artifact("p1").etag == first.etag
+    assert store.stamp("p1")[1] > 1
+
+    # Saved on another host (no local _invalidate): same version, new HTML
+    row["site_version"] = dict(row["site_version"], html=_HTML.replace("published", "edited"))
+    row["updated_at"] = "2026-01-02T00:00:00+00:00"
+    _age(store, "p1")
+    edited = db.get_site_artifact("p1")
+    assert edited.etag != first.etag
+    assert b"edited" in bytes(edited.bodies["identity"])
+    assert store.source("p1") == row["updated_at"]
+
+    # A rebuild from a row read before the last save is caught the same way
+    store.put("p1", first, source="2026-01-01T00:00:00+00:00")
+    _age(store, "p1")
+    assert db.get_site_artifact("p1").etag == edited.etag
@@ -0,0 +1,40 @@
+from user_app import db
+
+
+def _rows(n_live, n_draft):
+    rows = []
+    for i in range(n_live + n_draft):
+        rows.append({
+            "id": f"p{i:03d}", "user_id": "u1", "state": "published" if i < n_live else "draft",
+            "brand_memory": None, "template_id": None,
+            "created_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+            "updated_at": None, "published_at": None,
+        })
+    return rows
+
+
+def _kinds(selects):
+    return ["count" if cols == "count" else "page" for cols in selects]
+
+
+def test_dashboard_fetches_only_the_visible_page(fake_supabase):
+    fake_supabase.tables["pages"] = _rows(n_live=4, n_draft=200)
+    db._DASHBOARD_CACHE.clear()
+
+    projects, counts, page = db.get_dashboard_page("u1", "unfinished", 2, 6)
+    assert counts == {"all": 204, "live": 4, "unfinished": 200}
+    assert page == 2
+    assert [p.id for p in projects] == [f"p{i:03d}" for i in range(10, 16)]
+    assert _kinds(fake_supabase.selects) == ["count", "count", "page"]
+
+    # Counts are reused; an out-of-range page is clamped to the last one
+    projects, _, page = db.get_dashboard_page("u1", "live", 9, 6)
+    assert page == 1 and len(projects) == 4
+    assert _kinds(fake_supabase.selects) == ["count", "count", "page", "page"]
+
+    db.get_dashboard_page("u1", "unfinished", 2, 6)
+    assert len(fake_supabase.selects) == 4  # served from cache
+
+    db._invalidate("p010", "u1")
+    db.get_dashboard_page("u1", "unfinished", 2, 6)
+    assert len(fake_supabase.selects) == 7
@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+from PIL import Image
+from starlette.requests import Request
+
+from core.raw_template import asset_manifest, derivatives
+from core.raw_template.asset_manifest import build_manifest
+from core.raw_template.assembler import _srcset_sizes, img_tag
+from user_app.routes import upload_routes
+
+
+def _manifest(tmp_path, monkeypatch):
+    assets = tmp_path / "template" / "cat" / "tpl" / "assets"
+    assets.mkdir(parents=True)
+    Image.new("RGB", (1500, 1000), (200, 40, 40)).save(assets / "header.jpg", quality=95)
+    Image.new("RGBA", (200, 200), (0, 0, 0, 0)).save(assets / "icon.png")
+    manifest = build_manifest(tmp_path / "template")
+    monkeypatch.setattr(asset_manifest, "_manifest", manifest)
+    monkeypatch.setattr(derivatives, "IMAGE_DERIVATIVES_PATH", str(tmp_path / "derivatives"))
+    monkeypatch.setattr(derivatives, "IMAGE_DERIVATIVE_FORMATS", "avif,webp")
+    monkeypatch.setattr(derivatives, "_ready", {})
+    return manifest
+
+
+def _serve(rest, query="", **headers):
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    req = Request({"type": "http", "method": "GET", "path": "/raw-asset/" + rest,
+                   "query_string": query.encode(), "headers": raw})
+    return asyncio.run(upload_routes.serve_raw_asset(req, rest))
+
+
+def test_widths_and_choice(tmp_path, monkeypatch):
+    manifest = _manifest(tmp_path, monkeypatch)
+    header = manifest.get("cat/tpl/assets/header.jpg")
+    assert derivatives.responsive_widths(header) == (320, 640, 1280, 1500)
+    assert derivatives.responsive_widths(manifest.get("cat/tpl/assets/icon.png")) == ()
+
+    assert derivatives.choose(header, 500, "image/avif,image/webp,*/*") == (640, "avif")
+    assert derivatives.choose(header, 500, "image/webp,image/avif;q=0") == (640, "webp")
+    assert derivatives.choose(header, 5000, "*/*") is None
+    assert derivatives.choose(header, None, "*/*") is None
+
+
+def test_srcset_only_for_template_images(tmp_path, monkeypatch):
+    _manifest(tmp_path, monkeypatch)
+    widths = derivatives.template_widths("cat/tpl", "header.jpg")
+    tag = img_tag('<img src="', "/raw-asset/cat/tpl/assets/header.jpg", '" alt="x">', widths)
+    assert tag == (
+        '<img src="/raw-asset/cat/tpl/assets/header.jpg" srcset="'
+        "/raw-asset/cat/tpl/assets/header.jpg?w=320 320w, "
+        "/raw-asset/cat/tpl/assets/header.jpg?w=640 640w, "
+        "/raw-asset/cat/tpl/assets/header.jpg?w=1280 1280w, "
+        '/raw-asset/cat/tpl/assets/header.jpg 1500w" alt="x">'
+    )
+    assert img_tag("<img src='", "/u.png", "'>", ()) == "<img src='/u.png'>"
+    sized = img_tag('<img src="', "/raw-asset/cat/tpl/assets/header.jpg", '" alt="x">', widths, "100vw")
+    assert sized.endswith('1500w" sizes="100vw" alt="x">')
+
+
+def test_sizes_follow_tag_then_slot():
+    assert _srcset_sizes('<img src="assets/a.jpg" sizes="33vw">', "gallery") == ""
+    assert _srcset_sizes('<img src="assets/a.jpg" width="240" height="160">', "gallery") == "240px"
+    assert _srcset_sizes('<img src="assets/a.jpg" data-width="9">', "hero") == "100vw"
+    assert _srcset_sizes('<img src="assets/a.jpg">', "gallery") == "(max-width: 600px) 100vw, 600px"
+    assert _srcset_sizes('<img src="assets/a.jpg">', "logo") == "(max-width: 200px) 100vw, 200px"
+
+
+def test_serve_resized_webp(tmp_path, monkeypatch):
+    manifest = _manifest(tmp_path, monkeypatch)
+    monkeypatch.setattr(derivatives, "IMAGE_DERIVATIVE_FORMATS", "webp")
+    resp = _serve("cat/tpl/assets/header.jpg", "w=600", Accept="image/webp,*/*")
+    assert resp.status_code == 200
+    assert resp.media_type == "image/webp"
+    assert resp.headers["vary"] == "Accept"
+    assert "immutable" in resp.headers["cache-control"]  # content-addressed
+    with Image.open(resp.path) as im:
+        assert im.format == "WEBP" and im.size == (640, 427)
+    assert os.path.getsize(resp.path) < manifest.get("cat/tpl/assets/header.jpg").size
+
+    again = _serve("cat/tpl/assets/header.jpg", "w=600", Accept="image/webp", **{"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+    original = _serve("cat/tpl/assets/header.jpg", Accept="image/jpeg")
+    assert original.path.endswith("header.jpg")
+    assert original.headers["vary"] == "Accept"
+    assert "immutable" not in original.headers["cache-control"]
@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+
+from core.models.project import NOT_LOADED
+from user_app import db
+
+
+def _page_row():
+    return {
+        "id": "p1", "user_id": "u1", "state": "preview", "template_id": "t1",
+        "trial_ends_at": None, "is_paused": False, "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": None, "published_at": None, "brand_memory": None,
+        "ai_usage": None, "site_plan": None,
+        "site_version": {"html": "<html>" + "x" * 5000, "css": "", "version": 1, "is_published": False},
+    }
+
+
+def test_site_version_is_fetched_only_when_read(fake_supabase):
+    fake = fake_supabase
+    fake.tables["pages"] = [_page_row()]
+    db._invalidate("p1", "u1")
+
+    project = db.get_project("p1")
+    assert "site_version" not in fake.selects[0]
+    assert not project.is_loaded("site_version")
+    # The cached copy stays small across workers
+    assert pickle.loads(pickle.dumps(project)).__dict__["_site_version"] is NOT_LOADED
+
+    cached_bytes = db._PROJECT_CACHE.stats()["bytes"]
+    assert project.site_version.html.startswith("<html>")
+    assert fake.selects[1:] == ["site_version"]
+    # The loaded HTML now counts against PROJECT_CACHE_MAX_MB
+    assert db._PROJECT_CACHE.stats()["bytes"] >= cached_bytes + 5000
+    project.site_version.html
+    assert len(fake.selects) == 2
+
+
+def test_save_project_keeps_unread_site_version(fake_supabase):
+    fake = fake_supabase
+    fake.tables["pages"] = [_page_row()]
+    db._invalidate("p1", "u1")
+
+    project = db.get_project("p1")
+    db.save_project(project)
+    assert "site_version" not in fake.updates[-1]
+    assert fake.tables["pages"][0]["site_version"]["html"].startswith("<html>")
+
+    project = db.get_project("p1")
+    project.site_version.html = "<html>edited"
+    db.save_project(project)
+    assert fake.updates[-1]["site_version"]["html"] == "<html>edited"
+
+
+def test_save_project_fields_sends_only_those_columns(fake_supabase):
+    fake = fake_supabase
+    fake.tables["pages"] = [_page_row()]
+    db._invalidate("p1", "u1")
+
+    project = db.get_project("p1")
+    project.site_version  # loaded, but not listed below
+    db.save_project(project, fields=("state",))
+    assert fake.updates[-1] == {"state": "preview"}
+
+    with pytest.raises(ValueError):
+        db.save_project(project, fields=("html",))
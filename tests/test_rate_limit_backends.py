@@ -0,0 +1,102 @@
+import time
+
+from core.limits.backends import RedisBackend, SQLiteBackend
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for the Redis calls RedisBackend uses."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[int, float]] = {}
+
+    def _live(self, key):
+        value = self.data.get(key)
+        if value and value[1] <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key):
+        value = self._live(key)
+        return str(value[0]).encode() if value else None
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [k for k in self.data if k.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    def set(self, key, value, ex, nx):
+        self.ops.append(("set", key, value, ex))
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def execute(self):
+        results = []
+        for op in self.ops:
+            if op[0] == "set":
+                if self.redis._live(op[1]) is None:
+                    self.redis.data[op[1]] = (op[2], time.time() + op[3])
+                results.append(True)
+            else:
+                count, expires = self.redis._live(op[1])
+                self.redis.data[op[1]] = (count + 1, expires)
+                results.append(count + 1)
+        return results
+
+
+def test_sqlite_limit_is_shared_between_workers(tmp_path):
+    path = tmp_path / "limits.sqlite3"
+    worker_a = SQLiteBackend(path, namespace="req:")
+    worker_b = SQLiteBackend(path, namespace="req:")
+
+    results = [w.hit("site:1.2.3.4", limit=3, window_seconds=60) for w in (worker_a, worker_b) * 2]
+
+    assert results == [False, False, False, True]
+    assert worker_b.count("site:1.2.3.4", 60) == 4
+    assert worker_a.count("site:5.6.7.8", 60) == 0
+
+
+def test_sqlite_reset_treats_key_literally(tmp_path):
+    backend = SQLiteBackend(tmp_path / "limits.sqlite3", namespace="req_")
+    other = SQLiteBackend(tmp_path / "limits.sqlite3", namespace="reqx")
+    for key in ("a_b", "axb", "a%"):
+        backend.record(key, 60)
+    other.record("a_b", 60)
+
+    backend.reset("a_b")
+    backend.reset("a%")
+    assert backend.count("a_b", 60) == 0 and backend.count("a%", 60) == 0
+    assert backend.count("axb", 60) == 1
+    assert other.count("a_b", 60) == 1
+
+    backend.reset()
+    assert backend.stats()["keys"] == 0 and other.stats()["keys"] == 1
+
+
+def test_sqlite_window_expires(tmp_path):
+    backend = SQLiteBackend(tmp_path / "limits.sqlite3")
+    assert backend.hit("k", limit=1, window_seconds=0.05) is False
+    assert backend.hit("k", limit=1, window_seconds=0.05) is True
+    time.sleep(0.06)
+    assert backend.hit("k", limit=1, window_seconds=0.05) is False
+
+
+def test_redis_backend_against_stand_in():
+    shared = FakeRedis()
+    worker_a, worker_b = RedisBackend(shared, "req:"), RedisBackend(shared, "req:")
+
+    assert [w.hit("braindump:u1", 2, 3600) for w in (worker_a, worker_b, worker_a)] == [False, False, True]
+    worker_b.reset("braindump:u1")
+    assert worker_a.count("braindump:u1", 3600) == 0
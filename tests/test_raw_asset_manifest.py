@@ -0,0 +1,62 @@
+import asyncio
+import gzip
+
+from starlette.requests import Request
+
+from core.raw_template import asset_manifest
+from core.raw_template.asset_manifest import build_manifest
+from user_app.routes import upload_routes
+
+
+def _tree(tmp_path):
+    (tmp_path / "cat" / "tpl" / "assets").mkdir(parents=True)
+    (tmp_path / "cat" / "tpl" / "styles.css").write_text("body { color: red; }\n" * 200)
+    (tmp_path / "cat" / "tpl" / "assets" / "hero.jpg").write_bytes(bytes(range(256)) * 40)
+    return tmp_path
+
+
+def _request(path, headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": path, "headers": raw})
+
+
+def test_manifest_hashes_are_reused(tmp_path):
+    root = _tree(tmp_path / "template")
+    cache = tmp_path / "hashes.json"
+    first = build_manifest(root, cache)
+    assert first.get("cat/tpl/styles.css").media_type == "text/css"
+    assert "gzip" in first.get("cat/tpl/styles.css").encodings
+    assert first.get("cat/tpl/assets/hero.jpg").encodings == {}
+    assert first.get("cat/../cat/tpl/styles.css") is None
+
+    second = build_manifest(root, cache)
+    assert second.get("cat/tpl/assets/hero.jpg").etag == first.get("cat/tpl/assets/hero.jpg").etag
+
+
+def test_serve_raw_asset_conditional_range_and_gzip(tmp_path, monkeypatch):
+    manifest = build_manifest(_tree(tmp_path / "template"))
+    monkeypatch.setattr(asset_manifest, "_manifest", manifest)
+    serve = lambda rest, **h: asyncio.run(upload_routes.serve_raw_asset(_request("/raw-asset/" + rest, h), rest))
+
+    css = serve("cat/tpl/styles.css", **{"Accept-Encoding": "gzip, br"})
+    assert css.headers["content-encoding"] in ("gzip", "br")
+    if css.headers["content-encoding"] == "gzip":
+        assert gzip.decompress(css.body).startswith(b"body { color: red; }")
+    # Not fingerprinted: revalidated, not immutable. Each coding has its own ETag
+    assert "immutable" not in css.headers["cache-control"]
+    plain = serve("cat/tpl/styles.css")
+    assert css.headers["etag"] != plain.headers["etag"] == manifest.get("cat/tpl/styles.css").etag
+    same = serve("cat/tpl/styles.css", **{"Accept-Encoding": "gzip, br", "If-None-Match": css.headers["etag"]})
+    assert same.status_code == 304
+    assert serve("cat/tpl/styles.css", **{"If-None-Match": css.headers["etag"]}).status_code == 200
+    # q=0 refuses a coding, and tokens match exactly (x-gzip is not gzip)
+    for refused in ("br;q=0, gzip;q=0", "x-gzip", "identity"):
+        assert "content-encoding" not in serve("cat/tpl/styles.css", **{"Accept-Encoding": refused}).headers
+    assert serve("cat/tpl/styles.css", **{"Accept-Encoding": "br;q=0, gzip"}).headers["content-encoding"] == "gzip"
+
+    etag = manifest.get("cat/tpl/assets/hero.jpg").etag
+    assert serve("cat/tpl/assets/hero.jpg", **{"If-None-Match": etag}).status_code == 304
+    img = serve("cat/tpl/assets/hero.jpg", Range="bytes=0-9")
+    assert img.headers["etag"] == etag and img.headers["accept-ranges"] == "bytes"
+
+    assert serve("../secrets.txt").status_code == 404
@@ -0,0 +1,58 @@
+import time
+
+from core.raw_template.rewrite_cache import RewriteCache, cache_key
+
+
+def test_cache_key_is_stable_and_content_addressed():
+    texts = {"__T0__": "Hello", "__T1__": "World"}
+    key = cache_key("food/food_one", texts, "Business Name: A", "model", 0.35)
+
+    # Same inputs, different dict order → same key
+    assert key == cache_key("food/food_one", {"__T1__": "World", "__T0__": "Hello"}, "Business Name: A", "model", 0.35)
+
+    # Any input change → different key
+    assert key != cache_key("food/food_two", texts, "Business Name: A", "model", 0.35)
+    assert key != cache_key("food/food_one", texts, "Business Name: B", "model", 0.35)
+    assert key != cache_key("food/food_one", texts, "Business Name: A", "other-model", 0.35)
+    assert key != cache_key("food/food_one", texts, "Business Name: A", "model", 0.7)
+
+
+def test_get_put_roundtrip_and_persistence(tmp_path):
+    path = tmp_path / "rewrite.sqlite3"
+    cache = RewriteCache(path, ttl_seconds=60, max_entries=10)
+    assert cache.get("k") is None
+
+    cache.put("k", {"__T0__": "Fresh copy — café"})
+    assert cache.get("k") == {"__T0__": "Fresh copy — café"}
+    cache.close()
+
+    # A second process opening the same file sees the entry
+    reopened = RewriteCache(path, ttl_seconds=60, max_entries=10)
+    assert reopened.get("k") == {"__T0__": "Fresh copy — café"}
+    assert reopened.stats()["hits"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = RewriteCache(tmp_path / "rewrite.sqlite3", ttl_seconds=0, max_entries=10)
+    cache.put("k", {"__T0__": "x"})
+    time.sleep(0.01)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_beyond_max_entries(tmp_path):
+    cache = RewriteCache(tmp_path / "rewrite.sqlite3", ttl_seconds=60, max_entries=2)
+    cache.put("a", {"v": 1})
+    time.sleep(0.01)
+    cache.put("b", {"v": 2})
+    time.sleep(0.01)
+    cache.get("a")  # "a" is now more recently used than "b"
+    time.sleep(0.01)
+    cache.put("c", {"v": 3})
+
+    cache.evict()
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
@@ -0,0 +1,78 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import core.raw_template.rewriter as rewriter
+from core.models.brand_memory import BrandMemory
+
+
+HTML = (
+    "<html><body>"
+    "<header><h1>Header title</h1><a>Header link</a></header>"
+    "<section><h2>About section</h2><p>About body text</p></section>"
+    "<section><h2>Menu section</h2><p>Menu body text</p></section>"
+    "<footer><p>Footer text</p></footer>"
+    "</body></html>"
+)
+
+
+def test_chunks_follow_section_boundaries():
+    stripped, _ = rewriter._strip_code(HTML)
+    templated, texts = rewriter._extract_texts(stripped)
+
+    chunks = rewriter._chunk_texts(templated, texts, max_chars=30)
+
+    assert [list(c.values()) for c in chunks] == [
+        ["Header title", "Header link"],
+        ["About section", "About body text"],
+        ["Menu section", "Menu body text"],
+        ["Footer text"],
+    ]
+    # Large budget → everything in one call
+    assert len(rewriter._chunk_texts(templated, texts, max_chars=10_000)) == 1
+
+
+def test_failed_chunk_keeps_original_text(monkeypatch):
+    monkeypatch.setattr(rewriter, "REWRITE_CHUNK_MAX_CHARS", 30)
+    monkeypatch.setattr(rewriter, "_cache_get", lambda key: None)
+    monkeypatch.setattr(rewriter, "_cache_put", lambda key, value: None)
+
+    async def fake_completion(model, messages, **params):
+        texts = json.loads(messages[1]["content"].split("Texts to rewrite:\n", 1)[1])
+        if "Menu section" in texts.values():
+            raise RuntimeError("upstream 503")
+        content = json.dumps({k: v.upper() for k, v in texts.items()})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(rewriter, "achat_completion", fake_completion)
+
+    out = asyncio.run(rewriter.rewrite_html_async(HTML, BrandMemory(business_name="Acme", website_type="landing", primary_goal="leads")))
+
+    assert "HEADER TITLE" in out and "ABOUT BODY TEXT" in out and "FOOTER TEXT" in out
+    assert "Menu section" in out and "Menu body text" in out
+
+
+def test_stream_rewrite_reports_pairs_and_keeps_failed_chunk(monkeypatch):
+    monkeypatch.setattr(rewriter, "REWRITE_CHUNK_MAX_CHARS", 30)
+    monkeypatch.setattr(rewriter, "_cache_get", lambda key: None)
+    monkeypatch.setattr(rewriter, "_cache_put", lambda key, value: None)
+
+    async def fake_stream(model, messages, **params):
+        texts = json.loads(messages[1]["content"].split("Texts to rewrite:\n", 1)[1])
+        if "Menu section" in texts.values():
+            raise RuntimeError("upstream 503")
+        content = json.dumps({k: v.upper() for k, v in texts.items()})
+        for i in range(0, len(content), 7):
+            yield content[i:i + 7]
+
+    monkeypatch.setattr(rewriter, "astream_chat_completion", fake_stream)
+
+    pairs = {}
+    memory = BrandMemory(business_name="Acme", website_type="landing", primary_goal="leads")
+    out = asyncio.run(rewriter.rewrite_html_stream(HTML, memory, lambda k, v: pairs.__setitem__(k, v)))
+
+    assert "HEADER TITLE" in out and "ABOUT BODY TEXT" in out and "FOOTER TEXT" in out
+    assert "Menu section" in out and "Menu body text" in out
+    assert sorted(pairs.values()) == sorted(
+        ["HEADER TITLE", "HEADER LINK", "ABOUT SECTION", "ABOUT BODY TEXT", "FOOTER TEXT"]
+    )
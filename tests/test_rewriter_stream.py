@@ -0,0 +1,14 @@
+from core.raw_template.rewriter import _PairStreamParser
+
+
+RAW = '```json\n{"__T0__": "Fresh \\"bread\\" daily", "__T1__": "Caf\\u00e9 & more", "__T2__": 3}\n```'
+
+
+def test_parser_yields_pairs_regardless_of_chunking():
+    expected = [("__T0__", 'Fresh "bread" daily'), ("__T1__", "Café & more")]
+    for size in (1, 2, 7, len(RAW)):
+        parser = _PairStreamParser()
+        pairs = []
+        for i in range(0, len(RAW), size):
+            pairs.extend(parser.feed(RAW[i:i + size]))
+        assert pairs == expected
@@ -0,0 +1,36 @@
+import gzip
+
+from core.publishing.artifacts import build_site_artifact
+
+
+_HTML = "<html><head><title>x</title></head><body>" + "<p>hello</p>" * 200 + "</body></html>"
+
+
+def test_artifact_encodings_and_negotiation():
+    artifact = build_site_artifact(_HTML, "body{color:red}", version=3)
+
+    assert artifact.etag.startswith('"v3-')
+    assert gzip.decompress(artifact.bodies["gzip"]) == artifact.bodies["identity"]
+    assert build_site_artifact(_HTML, "body{color:red}", 3) == artifact  # deterministic
+
+    assert artifact.negotiate("gzip, deflate")[0] == "gzip"
+    assert artifact.negotiate("gzip;q=0, deflate")[0] == "identity"
+    assert artifact.negotiate("")[0] == "identity"
+    if "br" in artifact.bodies:
+        assert artifact.negotiate("gzip, br")[0] == "br"
+
+
+def test_artifact_etag_matching():
+    artifact = build_site_artifact(_HTML, "", version=1)
+
+    assert artifact.matches(artifact.etag)
+    assert artifact.matches(f'"other", W/{artifact.etag}')
+    assert artifact.matches("*")
+    assert not artifact.matches('"v1-stale"')
+    assert not artifact.matches("")
+
+    # Every coding is its own representation with its own strong ETag
+    gz = artifact.etag_for("gzip")
+    assert gz == artifact.etag[:-1] + '-gz"' and artifact.etag_for("identity") == artifact.etag
+    assert artifact.matches(gz, "gzip")
+    assert not artifact.matches(gz) and not artifact.matches(artifact.etag, "gzip")
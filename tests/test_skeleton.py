@@ -0,0 +1,41 @@
+from core.raw_template.assembler import assemble
+from core.raw_template.loader import list_raw_templates, read_template_html
+from core.raw_template.rewriter import _extract_texts, _restore_code, _restore_texts, _strip_code
+from core.raw_template.skeleton import get_skeleton
+
+
+def test_skeleton_render_matches_assemble():
+    image_map = {"header": "https://cdn.example/header.jpg", "about": "https://cdn.example/about.jpg"}
+    for tpl in list_raw_templates()[:10]:
+        skeleton = get_skeleton(tpl)
+        texts = {k: v.upper() for k, v in skeleton.texts.items()}
+
+        stripped, code_blocks = _strip_code(read_template_html(tpl["html_path"]))
+        templated, _ = _extract_texts(stripped)
+        html = _restore_code(_restore_texts(templated, texts), code_blocks)
+        expected = assemble(tpl, html, image_map, primary_color="#112233")
+
+        assert skeleton.render(texts, image_map, primary_color="#112233") == expected
+
+
+def test_missing_texts_keep_original_and_keyed_preview():
+    tpl = list_raw_templates()[0]
+    skeleton = get_skeleton(tpl)
+    key, original = next((k, skeleton.texts[k]) for k in skeleton.texts if k in skeleton.body_keys)
+
+    assert original in skeleton.render({})
+    assert f'<span data-ok-t="{key}">{original}</span>' in skeleton.render(skeleton.keyed_texts())
+
+
+def test_body_extra_and_byte_counts():
+    tpl = list_raw_templates()[0]
+    html = read_template_html(tpl["html_path"])
+
+    page = get_skeleton(tpl).build(body_extra="<footer>contact</footer>")
+    out = page.html()
+
+    assert out.endswith("<footer>contact</footer>\n</body>" + out.split("</body>", 1)[1])
+    assert out == assemble(tpl, html, {}, body_extra="<footer>contact</footer>")
+    counts = page.byte_counts()
+    assert counts["total"] == len(out.encode("utf-8"))
+    assert counts["extra"] == len("<footer>contact</footer>\n")
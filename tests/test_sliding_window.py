@@ -0,0 +1,34 @@
+import time
+
+from core.limits.sliding_window import SlidingWindowLimiter
+
+
+def test_limits_within_window_and_recovers():
+    limiter = SlidingWindowLimiter(max_keys=10)
+    assert [limiter.hit("k", limit=2, window_seconds=0.05) for _ in range(3)] == [False, False, True]
+    time.sleep(0.06)
+    assert limiter.hit("k", limit=2, window_seconds=0.05) is False
+
+
+def test_key_cap_evicts_least_recently_used():
+    limiter = SlidingWindowLimiter(max_keys=2)
+    limiter.record("a", 60)
+    limiter.record("b", 60)
+    limiter.record("a", 60)   # "a" is now most recent
+    limiter.record("c", 60)
+
+    assert len(limiter) == 2
+    assert limiter.count("b", 60) == 0
+    assert limiter.count("a", 60) == 2
+    assert limiter.stats()["evicted_lru"] == 1
+
+
+def test_idle_keys_are_swept():
+    limiter = SlidingWindowLimiter(max_keys=100, sweep_interval=0)
+    for ip in range(50):
+        limiter.hit(f"site:{ip}", limit=5, window_seconds=0.01)
+    time.sleep(0.02)
+    limiter.hit("site:new", limit=5, window_seconds=0.01)
+
+    assert len(limiter) == 1
+    assert limiter.stats()["evicted_idle"] == 50
@@ -0,0 +1,53 @@
+import re
+from pathlib import Path
+
+from core.publishing.artifact_store import ArtifactStore
+from core.publishing.renderer import render_final_page
+from core.publishing.static_export import export_site, remove_export
+from core.raw_template.loader import list_raw_templates
+from core.raw_template.skeleton import get_skeleton
+from user_app import db
+from user_app.services import publish_service
+
+_TEMPLATE_ROOT = Path(__file__).resolve().parent.parent / "template"
+
+
+def test_export_bundle_is_self_contained(tmp_path):
+    tpl = list_raw_templates()[0]
+    rendered = render_final_page(get_skeleton(tpl).render(primary_color="#123456"), "")
+
+    bundle = export_site(rendered, "page-1", 2, tmp_path, _TEMPLATE_ROOT, base_url="https://cdn.test/sites")
+    assert (tmp_path / "page-1" / "current").resolve() == bundle.resolve()
+
+    html = (bundle / "index.html").read_text()
+    assert "/raw-asset/" not in html
+    assert "<style" not in html.split("</head>")[0]
+
+    css_href = re.search(r'<link rel="stylesheet" href="https://cdn.test/sites/page-1/v2/(styles\.\w+\.css)"', html)
+    css = (bundle / css_href.group(1)).read_text()
+    assert "--primary-color: #123456" in css  # brand override kept, after the template CSS
+    assert "/raw-asset/" not in css
+
+    for url in re.findall(r"https://cdn.test/sites/page-1/v2/(assets/[^\"')\s]+)", html + css):
+        assert (bundle / url).is_file()
+
+    remove_export(tmp_path, "page-1")
+    assert not (tmp_path / "page-1").exists()
+
+
+def test_live_edit_of_a_published_page_refreshes_the_export(tmp_path, monkeypatch, fake_supabase):
+    fake_supabase.tables["pages"] = [{
+        "id": "p1", "user_id": "u1", "state": "published", "created_at": "2026-01-01T00:00:00+00:00",
+        "site_version": {"html": "<html><head></head><body><h1>Before</h1></body></html>",
+                         "css": "", "version": 3, "is_published": True},
+    }]
+    monkeypatch.setattr(db, "_ARTIFACT_STORE", ArtifactStore(tmp_path / "store"))
+    monkeypatch.setattr(publish_service, "static_export_root", lambda: tmp_path / "export")
+    db._invalidate("p1", "u1")
+
+    project = db.get_project("p1")
+    project.site_version.html = project.site_version.html.replace("Before", "After")
+    db.save_project(project, fields=("site_version",))
+
+    index = (tmp_path / "export" / "p1" / "current" / "index.html").read_text()
+    assert "After" in index and "Before" not in index
@@ -0,0 +1,58 @@
+import gzip
+import os
+
+from core.raw_template import template_blob
+from core.raw_template.loader import (
+    CARD_IMAGE_WIDTH,
+    _build_srcdoc,
+    get_template_srcdoc,
+    list_raw_templates,
+    read_template_html,
+)
+from core.raw_template.skeleton import _build, get_skeleton
+from core.raw_template.template_blob import (
+    TemplateBlob,
+    build_template_blob,
+    read_template_file,
+    source_fingerprint,
+)
+from user_app.routes import template_preview
+
+
+def test_blob_round_trip_and_lookups(tmp_path, monkeypatch):
+    templates = list_raw_templates()[:3]
+    blob = TemplateBlob(build_template_blob(templates, tmp_path / "blob.bin"))
+    assert blob.fingerprint == source_fingerprint(templates)
+
+    monkeypatch.setattr(template_blob, "_blob", blob)
+    monkeypatch.setattr(template_blob, "_checked", True)
+    for tpl in templates:
+        tpl_id = tpl["id"]
+        assert read_template_html(tpl["html_path"]) == open(tpl["html_path"], encoding="utf-8").read()
+        for path in (tpl["css_path"], tpl["js_path"]):
+            on_disk = open(path, encoding="utf-8").read() if os.path.exists(path) else ""
+            assert read_template_file(path) == on_disk
+        assert get_template_srcdoc(tpl_id) == _build_srcdoc(tpl_id)
+
+        preview = template_preview.serve(tpl_id)
+        assert isinstance(preview.body, memoryview)
+        assert bytes(preview.body) == template_preview._build_preview_html(tpl_id, tpl["html_path"]).encode()
+
+        card = template_preview._card_artifact.__wrapped__(tpl_id)
+        assert isinstance(card.bodies["gzip"], memoryview)  # served straight from the mapping
+        assert gzip.decompress(card.bodies["gzip"]).decode() == _build_srcdoc(tpl_id, CARD_IMAGE_WIDTH)
+
+        skeleton = get_skeleton(tpl)
+        assert skeleton.render(primary_color="#123456") == _build(
+            tpl_id, tpl["html_path"], tpl["css_path"], tpl["js_path"]
+        ).render(primary_color="#123456")
+
+
+def test_fingerprint_tracks_template_files(tmp_path):
+    tpl = list_raw_templates()[0]
+    css = tmp_path / "styles.css"
+    css.write_text("body {}")
+    copy = {**tpl, "css_path": str(css)}
+    before = source_fingerprint([copy])
+    os.utime(css, ns=(1, 1))
+    assert source_fingerprint([copy]) != before
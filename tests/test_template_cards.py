@@ -0,0 +1,41 @@
+import gzip
+
+from fasthtml.common import to_xml
+from starlette.requests import Request
+
+from core.raw_template.loader import get_template_srcdoc, list_raw_templates
+from user_app.frontend.pages.template_picker import _template_card
+from user_app.routes import template_preview
+
+
+def _request(path, headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": path, "headers": raw})
+
+
+def test_picker_cards_do_not_inline_templates():
+    templates = list_raw_templates()
+    html = "".join(to_xml(_template_card(t, True)) for t in templates)
+    assert "srcdoc" not in html
+    assert html.count('data-src="/tpl-card/') == len(templates)
+    # Roughly a kilobyte per card, however big the templates are
+    assert len(html) < 2500 * len(templates)
+
+
+def test_card_document_is_cached_compressed_and_resized():
+    tpl_id = list_raw_templates()[0]["id"]
+    resp = template_preview.serve_card(_request(f"/tpl-card/{tpl_id}", {"Accept-Encoding": "gzip"}), tpl_id)
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "max-age" in resp.headers["cache-control"]
+    html = gzip.decompress(resp.body).decode()
+    assert html == get_template_srcdoc(tpl_id, image_width=640)
+    assert "?w=640" in html
+
+    again = template_preview.serve_card(
+        _request(f"/tpl-card/{tpl_id}", {"Accept-Encoding": "gzip", "If-None-Match": resp.headers["etag"]}), tpl_id)
+    assert again.status_code == 304
+    # The gzip ETag doesn't validate the identity body
+    plain = template_preview.serve_card(_request(f"/tpl-card/{tpl_id}", {"If-None-Match": resp.headers["etag"]}), tpl_id)
+    assert plain.status_code == 200
+
+    assert template_preview.serve_card(_request("/tpl-card/nope/nope"), "nope/nope").status_code == 404
@@ -0,0 +1,54 @@
+import os
+
+import shutil
+from pathlib import Path
+
+from core.raw_template import loader
+from core.raw_template.slot_analyzer import analyze_slots, template_slots
+from core.raw_template.template_manifest import (
+    build_template_manifest,
+    read_template_manifest,
+    stale_templates,
+    write_template_manifest,
+)
+
+
+def _tree(tmp_path):
+    root = tmp_path / "template"
+    for tpl in loader.scan_templates()[:3]:
+        shutil.copytree(Path(tpl["html_path"]).parent, root / tpl["id"])
+    return root
+
+
+def test_manifest_round_trip_matches_scan(tmp_path):
+    root = _tree(tmp_path)
+    path = write_template_manifest(build_template_manifest(root), tmp_path / "manifest.json")
+    manifest = read_template_manifest(path)
+    assert stale_templates(manifest, root, full=True) == []
+
+    scanned = {t["id"]: t for t in loader.scan_templates()}
+    for entry in manifest["templates"]:
+        tpl = loader._from_manifest(entry)
+        assert {k: v for k, v in tpl.items() if k not in ("slots", "text_nodes")} == scanned[tpl["id"]]
+        assert template_slots(tpl) == analyze_slots(scanned[tpl["id"]]["html_path"])
+        assert tpl["text_nodes"] > 0
+
+
+def test_staleness(tmp_path):
+    root = _tree(tmp_path)
+    manifest = build_template_manifest(root)
+    first, second, third = (t["id"] for t in manifest["templates"])
+
+    # A new mtime with the same bytes (e.g. a fresh checkout) is not a change
+    css = root / first / "styles.css"
+    os.utime(css, ns=(1, 1))
+    assert stale_templates(manifest, root) == []
+
+    css.write_text(css.read_text() + "\n.x { color: red; }\n")
+    (root / second / "assets" / "new.png").write_bytes(b"png")
+    assert stale_templates(manifest, root) == [first]
+    assert stale_templates(manifest, root, full=True) == [first, second]
+
+    shutil.rmtree(root / third)
+    shutil.copytree(root / second, root / second.split("/")[0] / "added_one")
+    assert set(stale_templates(manifest, root)) == {first, third, f"{second.split('/')[0]}/added_one"}
@@ -0,0 +1,52 @@
+import shutil
+from pathlib import Path
+
+from PIL import Image
+
+from core.raw_template import thumbnails
+from core.raw_template import loader
+from core.raw_template.loader import list_raw_templates
+
+
+def _templates(tmp_path):
+    """Copies of two real templates, so a supplied thumbnail can be dropped into one."""
+    out = []
+    for tpl in list_raw_templates()[:2]:
+        src = Path(tpl["html_path"]).parent
+        dest = tmp_path / "template" / tpl["id"]
+        shutil.copytree(src, dest)
+        out.append({**tpl, "html_path": str(dest / "index.html"), "css_path": str(dest / "styles.css")})
+    return out
+
+
+def test_build_is_small_content_addressed_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, "TEMPLATE_THUMBNAILS_PATH", str(tmp_path / "thumbs"))
+    monkeypatch.setattr(thumbnails, "_load_manifest", thumbnails.lru_cache(maxsize=1)(thumbnails._load_manifest.__wrapped__))
+    templates = _templates(tmp_path)
+    Image.new("RGB", (1600, 1000), (10, 200, 30)).save(Path(templates[1]["html_path"]).parent / "thumbnail.png")
+
+    manifest = thumbnails.build_thumbnails(templates, use_browser=False)
+    first, second = (manifest[t["id"]] for t in templates)
+    assert first["source"] == "schematic" and second["source"] == "supplied"
+    assert first["bytes"] < 30_000
+
+    url = thumbnails.thumbnail_url(templates[0]["id"])
+    assert url == f"/tpl-thumb/{first['file']}"
+    # Only real screenshots let cards skip the on-view live preview
+    assert not thumbnails.thumbnail_is_screenshot(templates[0]["id"])
+    assert thumbnails.thumbnail_is_screenshot(templates[1]["id"])
+    # ...and only they replace the hero image as the card poster
+    assert loader._card_thumb(templates[0]["id"], "/raw-asset/hero.jpg") == "/raw-asset/hero.jpg"
+    assert loader._card_thumb(templates[0]["id"], None) == url
+    assert loader._card_thumb(templates[1]["id"], "/raw-asset/hero.jpg") == f"/tpl-thumb/{second['file']}"
+    path = thumbnails.thumbnail_path(first["file"])
+    with Image.open(path) as im:
+        assert im.format == "WEBP" and im.size == thumbnails.SIZE
+    assert thumbnails.thumbnail_path("../manifest.json") is None
+
+    mtime = path.stat().st_mtime_ns
+    assert thumbnails.build_thumbnails(templates, use_browser=False) == manifest
+    assert path.stat().st_mtime_ns == mtime  # unchanged inputs → not re-rendered
+
+    Path(templates[0]["css_path"]).write_text("body { --primary-color: #ff0000; }")
+    assert thumbnails.build_thumbnails(templates, use_browser=False)[templates[0]["id"]]["file"] != first["file"]
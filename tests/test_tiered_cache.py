@@ -0,0 +1,86 @@
+from user_app.cache import SharedTier, TieredCache
+
+
+def test_local_tier_hits_and_invalidates():
+    cache = TieredCache("project", ttl=30)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"id": "p1"}
+
+    assert cache.get_or_load("p1", loader) == {"id": "p1"}
+    assert cache.get_or_load("p1", loader) == {"id": "p1"}
+    cache.invalidate("p1")
+    cache.get_or_load("p1", loader)
+
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_shared_tier_serves_and_invalidates_across_workers(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    worker_a = TieredCache("project", 30, SharedTier(path))
+    worker_b = TieredCache("project", 30, SharedTier(path))
+
+    worker_a.get_or_load("p1", lambda: {"state": "draft"})
+    # B never hit Supabase: served from the shared tier
+    assert worker_b.get_or_load("p1", lambda: 1 / 0) == {"state": "draft"}
+    assert worker_b.stats()["shared_hits"] == 1
+
+    # A write in B drops A's local copy on A's next read
+    worker_b.invalidate("p1")
+    assert worker_a.get_or_load("p1", lambda: {"state": "preview"}) == {"state": "preview"}
+
+    worker_a.clear()
+    assert worker_b.get("p1") is None
+
+
+def test_load_raced_by_invalidation_is_not_cached(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    worker_a = TieredCache("project", 30, SharedTier(path))
+    worker_b = TieredCache("project", 30, SharedTier(path))
+
+    def slow_stale_read():
+        worker_b.invalidate("p1")   # a concurrent write lands mid-read
+        return {"state": "stale"}
+
+    assert worker_a.get_or_load("p1", slow_stale_read) == {"state": "stale"}
+    assert worker_a.get("p1") is None
+    assert worker_b.get("p1") is None
+
+
+def test_lru_evicts_by_size_and_sweeps_expired():
+    cache = TieredCache("project", ttl=30, max_bytes=3000)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 900)
+    cache.get("a")              # "a" is now most recently used
+    cache.put("d", "x" * 900)
+
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1
+    assert stats["bytes"] <= 3000
+    assert cache.get("b") is None and cache.get("a") is not None
+
+    cache.ttl = 0
+    cache.put("e", "short-lived")
+    assert cache.sweep() == 1
+    assert cache.get("e") is None
+
+
+def test_grow_reaccounts_a_value_that_loaded_more_data():
+    cache = TieredCache("project", ttl=30, max_bytes=3000)
+    a, b = {"id": "a"}, {"id": "b"}
+    cache.put("a", a)
+    cache.put("b", b)
+    before = cache.stats()["bytes"]
+
+    cache.grow("a", {"id": "a"}, 5000)  # not the cached object: ignored
+    assert cache.stats()["bytes"] == before
+
+    cache.grow("b", b, 2700)
+    assert cache.stats()["bytes"] <= 3000
+    assert cache.get("a") is None and cache.get("b") is b
+
+    cache.grow("b", b, 5000)  # now larger than the whole cache
+    assert cache.get("b") is None and cache.stats()["bytes"] == 0
@@ -0,0 +1,18 @@
+from user_app import db
+
+
+def test_get_user_is_cached_until_a_credit_write(fake_supabase):
+    fake_supabase.tables["users"] = [{"id": "u1", "email": "a@b.c", "paid_credits": 2, "free_credits": 0}]
+    db._USER_CACHE.clear()
+
+    user = db.get_user("u1")
+    for _ in range(5):
+        assert db.get_user("u1") is user
+    assert len(fake_supabase.selects) == 1
+
+    assert db.deduct_credit(user) == "paid"
+    assert db.get_user("u1").paid_credits == 1
+
+    db.add_paid_credits("u1", 10)
+    assert db.get_user("u1").paid_credits == 11
+    assert len(fake_supabase.selects) == 4  # one reload after each write, plus add_paid_credits' own read
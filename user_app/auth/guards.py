@@ -3,6 +3,8 @@ FastHTML Beforeware: session-aware auth guard.
 Redirects to /login if no session; otherwise injects user into request scope.
 """
 
+from dataclasses import replace
+
 from fasthtml.common import RedirectResponse
 
 from user_app.auth.login import get_current_user
@@ -19,9 +21,9 @@ async def auth_beforeware(req, sess):
         sess.clear()
         return login_redir
     
-    # Inject avatar from session (transient)
+    # Inject avatar from session (transient) — on a copy, the User is shared via db's cache
     avatar_url = sess.get("avatar_url")
-    if avatar_url:
-        user.avatar_url = avatar_url
+    if avatar_url and avatar_url != user.avatar_url:
+        user = replace(user, avatar_url=avatar_url)
         
     req.scope["user"] = user
@@ -0,0 +1,392 @@
+"""
+Two-tier read cache for db.py.
+
+Tier 1 is a per-process TTL dict, as before. Tier 2 (optional, enabled by
+CACHE_SHARED_PATH) is a SQLite WAL file shared by every worker on the host.
+It holds a pickled copy of each value plus a version counter per key, and
+a namespace-wide generation for clear():
+
+- A write in any worker bumps the version. Every other worker sees the
+  bump on its next read and drops its local copy, so reads are no longer
+  stale across workers for up to the TTL.
+- A value loaded by one worker is served to the others from the shared
+  file, so a write costs one Supabase read in total instead of one per worker.
+
+get_or_load() snapshots the version before calling the loader and only
+publishes the result if nothing was invalidated in between, so a slow
+read can't re-cache data that a concurrent write already replaced.
+"""
+
+import logging
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from config.settings import CACHE_SHARED_PATH
+
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent
+
+# Stamp of a key: (namespace generation, key version)
+Stamp = tuple[int, int]
+_ALL = "*"
+
+
+class SharedTier:
+    """Cross-process value + version store in one SQLite WAL file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=5, isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " ns TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " version INTEGER NOT NULL DEFAULT 0,"
+            " value BLOB,"
+            " expires_at REAL,"
+            " PRIMARY KEY (ns, key))"
+        )
+
+    def stamp(self, ns: str, key: str) -> Stamp:
+        with self._lock:
+            return self._stamp(ns, key)
+
+    def get(self, ns: str, key: str) -> tuple[Stamp, bytes | None]:
+        """Current stamp of key and its live pickled value, if any."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, version, value, expires_at FROM cache_entries"
+                " WHERE ns = ? AND key IN (?, ?)",
+                (ns, key, _ALL),
+            ).fetchall()
+        gen = ver = 0
+        value = None
+        for row_key, version, blob, expires_at in rows:
+            if row_key == _ALL:
+                gen = version
+            else:
+                ver = version
+                if blob is not None and expires_at and expires_at > time.time():
+                    value = blob
+        return (gen, ver), value
+
+    def put(self, ns: str, key: str, blob: bytes, ttl: float, stamp: Stamp) -> bool:
+        """Store blob only if key's stamp still equals `stamp`. Returns whether it was stored."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._stamp(ns, key)
+                if current != stamp:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO cache_entries (ns, key, version, value, expires_at)"
+                    " VALUES (?, ?, 0, ?, ?)"
+                    " ON CONFLICT(ns, key) DO UPDATE SET"
+                    "  value = excluded.value, expires_at = excluded.expires_at",
+                    (ns, key, blob, time.time() + ttl),
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, ns: str, key: str = _ALL) -> None:
+        """Bump key's version (or the namespace generation) and drop the stored value."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO cache_entries (ns, key, version) VALUES (?, ?, 1)"
+                    " ON CONFLICT(ns, key) DO UPDATE SET"
+                    "  version = version + 1, value = NULL, expires_at = NULL",
+                    (ns, key),
+                )
+                if key == _ALL:
+                    self._conn.execute(
+                        "UPDATE cache_entries SET value = NULL, expires_at = NULL WHERE ns = ?", (ns,)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _stamp(self, ns: str, key: str) -> Stamp:
+        rows = self._conn.execute(
+            "SELECT key, version FROM cache_entries WHERE ns = ? AND key IN (?, ?)",
+            (ns, key, _ALL),
+        ).fetchall()
+        versions = dict(rows)
+        return versions.get(_ALL, 0), versions.get(key, 0)
+
+
+class TieredCache:
+    """
+    Per-process TTL + LRU cache for one namespace, optionally backed by a SharedTier.
+
+    The local tier is bounded by max_bytes (approximate, see approx_size):
+    least recently used entries are evicted past it, and sweep() drops
+    expired ones without waiting for them to be read again.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        shared: SharedTier | None = None,
+        max_bytes: int = 32 * 1024 * 1024,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.shared = shared
+        self.max_bytes = max_bytes
+        # {key: (expires_at_monotonic, stamp, value, approx_bytes)}, least recently used first
+        self._local: OrderedDict[str, tuple[float, Stamp, object, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key: str):
+        return self._lookup(key)[1]
+
+    def lookup(self, key: str) -> tuple[Stamp | None, object]:
+        """(stamp, value) — for callers that extend a cached value and put() it back with that stamp."""
+        return self._lookup(key)
+
+    def get_or_load(self, key: str, loader: Callable[[], object]):
+        """Cached value for key, or loader() — cached unless it returns None."""
+        stamp, value = self._lookup(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.put(key, value, stamp)
+        return value
+
+    def put(self, key: str, value, stamp: Stamp | None = None) -> None:
+        """
+        Cache value. With a shared tier, pass the stamp observed before the
+        value was read (see get_or_load); without one the current stamp is used.
+        """
+        size = None
+        if self.shared is not None:
+            try:
+                if stamp is None:
+                    stamp = self.shared.stamp(self.namespace, key)
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                size = len(blob)
+                if not self.shared.put(self.namespace, key, blob, self.ttl, stamp):
+                    return  # invalidated while we were loading — don't cache stale data
+            except Exception as exc:
+                log.warning("[cache] shared put failed for %s:%s: %s", self.namespace, key, exc)
+        self._store(key, stamp or (0, 0), value, size)
+
+    def grow(self, key: str, value, nbytes: int) -> None:
+        """
+        Charge nbytes more to key's local entry, evicting as put() would — for
+        cached objects that load more data into themselves afterwards (see
+        Project's lazy fields). No-op unless value is the object cached under key.
+        """
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[2] is not value:
+                return
+            self._drop(key)
+            size = entry[3] + nbytes
+            if size > self.max_bytes:
+                return
+            self._local[key] = (entry[0], entry[1], value, size)
+            self._bytes += size
+            self._evict()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+        self._invalidate_shared(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._bytes = 0
+        self._invalidate_shared(_ALL)
+
+    def sweep(self) -> int:
+        """Drop expired local entries. Returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, entry in self._local.items() if entry[0] <= now]
+            for key in expired:
+                self._drop(key)
+            self.expired += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._local),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "occupancy": round(self._bytes / self.max_bytes, 3) if self.max_bytes else None,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "shared": self.shared is not None,
+            }
+
+    def _lookup(self, key: str) -> tuple[Stamp | None, object]:
+        now = time.monotonic()
+        entry = self._fresh(key, now)
+
+        if self.shared is None:
+            if entry:
+                self.hits += 1
+                return None, entry[2]
+            self.misses += 1
+            return None, None
+
+        try:
+            # Cheap version check first; the (possibly large) value only on a local miss
+            if entry and entry[1] == self.shared.stamp(self.namespace, key):
+                self.hits += 1
+                return entry[1], entry[2]
+            stamp, blob = self.shared.get(self.namespace, key)
+        except Exception as exc:
+            log.warning("[cache] shared get failed for %s:%s: %s", self.namespace, key, exc)
+            with self._lock:
+                self._drop(key)
+            self.misses += 1
+            return None, None
+
+        if blob is not None:
+            try:
+                value = pickle.loads(blob)
+            except Exception as exc:
+                log.warning("[cache] unreadable shared entry %s:%s: %s", self.namespace, key, exc)
+            else:
+                self._store(key, stamp, value, len(blob))
+                self.shared_hits += 1
+                return stamp, value
+
+        with self._lock:
+            self._drop(key)
+        self.misses += 1
+        return stamp, None
+
+    # ── local tier ─────────────────────────────────────────────────────────
+
+    def _fresh(self, key: str, now: float):
+        """Live local entry (marked most recently used), or None."""
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                self.expired += 1
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, stamp: Stamp, value, size: int | None) -> None:
+        size = size if size is not None else approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._local[key] = (time.monotonic() + self.ttl, stamp, value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes. Caller holds the lock."""
+        while self._bytes > self.max_bytes:
+            _, (_, _, _, evicted) = self._local.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        """Remove key from the local tier. Caller holds the lock."""
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def _invalidate_shared(self, key: str) -> None:
+        if self.shared is None:
+            return
+        try:
+            self.shared.invalidate(self.namespace, key)
+        except Exception as exc:
+            log.warning("[cache] shared invalidate failed for %s:%s: %s", self.namespace, key, exc)
+
+
+def approx_size(obj, _depth: int = 0) -> int:
+    """Rough in-memory footprint of a cached value: strings dominate, containers add overhead."""
+    if isinstance(obj, (str, bytes)):
+        return 49 + len(obj)
+    if _depth > 6 or obj is None or isinstance(obj, (int, float, bool)):
+        return 32
+    if isinstance(obj, dict):
+        return 64 + sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return 56 + sum(approx_size(v, _depth + 1) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return 64 + approx_size(vars(obj), _depth + 1)
+    return sys.getsizeof(obj)
+
+
+def start_sweeper(caches: list["TieredCache"], interval: float) -> threading.Thread:
+    """Daemon thread that sweeps expired entries out of `caches` every `interval` seconds."""
+    def _run() -> None:
+        while True:
+            time.sleep(interval)
+            for cache in caches:
+                try:
+                    cache.sweep()
+                except Exception as exc:
+                    log.warning("[cache] sweep of %s failed: %s", cache.namespace, exc)
+
+    thread = threading.Thread(target=_run, name="cache-sweeper", daemon=True)
+    thread.start()
+    return thread
+
+
+_shared: SharedTier | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_tier() -> SharedTier | None:
+    """Process-wide shared tier, or None when CACHE_SHARED_PATH is unset/"off"."""
+    global _shared
+    if CACHE_SHARED_PATH.lower() in ("", "off", "none"):
+        return None
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                path = Path(CACHE_SHARED_PATH)
+                if not path.is_absolute():
+                    path = _ROOT / path
+                _shared = SharedTier(path)
+    return _shared
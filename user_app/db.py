@@ -4,54 +4,89 @@ Handles all Supabase client init, JSONB serialization, and CRUD operations.
 """
 
 import hashlib
+import logging
 import time
 from dataclasses import asdict
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
 
 from supabase import create_client, Client
 
-from config.settings import SUPABASE_URL, SUPABASE_SERVICE_KEY
+from config.settings import (
+    SUPABASE_URL,
+    SUPABASE_SERVICE_KEY,
+    PROJECT_CACHE_MAX_MB,
+    CACHE_SWEEP_SECONDS,
+    PUBLISHED_STORE_PATH,
+    PUBLISHED_REVALIDATE_SECONDS,
+)
 from core.models.user import User
-from core.models.project import Project
+from core.models.project import Project, NOT_LOADED
 from core.models.brand_memory import BrandMemory, LabeledAsset, ProjectIntent
 from core.models.ai_usage import AIUsage
 from core.models.site_version import SiteVersion
 from core.ai.schemas import SitePlan, SectionPlan, CopyBlock
 from core.state_machine.states import ProjectState
+from core.publishing.artifacts import SiteArtifact, build_site_artifact
+from core.publishing.artifact_store import ArtifactStore
+from user_app.cache import TieredCache, approx_size, get_shared_tier, start_sweeper
 
+log = logging.getLogger(__name__)
 
-# --- In-process project cache ---
-# Single-process TTL cache: avoids a Supabase round-trip on every page view.
-# Invalidated on every write so reads are never stale past the TTL.
+_ROOT = Path(__file__).parent.parent
 
-_PROJECT_CACHE:      dict[str, tuple[float, "Project"]]       = {}
-_PROJECT_ROW_CACHE:  dict[str, tuple[float, dict]]            = {}
-_USER_LIST_CACHE:    dict[str, tuple[float, list["Project"]]] = {}
+# --- Project cache ---
+# Per-process TTL + size-bounded LRU cache (plus the optional cross-worker tier,
+# see user_app/cache.py): avoids a Supabase round-trip on every page view.
+# Invalidated on every write so reads are never stale past the TTL.
 
 _PROJECT_TTL  = 30   # seconds — single project reads
-_ROW_TTL      = 30   # seconds — raw row (trial_ends_at etc.)
+_ROW_TTL      = 30   # seconds — scalar page columns (trial_ends_at etc.)
 _LIST_TTL     = 10   # seconds — dashboard project list
+_USER_TTL     = 15   # seconds — User read by auth_beforeware on every request
+_ARTIFACT_TTL = 3600  # seconds — encoded published pages; immutable per version
 
+_PROJECT_MAX_BYTES = PROJECT_CACHE_MAX_MB * 1024 * 1024
 
-def _cache_get(store: dict, key: str):
-    entry = store.get(key)
-    if entry and entry[0] > time.monotonic():
-        return entry[1]
-    store.pop(key, None)
-    return None
+_PROJECT_CACHE     = TieredCache("project",       _PROJECT_TTL, get_shared_tier(), _PROJECT_MAX_BYTES)
+_PROJECT_ROW_CACHE = TieredCache("project_row",   _ROW_TTL,     get_shared_tier(), _PROJECT_MAX_BYTES // 4)
+_USER_LIST_CACHE   = TieredCache("user_projects", _LIST_TTL,    get_shared_tier(), _PROJECT_MAX_BYTES // 4)
+_DASHBOARD_CACHE   = TieredCache("dashboard",     _LIST_TTL,    get_shared_tier(), _PROJECT_MAX_BYTES // 4)
+_USER_CACHE        = TieredCache("user",          _USER_TTL,    get_shared_tier(), _PROJECT_MAX_BYTES // 16)
+# Published pages: (store stamp, SiteArtifact) — the disk store is the cross-worker tier
+_ARTIFACT_CACHE    = TieredCache("site_artifact", _ARTIFACT_TTL, None,              _PROJECT_MAX_BYTES // 2)
+_ARTIFACT_STORE    = ArtifactStore(_ROOT / PUBLISHED_STORE_PATH)  # absolute paths win in the join
 
+_CACHES = (_PROJECT_CACHE, _PROJECT_ROW_CACHE, _USER_LIST_CACHE, _DASHBOARD_CACHE, _USER_CACHE, _ARTIFACT_CACHE)
 
-def _cache_put(store: dict, key: str, value, ttl: int) -> None:
-    store[key] = (time.monotonic() + ttl, value)
+# get_project_row() callers only read these — the JSONB blobs are never held twice
+_ROW_COLS = "id,user_id,state,template_id,trial_ends_at,is_paused,created_at,updated_at,published_at"
+# get_project() reads everything but site_version (the page HTML), which loads on first access
+_PROJECT_COLS = _ROW_COLS + ",brand_memory,ai_usage,site_plan"
 
 
 def _invalidate(project_id: str, user_id: str | None = None) -> None:
-    _PROJECT_CACHE.pop(project_id, None)
-    _PROJECT_ROW_CACHE.pop(project_id, None)
+    _PROJECT_CACHE.invalidate(project_id)
+    _PROJECT_ROW_CACHE.invalidate(project_id)
+    _ARTIFACT_CACHE.invalidate(project_id)
+    _ARTIFACT_STORE.drop(project_id)
     if user_id:
-        _USER_LIST_CACHE.pop(user_id, None)
+        _USER_LIST_CACHE.invalidate(user_id)
+        _DASHBOARD_CACHE.invalidate(user_id)
     else:
         _USER_LIST_CACHE.clear()
+        _DASHBOARD_CACHE.clear()
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and occupancy for the db caches."""
+    return {c.namespace: c.stats() for c in _CACHES}
+
+
+def start_cache_sweeper() -> None:
+    """Background removal of expired cache entries (call once at startup)."""
+    start_sweeper(list(_CACHES), CACHE_SWEEP_SECONDS)
 
 
 # --- Client ---
@@ -183,10 +218,21 @@ def _parse_timestamp(val) -> datetime | None:
 # --- User CRUD ---
 
 def get_user(user_id: str) -> User | None:
+    """
+    Cached — every authenticated request reads the User. Writes below
+    invalidate it; the returned object is shared, so callers must not mutate it.
+    """
+    return _USER_CACHE.get_or_load(user_id, lambda: _load_user(user_id))
+
+
+def _load_user(user_id: str) -> User | None:
     result = get_client().table("users").select("*").eq("id", user_id).execute()
     if not result.data:
         return None
-    row = result.data[0]
+    return _row_to_user(result.data[0])
+
+
+def _row_to_user(row: dict) -> User:
     return User(
         id=row["id"],
         email=row["email"],
@@ -220,6 +266,7 @@ def upsert_user(user_id: str, email: str, full_name: str | None = None, avatar_u
         if full_name:
             user_data["full_name"] = full_name
         get_client().table("users").insert(user_data).execute()
+    _USER_CACHE.invalidate(user_id)
     return get_user(user_id)
 
 
@@ -227,17 +274,7 @@ def get_user_by_email(email: str) -> User | None:
     result = get_client().table("users").select("*").eq("email", email).execute()
     if not result.data:
         return None
-    row = result.data[0]
-    return User(
-        id=row["id"],
-        email=row["email"],
-        paid_credits=row.get("paid_credits", 0),
-        free_credits=row.get("free_credits", 1),
-        free_credits_expires_at=_parse_timestamp(row.get("free_credits_expires_at")),
-        full_name=row.get("full_name"),
-        avatar_url=row.get("avatar_url"),
-        lemon_squeezy_customer_id=row.get("lemon_squeezy_customer_id"),
-    )
+    return _row_to_user(result.data[0])
 
 
 def add_paid_credits(user_id: str, amount: int, customer_id: str | None = None) -> None:
@@ -250,6 +287,7 @@ def add_paid_credits(user_id: str, amount: int, customer_id: str | None = None)
     if customer_id:
         update["lemon_squeezy_customer_id"] = customer_id
     get_client().table("users").update(update).eq("id", user_id).execute()
+    _USER_CACHE.invalidate(user_id)
 
 
 def deduct_credit(user: User) -> str:
@@ -259,15 +297,12 @@ def deduct_credit(user: User) -> str:
     The caller uses this to decide whether to set trial_ends_at on the page.
     """
     if user.paid_credits > 0:
-        get_client().table("users").update(
-            {"paid_credits": user.paid_credits - 1}
-        ).eq("id", user.id).execute()
-        return "paid"
-
-    get_client().table("users").update(
-        {"free_credits": user.free_credits - 1}
-    ).eq("id", user.id).execute()
-    return "free"
+        bucket, update = "paid", {"paid_credits": user.paid_credits - 1}
+    else:
+        bucket, update = "free", {"free_credits": user.free_credits - 1}
+    get_client().table("users").update(update).eq("id", user.id).execute()
+    _USER_CACHE.invalidate(user.id)
+    return bucket
 
 
 # --- Page CRUD ---
@@ -280,7 +315,9 @@ def _row_to_project(row: dict) -> Project:
         brand_memory=_deserialize_brand_memory(row.get("brand_memory")),
         ai_usage=_deserialize_ai_usage(row.get("ai_usage")),
         site_plan=_deserialize_site_plan(row.get("site_plan")),
-        site_version=_deserialize_site_version(row.get("site_version")),
+        site_version=(
+            _deserialize_site_version(row["site_version"]) if "site_version" in row else NOT_LOADED
+        ),
         template_id=row.get("template_id"),
         created_at=_parse_timestamp(row.get("created_at")),
         updated_at=_parse_timestamp(row.get("updated_at")) or _parse_timestamp(row["created_at"]),
@@ -291,16 +328,32 @@ def _row_to_project(row: dict) -> Project:
 def get_project(project_id: str) -> Project | None:
     if not project_id:
         return None
-    cached = _cache_get(_PROJECT_CACHE, project_id)
-    if cached is not None:
-        return cached
-    result = get_client().table("pages").select("*").eq("id", project_id).execute()
+    return _PROJECT_CACHE.get_or_load(project_id, lambda: _load_project(project_id))
+
+
+def _load_project(project_id: str) -> Project | None:
+    result = get_client().table("pages").select(_PROJECT_COLS).eq("id", project_id).execute()
     if not result.data:
         return None
-    project = _row_to_project(result.data[0])
-    _cache_put(_PROJECT_CACHE, project_id, project, _PROJECT_TTL)
-    _cache_put(_PROJECT_ROW_CACHE, project_id, result.data[0], _ROW_TTL)
-    return project
+    row = result.data[0]
+    _PROJECT_ROW_CACHE.put(project_id, {col: row.get(col) for col in _ROW_COLS.split(",")})
+    return _row_to_project(row)
+
+
+def _load_lazy_field(project: Project, name: str):
+    """Project.lazy_loader: fetch one column left out of the initial SELECT."""
+    result = get_client().table("pages").select(name).eq("id", project.id).execute()
+    if not result.data:
+        return None
+    value = result.data[0].get(name)
+    if name == "site_version":
+        value = _deserialize_site_version(value)
+    # _Lazy keeps the value on the project, which may be the cached copy
+    _PROJECT_CACHE.grow(project.id, project, approx_size(value))
+    return value
+
+
+Project.lazy_loader = _load_lazy_field
 
 
 _DASHBOARD_COLS = "id,user_id,state,brand_memory,template_id,created_at,updated_at,published_at"
@@ -308,20 +361,74 @@ _DASHBOARD_COLS = "id,user_id,state,brand_memory,template_id,created_at,updated_
 
 def get_projects_for_user(user_id: str) -> list[Project]:
     """Lightweight list for dashboard — excludes site_version, site_plan, ai_usage blobs."""
-    cached = _cache_get(_USER_LIST_CACHE, user_id)
-    if cached is not None:
-        return cached
-    result = (
-        get_client()
-        .table("pages")
-        .select(_DASHBOARD_COLS)
-        .eq("user_id", user_id)
-        .order("created_at")
-        .execute()
-    )
-    projects = [_row_to_project(row) for row in result.data]
-    _cache_put(_USER_LIST_CACHE, user_id, projects, _LIST_TTL)
-    return projects
+    def _load() -> list[Project]:
+        result = (
+            get_client()
+            .table("pages")
+            .select(_DASHBOARD_COLS)
+            .eq("user_id", user_id)
+            .order("created_at")
+            .execute()
+        )
+        return [_row_to_project(row) for row in result.data]
+
+    return _USER_LIST_CACHE.get_or_load(user_id, _load)
+
+
+# Dashboard tabs → state filter applied to the pages query
+DASHBOARD_TABS = ("all", "live", "unfinished")
+
+
+def get_dashboard_page(
+    user_id: str, tab: str, page: int, per_page: int,
+) -> tuple[list[Project], dict[str, int], int]:
+    """
+    One page of the dashboard: (projects on it, per-tab counts, page clamped
+    to the last one). Counts are head-only count queries and the page is a
+    range query, so the cost stays flat however many pages a user owns.
+
+    Everything fetched is cached per user as {"counts": ..., (tab, page, per_page): [...]}
+    and dropped on any write to that user's pages.
+    """
+    stamp, cached = _DASHBOARD_CACHE.lookup(user_id)
+    entry = dict(cached) if cached else {}
+
+    counts = entry.get("counts")
+    if counts is None:
+        counts = entry["counts"] = _count_projects_by_tab(user_id)
+    total_pages = max(1, -(-counts[tab] // per_page))
+    page = max(1, min(page, total_pages))
+
+    key = (tab, page, per_page)
+    projects = entry.get(key)
+    if projects is None:
+        projects = entry[key] = _load_projects_page(user_id, tab, (page - 1) * per_page, per_page)
+
+    if len(entry) != len(cached or ()):
+        _DASHBOARD_CACHE.put(user_id, entry, stamp)
+    return projects, counts, page
+
+
+def _count_projects_by_tab(user_id: str) -> dict[str, int]:
+    def _count(state: str | None = None) -> int:
+        query = get_client().table("pages").select("id", count="exact", head=True).eq("user_id", user_id)
+        if state:
+            query = query.eq("state", state)
+        return query.execute().count or 0
+
+    total = _count()
+    live = _count(ProjectState.PUBLISHED.value)
+    return {"all": total, "live": live, "unfinished": total - live}
+
+
+def _load_projects_page(user_id: str, tab: str, offset: int, limit: int) -> list[Project]:
+    query = get_client().table("pages").select(_DASHBOARD_COLS).eq("user_id", user_id)
+    if tab == "live":
+        query = query.eq("state", ProjectState.PUBLISHED.value)
+    elif tab == "unfinished":
+        query = query.neq("state", ProjectState.PUBLISHED.value)
+    result = query.order("created_at").range(offset, offset + limit - 1).execute()
+    return [_row_to_project(row) for row in result.data]
 
 
 def count_projects_for_user(user_id: str) -> int:
@@ -341,18 +448,46 @@ def create_project(user_id: str) -> Project:
     return project
 
 
-def save_project(project: Project) -> None:
-    data = {
-        "state": project.state.value,
-        "brand_memory": _serialize_brand_memory(project.brand_memory),
-        "ai_usage": _serialize_ai_usage(project.ai_usage),
-        "site_plan": _serialize_site_plan(project.site_plan),
-        "site_version": _serialize_site_version(project.site_version),
-        "template_id": project.template_id,
-        "published_at": project.published_at.isoformat() if project.published_at else None,
-    }
+# Project field → (column, serializer) for save_project
+_SAVE_COLUMNS = {
+    "state":        lambda p: p.state.value,
+    "brand_memory": lambda p: _serialize_brand_memory(p.brand_memory),
+    "ai_usage":     lambda p: _serialize_ai_usage(p.ai_usage),
+    "site_plan":    lambda p: _serialize_site_plan(p.site_plan),
+    "site_version": lambda p: _serialize_site_version(p.site_version),
+    "template_id":  lambda p: p.template_id,
+    "published_at": lambda p: p.published_at.isoformat() if p.published_at else None,
+}
+
+
+# page_id -> None, after a published page's site_version is saved; installed by publish_service
+on_published_site_saved: Callable[[str], object] | None = None
+
+
+def save_project(project: Project, fields: Iterable[str] | None = None) -> None:
+    """
+    Write the project back. Pass `fields` (Project attribute names) to send
+    only the columns that changed — most writes are a state transition and
+    shouldn't re-upload the site_version HTML.
+    """
+    names = _SAVE_COLUMNS.keys() if fields is None else fields
+    data = {}
+    for name in names:
+        if name not in _SAVE_COLUMNS:
+            raise ValueError(f"save_project: unknown field {name!r}")
+        # Never read, so never changed — don't null it out or re-upload it
+        if name == "site_version" and not project.is_loaded("site_version"):
+            continue
+        data[name] = _SAVE_COLUMNS[name](project)
+    if not data:
+        return
     get_client().table("pages").update(data).eq("id", project.id).execute()
     _invalidate(project.id, project.user_id)
+    if "site_version" in data and project.state == ProjectState.PUBLISHED and on_published_site_saved:
+        try:
+            on_published_site_saved(project.id)
+        except Exception as exc:
+            log.warning("[db] on_published_site_saved failed for %s: %s", project.id, exc)
 
 
 def update_project_trial(project_id: str, trial_ends_at: datetime, is_paused: bool = False) -> None:
@@ -363,17 +498,14 @@ def update_project_trial(project_id: str, trial_ends_at: datetime, is_paused: bo
 
 
 def get_project_row(project_id: str) -> dict | None:
-    """Get raw project row (includes trial_ends_at, is_paused). Uses cache when warm."""
+    """Get the page's scalar columns (state, user_id, trial_ends_at, is_paused…). Uses cache when warm."""
     if not project_id:
         return None
-    cached = _cache_get(_PROJECT_ROW_CACHE, project_id)
-    if cached is not None:
-        return cached
-    result = get_client().table("pages").select("*").eq("id", project_id).execute()
-    if not result.data:
-        return None
-    _cache_put(_PROJECT_ROW_CACHE, project_id, result.data[0], _ROW_TTL)
-    return result.data[0]
+    def _load() -> dict | None:
+        result = get_client().table("pages").select(_ROW_COLS).eq("id", project_id).execute()
+        return result.data[0] if result.data else None
+
+    return _PROJECT_ROW_CACHE.get_or_load(project_id, _load)
 
 
 def delete_project(project_id: str) -> None:
@@ -390,6 +522,66 @@ def set_project_paused(project_id: str, paused: bool) -> None:
 
 # --- Published Pages ---
 
+def get_site_artifact(project_id: str) -> SiteArtifact | None:
+    """
+    Encoded page for a published project, or None if it isn't published.
+
+    Hot path: one stat() of the on-disk store plus a memory lookup — no
+    Supabase call. Only the first request after a publish or write builds
+    the artifact from the site_version column, and records the row's
+    updated_at with it. Every PUBLISHED_REVALIDATE_SECONDS the row is read
+    again: a site unpublished, or saved since the copy was built (on another
+    host, or while another worker was building it), is dropped or rebuilt.
+    """
+    if not project_id:
+        return None
+
+    stamp = _ARTIFACT_STORE.stamp(project_id)
+    if stamp is not None and time.time() - stamp[1] / 1e9 > PUBLISHED_REVALIDATE_SECONDS:
+        # Straight from Supabase: the row cache only sees writes made on this host
+        result = get_client().table("pages").select("state,updated_at").eq("id", project_id).execute()
+        row = result.data[0] if result.data else None
+        if row is not None and row["state"] == ProjectState.PUBLISHED.value \
+                and row.get("updated_at") == _ARTIFACT_STORE.source(project_id):
+            _ARTIFACT_STORE.touch(project_id)
+            stamp = _ARTIFACT_STORE.stamp(project_id)
+        else:
+            _ARTIFACT_CACHE.invalidate(project_id)
+            _ARTIFACT_STORE.drop(project_id)
+            if row is None or row["state"] != ProjectState.PUBLISHED.value:
+                return None
+            stamp = None
+
+    cached = _ARTIFACT_CACHE.get(project_id)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    if stamp is not None:
+        loaded = _ARTIFACT_STORE.get(project_id)
+        if loaded is not None:
+            _ARTIFACT_CACHE.put(project_id, loaded)
+            return loaded[1]
+
+    # Not on this host yet: build from the site_version column alone
+    result = get_client().table("pages").select("state,updated_at,site_version").eq("id", project_id).execute()
+    row = result.data[0] if result.data else None
+    if row is None or row["state"] != ProjectState.PUBLISHED.value:
+        return None
+    sv = _deserialize_site_version(row.get("site_version"))
+    if sv is None or not sv.html:
+        return None
+    artifact = build_site_artifact(sv.html, sv.css or "", sv.version)
+
+    try:
+        _ARTIFACT_STORE.put(project_id, artifact, source=row.get("updated_at"))
+        loaded = _ARTIFACT_STORE.get(project_id)
+    except OSError as exc:
+        log.warning("[db] published store unavailable for %s: %s", project_id, exc)
+        loaded = None
+    # Without the disk copy, keep it in memory until the next local write
+    _ARTIFACT_CACHE.put(project_id, loaded or (None, artifact))
+    return loaded[1] if loaded else artifact
+
+
 def save_published_site(
     project_id: str,
     version: int,
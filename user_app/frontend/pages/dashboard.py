@@ -17,6 +17,9 @@ _FRIENDLY_STATE = {
 }
 
 
+ITEMS_PER_PAGE = 6
+
+
 def _initials(name: str) -> str:
     words = [w for w in name.split() if w]
     if not words:
@@ -31,27 +34,19 @@ def _accent(brand) -> str:
     return "7c3aed"
 
 
-def dashboard_page(user, projects, show_new_button=True, active_tab="unfinished", page=1):
-    """Show welcome CTA if no projects, otherwise redesigned project cards."""
+def dashboard_page(user, projects, counts, show_new_button=True, active_tab="unfinished", page=1):
+    """
+    Show welcome CTA if no projects, otherwise redesigned project cards.
 
-    total_projects = len(projects)
-    published_projects_list = [p for p in projects if p.state.value == "published"]
-    published_count = len(published_projects_list)
-    unfinished_count = total_projects - published_count
+    projects is the already-paginated slice for active_tab/page and counts
+    the per-tab totals (see db.get_dashboard_page).
+    """
 
-    if active_tab == "live":
-        display_projects = published_projects_list
-    elif active_tab == "unfinished":
-        display_projects = [p for p in projects if p.state.value != "published"]
-    else:
-        display_projects = projects
+    total_projects = counts["all"]
+    published_count = counts["live"]
+    unfinished_count = counts["unfinished"]
 
-    ITEMS_PER_PAGE = 6
-    total_items = len(display_projects)
-    total_pages = (total_items + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
-    page = max(1, min(page, total_pages)) if total_pages > 0 else 1
-    start_idx = (page - 1) * ITEMS_PER_PAGE
-    paginated_projects = display_projects[start_idx:start_idx + ITEMS_PER_PAGE]
+    total_pages = (counts[active_tab] + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
 
     # ── Page header ───────────────────────────────────────────────────────────
     page_header = Div(
@@ -107,7 +102,7 @@ def dashboard_page(user, projects, show_new_button=True, active_tab="unfinished"
     # ── Cards ─────────────────────────────────────────────────────────────────
     cards = []
 
-    if not projects:
+    if not total_projects:
         cards.append(Div(
             Div("✨", style="font-size:2.5rem;margin-bottom:0.75rem"),
             H3("Build your first website", style="margin-bottom:0.5rem;color:var(--color-text)"),
@@ -117,13 +112,13 @@ def dashboard_page(user, projects, show_new_button=True, active_tab="unfinished"
               style="text-decoration:none;display:inline-block"),
             cls="pc-empty",
         ))
-    elif not paginated_projects:
+    elif not projects:
         cards.append(Div(
             P("No pages in this category.", style="color:var(--color-text-light);font-style:italic"),
             cls="pc-empty",
         ))
     else:
-        for p in paginated_projects:
+        for p in projects:
             brand = p.brand_memory
             name = brand.business_name if brand else "Untitled"
             industry = brand.services[0] if brand and brand.services else ""
@@ -6,7 +6,7 @@ from fasthtml.common import (
 )
 from user_app.frontend.layout import page_layout
 from core.raw_template.loader import get_raw_template
-from core.raw_template.slot_analyzer import analyze_slots
+from core.raw_template.slot_analyzer import template_slots
 
 
 def _img_dims(asset_path: str) -> str | None:
@@ -66,7 +66,7 @@ _ORIENT_HINT = {
 
 def image_upload_page(user, project) -> object:
     tpl   = get_raw_template(project.template_id) if project.template_id else None
-    slots = analyze_slots(tpl["html_path"]) if tpl else []
+    slots = template_slots(tpl) if tpl else []
 
     # Already-uploaded stems
     uploaded = {}
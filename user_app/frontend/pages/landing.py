@@ -835,7 +835,7 @@ def _pain_vs_orbit():
 
 
 def _showcase_section():
-    from core.raw_template.loader import get_template_srcdoc
+    from core.raw_template.loader import get_raw_template
 
     _CARDS = [
         ("technology/technology_four",  "Tech & SaaS",        "Modern SaaS Landing",  "Clean feature grids, trust signals, and CTAs that convert visitors into users."),
@@ -847,17 +847,22 @@ def _showcase_section():
     ]
 
     def sc_card(tpl_id, category, title, desc):
+        tpl = get_raw_template(tpl_id)
+        thumb = tpl["thumb_url"] if tpl else None
+        rendered = bool(tpl and tpl["thumb_rendered"])
         return Div(
             Div(
                 Div(
+                    Img(src=thumb, alt="", cls="sc-card-poster", loading="lazy", decoding="async") if thumb else "",
                     Iframe(
-                        srcdoc=get_template_srcdoc(tpl_id),
+                        data_src=f"/tpl-card/{tpl_id}",
                         cls="sc-card-iframe",
                         tabindex="-1",
                         scrolling="no",
                         sandbox="allow-same-origin",
                     ),
                     cls="sc-iframe-wrap",
+                    data_lazy="hover" if rendered else "view",
                 ),
                 cls="sc-card-thumb",
             ),
@@ -884,11 +889,39 @@ def _showcase_section():
     function scaleAll() {
         document.querySelectorAll('.sc-iframe-wrap').forEach(scaleWrap);
     }
-    document.addEventListener('DOMContentLoaded', scaleAll);
-    window.addEventListener('resize', scaleAll);
-    document.querySelectorAll('.sc-card-iframe').forEach(function (f) {
-        f.addEventListener('load', function () { scaleWrap(f.parentElement); });
+    // Load a card's live preview once it nears the viewport (the poster shows until then)
+    function loadPreview(wrap) {
+        var f = wrap.querySelector('.sc-card-iframe');
+        if (!f || f.getAttribute('src') || !f.dataset.src) return;
+        f.addEventListener('load', function () {
+            scaleWrap(wrap);
+            f.classList.add('sc-card-iframe--loaded');
+        });
+        scaleWrap(wrap);
+        f.src = f.dataset.src;
+    }
+    document.addEventListener('DOMContentLoaded', function () {
+        scaleAll();
+        var wraps = document.querySelectorAll('.sc-iframe-wrap');
+        wraps.forEach(function (wrap) {
+            wrap.closest('.sc-card').addEventListener('mouseenter', function () { loadPreview(wrap); });
+        });
+        // Cards with a pre-rendered thumbnail wait for hover
+        var inView = document.querySelectorAll('.sc-iframe-wrap[data-lazy="view"]');
+        if (!('IntersectionObserver' in window)) {
+            inView.forEach(loadPreview);
+            return;
+        }
+        var observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (!entry.isIntersecting) return;
+                observer.unobserve(entry.target);
+                loadPreview(entry.target);
+            });
+        }, { rootMargin: '300px 0px' });
+        inView.forEach(function (wrap) { observer.observe(wrap); });
     });
+    window.addEventListener('resize', scaleAll);
 })();
 """))
 
@@ -379,6 +379,7 @@ def onboarding_page(user, project):
             live_js,
             method="post", action=f"/pages/{pid}/braindump",
             cls="ob-wizard-panel",
+            data_live_preview=f"/pages/{pid}/live-preview",
         )
         content = Div(panel, form, cls="ob-split")
     else:
@@ -4,7 +4,7 @@ from fasthtml.common import (
     Div, H1, H3, P, A, Span, Form, Button, Input, Img, Script, Safe, Iframe,
 )
 
-from core.raw_template.loader import list_raw_templates, CATEGORY_META, get_template_srcdoc
+from core.raw_template.loader import list_raw_templates, CATEGORY_META
 from user_app.frontend.layout import sidebar_layout
 
 
@@ -14,9 +14,12 @@ def _template_card(t: dict, show_new: bool) -> Div:
     thumb    = t["thumb_url"]
     card_cls = "tpl-card tpl-card--selectable" if show_new else "tpl-card tpl-card--locked"
 
+    # A poster image first; the live preview (a cacheable /tpl-card/ document) loads
+    # on hover — or, without a pre-rendered thumbnail, once the card nears the viewport
     thumb_el = Div(
+        Img(src=thumb, alt="", cls="tpl-card-poster", loading="lazy", decoding="async") if thumb else "",
         Iframe(
-            srcdoc=get_template_srcdoc(t["id"]),  # inline HTML — zero extra HTTP requests
+            data_src=f"/tpl-card/{t['id']}",
             cls="tpl-card-iframe",
             tabindex="-1",
             scrolling="no",
@@ -24,6 +27,7 @@ def _template_card(t: dict, show_new: bool) -> Div:
             sandbox="allow-same-origin",
         ),
         cls="tpl-iframe-wrap",
+        data_lazy="hover" if t["thumb_rendered"] else "view",
     )
 
     preview_url = f"/tpl-preview/{t['id']}"
@@ -159,14 +163,38 @@ def template_picker_page(user, show_new: bool = True) -> object:
     document.querySelectorAll('.tpl-iframe-wrap').forEach(scaleWrap);
   }
 
-  // Scale immediately (srcdoc iframes render synchronously)
-  scaleAll();
-
-  // Re-scale after each iframe's load event (images inside may shift layout)
-  document.querySelectorAll('.tpl-card-iframe').forEach(function (iframe) {
+  // Point a card's iframe at its preview document (once); fade it in over the poster
+  function loadPreview(wrap) {
+    var iframe = wrap.querySelector('.tpl-card-iframe');
+    if (!iframe || iframe.getAttribute('src') || !iframe.dataset.src) return;
     iframe.addEventListener('load', function () {
-      scaleWrap(iframe.parentElement);
+      scaleWrap(wrap);
+      iframe.classList.add('tpl-card-iframe--loaded');
     });
+    scaleWrap(wrap);
+    iframe.src = iframe.dataset.src;
+  }
+
+  var wraps  = document.querySelectorAll('.tpl-iframe-wrap');
+  // Cards with a pre-rendered thumbnail only load the live preview on hover
+  var inView = document.querySelectorAll('.tpl-iframe-wrap[data-lazy="view"]');
+  if ('IntersectionObserver' in window) {
+    // Cards hidden by a category filter never intersect, so they never load
+    var observer = new IntersectionObserver(function (entries) {
+      entries.forEach(function (entry) {
+        if (!entry.isIntersecting) return;
+        observer.unobserve(entry.target);
+        loadPreview(entry.target);
+      });
+    }, { rootMargin: '200px 0px' });
+    inView.forEach(function (wrap) { observer.observe(wrap); });
+  } else {
+    inView.forEach(loadPreview);
+  }
+
+  // Hovering a card loads its preview straight away
+  wraps.forEach(function (wrap) {
+    wrap.closest('.tpl-card').addEventListener('mouseenter', function () { loadPreview(wrap); });
   });
 
   window.addEventListener('resize', scaleAll);
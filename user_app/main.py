@@ -6,6 +6,7 @@ Start with: python user_app/main.py
 import logging
 import os
 import sys
+import threading
 import json as _json
 import urllib.request
 import urllib.parse as _urlparse
@@ -25,8 +26,9 @@ from starlette.middleware import Middleware
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.responses import JSONResponse, FileResponse
 
-from config.settings import TURNSTILE_SECRET_KEY
+from config.settings import TEMPLATE_SKELETON_CACHE, TURNSTILE_SECRET_KEY
 from user_app.auth.guards import auth_beforeware
+from user_app import db
 from user_app.auth.login import get_or_create_user
 from user_app.frontend.pages.login import login_page
 from user_app.frontend.pages.landing import landing_page
@@ -45,6 +47,8 @@ bw = Beforeware(
         r'/sites/.*',
         r'/raw-asset/.*',
         r'/tpl-preview/.*',
+        r'/tpl-card/.*',
+        r'/tpl-thumb/.*',
         r'/landing',
         r'/login',
         r'/api/auth/.*',
@@ -93,6 +97,12 @@ async def get(req):
         checks["templates"] = f"error: {exc}"
         healthy = False
 
+    from user_app.middleware.rate_limiter import rate_limit_stats
+    from core.limits.rate_limits import stats as ai_rate_limit_stats
+    checks["rate_limits"] = {"requests": rate_limit_stats(), "ai_calls": ai_rate_limit_stats()}
+
+    checks["cache"] = db.cache_stats()
+
     return JSONResponse(
         {"status": "ok" if healthy else "error", **checks},
         status_code=200 if healthy else 503,
@@ -265,6 +275,16 @@ async def post(req, page_id: str):
     return await pages.braindump(req, page_id)
 
 
+@rt("/pages/{page_id}/live-preview")
+async def get(req, page_id: str):
+    return await pages.live_preview(req, page_id)
+
+
+@rt("/pages/{page_id}/rewrite-stream")
+async def get(req, page_id: str):
+    return await pages.rewrite_stream(req, page_id)
+
+
 @rt("/pages/{page_id}/assets")
 async def post(req, page_id: str):
     return await pages.upload_asset(req, page_id)
@@ -381,23 +401,66 @@ async def get(req, rest: str):
 def get(req, tpl_id: str):
     return template_preview.serve(tpl_id)
 
+
+@rt("/tpl-card/{tpl_id:path}")
+def get(req, tpl_id: str):
+    return template_preview.serve_card(req, tpl_id)
+
+
+@rt("/tpl-thumb/{name}")
+def get(req, name: str):
+    return template_preview.serve_thumb(name)
+
 # --- Start ---
 
 def _warmup_caches() -> None:
-    """Pre-warm all LRU caches so the first real user request is fast."""
+    """
+    Load the template list (one read of the build-time manifest) and map the
+    shared template blob, then warm the asset manifest in the background —
+    plus, without a blob, as many of this worker's template skeletons as its
+    LRU keeps (TEMPLATE_SKELETON_CACHE); parsing more would only be evicted.
+    """
     try:
-        from core.raw_template.loader import list_raw_templates, read_template_html
-        from core.raw_template.slot_analyzer import analyze_slots
+        from core.raw_template.loader import list_raw_templates
+        from core.raw_template.template_blob import template_blob
         templates = list_raw_templates()
-        for tpl in templates:
-            read_template_html(tpl["html_path"])
-            analyze_slots(tpl["html_path"])
-        _log.info("[startup] Warmed caches for %d raw templates", len(templates))
+        blob = template_blob()
     except Exception as exc:
-        _log.warning("[startup] Cache warmup failed (non-fatal): %s", exc)
+        _log.warning("[startup] Template list failed (non-fatal): %s", exc)
+        return
+    if blob is not None:
+        _log.info("[startup] Using shared template blob: %s", blob.stats())
+
+    def _warm() -> None:
+        try:
+            from core.raw_template.asset_manifest import get_manifest
+            from core.raw_template.derivatives import start_background_build
+            from core.raw_template.skeleton import get_skeleton
+            get_manifest()
+            if blob is None:
+                warm = templates[:TEMPLATE_SKELETON_CACHE]
+                for tpl in warm:
+                    get_skeleton(tpl)
+                _log.info("[startup] Warmed skeletons for %d of %d raw templates", len(warm), len(templates))
+            start_background_build()
+        except Exception as exc:
+            _log.warning("[startup] Cache warmup failed (non-fatal): %s", exc)
+
+    threading.Thread(target=_warm, name="cache-warmup", daemon=True).start()
 
 
+if __name__ == "__main__":
+    from config.settings import TEMPLATE_PRELOAD
+    if TEMPLATE_PRELOAD:
+        # Master process: write the shared template blob before uvicorn starts any worker
+        try:
+            from core.raw_template.template_blob import preload_templates
+            preload_templates()
+        except Exception as exc:
+            _log.warning("[startup] Template preload failed (non-fatal): %s", exc)
+
 _warmup_caches()
+db.start_cache_sweeper()
 
 
 if __name__ == "__main__":
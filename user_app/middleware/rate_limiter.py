@@ -1,36 +1,29 @@
-"""In-memory sliding window rate limiter.
+"""Sliding window rate limiter for expensive and public-facing endpoints.
 
-No Redis — single-process, state resets on server restart.
-Used to protect expensive and public-facing endpoints from flooding.
+State lives in the backend chosen by RATE_LIMIT_BACKEND (see
+core/limits/backends.py): in process memory by default, or in a store
+shared by every worker (SQLite on one host, Redis across hosts).
+In-memory keys are capped (RATE_LIMIT_MAX_KEYS) and idle ones swept.
 """
 
-import time
-from collections import defaultdict
-
 from fasthtml.common import Response
 
-# {key: [monotonic_timestamp, ...]}
-_store: dict[str, list[float]] = defaultdict(list)
+from core.limits.backends import make_backend
+
+_limiter = make_backend("req")
 
 
 def is_rate_limited(key: str, limit: int, window_seconds: int) -> bool:
-    """Sliding window check. Returns True if the key has exceeded the limit.
+    """Returns True if the key has exceeded the limit.
 
-    Side-effect: records this request if under the limit.
+    Side-effect: records this request.
     """
-    now = time.monotonic()
-    cutoff = now - window_seconds
-    history = _store[key]
-
-    # Prune entries outside the window
-    while history and history[0] < cutoff:
-        history.pop(0)
+    return _limiter.hit(key, limit, window_seconds)
 
-    if len(history) >= limit:
-        return True
 
-    history.append(now)
-    return False
+def rate_limit_stats() -> dict:
+    """Key count / memory / eviction metrics for the request limiter."""
+    return _limiter.stats()
 
 
 def rate_limit_response(message: str = "Too many requests. Please slow down.") -> Response:
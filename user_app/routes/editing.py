@@ -105,7 +105,7 @@ async def edit_html(req, page_id: str):
         return error_page("HTML content cannot be empty")
 
     project.site_version.html = new_html
-    db.save_project(project)
+    db.save_project(project, fields=("site_version",))
 
     return RedirectResponse(f"/pages/{page_id}/edit?tab=html", status_code=303)
 
@@ -1,14 +1,11 @@
-from asyncio import to_thread as _to_thread
-
 from fasthtml.common import RedirectResponse, Response
 
 from core.errors import CoreError
 from user_app import db
 from user_app.routes import error_page
 from user_app.services.ai_service import (
-    run_planner_for_project,
-    run_generator_for_project,
-    run_generate_and_render,
+    run_generator_for_project_async,
+    run_generate_and_render_async,
 )
 from user_app.services.project_service import approve_plan, move_to_preview
 
@@ -21,7 +18,7 @@ async def run_planner(req, page_id: str):
         return error_page("Page not found", 404)
 
     try:
-        await _to_thread(run_generate_and_render, project, user)
+        await run_generate_and_render_async(project, user)
     except CoreError as e:
         return error_page(str(e))
 
@@ -55,7 +52,7 @@ async def run_generator(req, page_id: str):
         return error_page("Page not found", 404)
 
     try:
-        await _to_thread(run_generator_for_project, project, user)
+        await run_generator_for_project_async(project, user)
     except CoreError as e:
         return error_page(str(e))
 
@@ -13,18 +13,18 @@ from core.state_machine.states import ProjectState
 from core.billing.trial import days_remaining as trial_days_remaining
 from config.settings import SUPABASE_ASSETS_BUCKET
 from core.errors import CoreError
-from core.raw_template.loader import read_template_html
 from user_app import db
 from user_app.routes import error_page
 from core.billing.entitlements import can_generate_site, next_credit_type
 from user_app.middleware.rate_limiter import is_rate_limited, rate_limit_response
+from user_app.services import rewrite_progress
+from user_app.services.publish_service import unexport_static
 from user_app.services.project_service import (
     create_project_for_user,
-    get_user_projects,
     save_brand_memory,
     move_to_preview,
 )
-from user_app.frontend.pages.dashboard import dashboard_page
+from user_app.frontend.pages.dashboard import ITEMS_PER_PAGE, dashboard_page
 from user_app.frontend.pages.onboarding import onboarding_page, waiting_for_plan_page
 from user_app.frontend.pages.plan_review import plan_review_page
 from user_app.frontend.pages.generating import generating_page
@@ -49,18 +49,22 @@ async def get_brand_details(req, page_id: str):
 
 def dashboard(req):
     user = req.scope["user"]
-    projects = get_user_projects(user)
 
     # Extract query params
     tab = req.query_params.get("tab", "unfinished")
+    if tab not in db.DASHBOARD_TABS:
+        tab = "all"
     try:
         page = int(req.query_params.get("page", "1"))
     except ValueError:
         page = 1
 
+    # Only the visible page and the tab counts are fetched
+    projects, counts, page = db.get_dashboard_page(user.id, tab, page, ITEMS_PER_PAGE)
+
     # Always show dashboard to allow creating new pages/managing existing ones
     show_new = can_generate_site(user)
-    return dashboard_page(user, projects, show_new_button=show_new, active_tab=tab, page=page)
+    return dashboard_page(user, projects, counts, show_new_button=show_new, active_tab=tab, page=page)
 
 
 def show_user_profile(req):
@@ -87,7 +91,7 @@ async def create_page(req):
         return error_page(str(e))
     if preferred_template_id:
         project.template_id = preferred_template_id
-        db.save_project(project)
+        db.save_project(project, fields=("template_id",))
     # Raw-template flow goes to image upload first
     from core.raw_template.loader import get_raw_template
     if preferred_template_id and get_raw_template(preferred_template_id):
@@ -232,6 +236,7 @@ async def delete_page(req, page_id: str):
         return error_page("Page not found", 404)
 
     db.delete_project(page_id)
+    unexport_static(page_id)
     return RedirectResponse("/pages", status_code=303)
 
 
@@ -320,7 +325,7 @@ async def upload_asset(req, page_id: str):
     else:
         project.brand_memory.labeled_assets.extend(new_assets)
 
-    db.save_project(project)
+    db.save_project(project, fields=("brand_memory",))
 
     # Return all asset cards (full replace via hx-swap="innerHTML")
     from user_app.frontend.pages.onboarding import render_asset_card
@@ -344,7 +349,7 @@ async def delete_asset(req, page_id: str):
     project.brand_memory.labeled_assets = [
         a for a in project.brand_memory.labeled_assets if a.url != url
     ]
-    db.save_project(project)
+    db.save_project(project, fields=("brand_memory",))
 
     # Try to delete from storage (best-effort)
     try:
@@ -419,7 +424,7 @@ _RIGHTS_RE = __import__("re").compile(
 )
 
 
-def _strip_contact_text(html: str, memory) -> str:
+def _strip_contact_texts(texts: dict[str, str], memory) -> dict[str, str]:
     """Remove contact values, tagline, and copyright lines the AI placed into template text nodes."""
     import re
     vals = [v.strip() for v in [
@@ -429,8 +434,7 @@ def _strip_contact_text(html: str, memory) -> str:
         getattr(memory, "tagline", "") or "",
     ] if v.strip()]
 
-    def _clean(m):
-        text = m.group(1)
+    def _clean(text: str) -> str:
         cleaned = text
 
         # Remove contact values and tagline
@@ -446,10 +450,10 @@ def _strip_contact_text(html: str, memory) -> str:
         cleaned = re.sub(r"^[\s|·•\-–—,/\\]+", "", cleaned)
 
         if not cleaned or len(cleaned) < 2:
-            return "><"
-        return f">{cleaned}<"
+            return ""
+        return cleaned
 
-    return re.sub(r">([^<>]{2,})<", _clean, html)
+    return {key: _clean(text) if isinstance(text, str) else text for key, text in texts.items()}
 
 
 def _build_contact_footer(memory, primary_color: str) -> str:
@@ -646,11 +650,9 @@ async def braindump(req, page_id: str):
 
     credit_type = next_credit_type(user)
 
-    from pathlib import Path
-    from asyncio import to_thread as _to_thread
     from core.raw_template.loader import get_raw_template
-    from core.raw_template.rewriter import rewrite_html
-    from core.raw_template.assembler import assemble
+    from core.raw_template.rewriter import rewrite_texts_stream
+    from core.raw_template.skeleton import get_skeleton
     from core.models.site_version import SiteVersion
     from core.state_machine.engine import transition
     from core.state_machine.states import ProjectState as PS
@@ -663,45 +665,56 @@ async def braindump(req, page_id: str):
         # 1. Save brand memory
         save_brand_memory(project, memory)
 
-        # 2. Read original HTML
-        html = read_template_html(raw_tpl["html_path"])
+        # 2. Precompiled template: text slots, image slots, inlined CSS/JS (built once per template)
+        skeleton = get_skeleton(raw_tpl)
+
+        # 3. Build image map from uploaded assets
+        image_map: dict[str, str] = {a.label: a.url for a in (memory.labeled_assets or [])}
+        log.info("[braindump] %s — image_map keys: %s", page_id, list(image_map.keys()))
+
+        # 4. AI rewrites text content, streamed into the live preview — 80 s hard cap.
+        #    On timeout/failure keep whatever texts already arrived (else the original).
+        rewrite_progress.start(page_id, user.id, _live_preview_html(
+            skeleton, image_map, primary_color, secondary_color, page_id,
+        ))
+        received: dict[str, str] = {}
+
+        def _on_pair(key: str, text: str) -> None:
+            received[key] = text
+            rewrite_progress.push(page_id, key, text)
 
-        # 3. AI rewrites text content — 80 s hard cap; falls back to original on any failure
         try:
             rewritten = await asyncio.wait_for(
-                _to_thread(rewrite_html, html, memory),
+                rewrite_texts_stream(skeleton.chunks, memory, _on_pair, template_id=raw_tpl["id"]),
                 timeout=80,
             )
         except asyncio.TimeoutError:
-            log.warning("[braindump] %s — rewrite_html timed out, using original HTML", page_id)
-            rewritten = html
+            log.warning("[braindump] %s — rewrite timed out after %d texts", page_id, len(received))
+            rewritten = received
         except Exception as exc:
-            log.warning("[braindump] %s — rewrite_html failed (%s), using original HTML", page_id, exc)
-            rewritten = html
-
-        # 3b. Remove contact info from plain text nodes so it doesn't show raw
-        rewritten = _strip_contact_text(rewritten, memory)
-
-        # 4. Build image map from uploaded assets
-        image_map: dict[str, str] = {a.label: a.url for a in (memory.labeled_assets or [])}
-        log.info("[braindump] %s — image_map keys: %s", page_id, list(image_map.keys()))
-
-        # 5. Inject images + inline CSS/JS → self-contained HTML
-        final_html = assemble(
-            raw_tpl, rewritten, image_map,
+            log.warning("[braindump] %s — rewrite failed (%s) after %d texts", page_id, exc, len(received))
+            rewritten = received
+        finally:
+            rewrite_progress.finish(page_id)
+
+        # 4b. Remove contact info from text nodes so it doesn't show raw
+        texts = _strip_contact_texts({**skeleton.texts, **rewritten}, memory)
+
+        # 5. Splice texts, images, inlined CSS/JS and the contact footer (if any)
+        #    into the skeleton in a single pass
+        page = skeleton.build(
+            texts, image_map,
             primary_color=primary_color,
             secondary_color=secondary_color,
+            body_extra=_build_contact_footer(memory, primary_color),
         )
+        final_html = page.html()
+        log.info("[braindump] %s — assembled %s", page_id, page.byte_counts())
 
-        # 6. Inject styled contact footer if any contact info was provided
-        contact_html = _build_contact_footer(memory, primary_color)
-        if contact_html:
-            final_html = final_html.replace("</body>", contact_html + "\n</body>", 1)
-
-        # 7. Store and transition to PREVIEW
+        # 6. Store and transition to PREVIEW
         project.site_version = SiteVersion(html=final_html, css="", version=1)
         transition(project, PS.SITE_GENERATED)
-        db.save_project(project)
+        db.save_project(project, fields=("site_version", "state"))
         move_to_preview(project)
 
     except CoreError as e:
@@ -718,3 +731,80 @@ async def braindump(req, page_id: str):
     # db.update_project_trial(page_id, trial_ends_at=trial_ends)
 
     return RedirectResponse(f"/pages/{page_id}", status_code=303)
+
+
+# ── Live braindump preview ──────────────────────────────────────────────────
+
+_LIVE_PREVIEW_JS = """<style>[data-ok-t]{transition:background-color .6s}
+[data-ok-t].ok-t-new{background-color:rgba(37,99,235,.18)}</style>
+<script>(function(){
+  if(!window.EventSource)return;
+  var es=new EventSource("/pages/%s/rewrite-stream");
+  es.addEventListener("pair",function(e){
+    var d=JSON.parse(e.data);
+    document.querySelectorAll('[data-ok-t="'+d.key+'"]').forEach(function(el){
+      el.textContent=d.value;el.classList.add("ok-t-new");
+      setTimeout(function(){el.classList.remove("ok-t-new");},900);
+    });
+  });
+  es.addEventListener("done",function(){es.close();});
+})();</script>"""
+
+_LIVE_WAITING_HTML = (
+    '<!DOCTYPE html><html><head><meta http-equiv="refresh" content="1"></head>'
+    '<body style="font-family:system-ui,sans-serif;color:#64748b;display:flex;'
+    'align-items:center;justify-content:center;height:90vh;margin:0">'
+    '<p>Preparing your preview…</p></body></html>'
+)
+
+
+def _live_preview_html(skeleton, image_map, primary_color, secondary_color, page_id) -> str:
+    """Rendered template with keyed text spans + the SSE client that fills them in."""
+    return skeleton.render(
+        skeleton.keyed_texts(), image_map,
+        primary_color=primary_color,
+        secondary_color=secondary_color,
+        body_extra=_LIVE_PREVIEW_JS % page_id,
+    )
+
+
+async def live_preview(req, page_id: str):
+    """GET /pages/{id}/live-preview — the braindump overlay iframe. Polls until a rewrite starts."""
+    user = req.scope["user"]
+    job = rewrite_progress.get(page_id)
+    if job is None or job.user_id != user.id:
+        return Response(_LIVE_WAITING_HTML, media_type="text/html",
+                        headers={"Cache-Control": "no-store"})
+    return Response(job.preview_html, media_type="text/html",
+                    headers={"Cache-Control": "no-store"})
+
+
+async def rewrite_stream(req, page_id: str):
+    """GET /pages/{id}/rewrite-stream — SSE feed of rewritten texts for the live preview."""
+    import json as _json
+    from starlette.responses import StreamingResponse
+
+    user = req.scope["user"]
+    job = rewrite_progress.get(page_id)
+    if job is None or job.user_id != user.id:
+        # 204 tells EventSource not to reconnect
+        return Response(status_code=204)
+
+    async def _events():
+        sent = 0
+        while True:
+            while sent < len(job.pairs):
+                key, text = job.pairs[sent]
+                sent += 1
+                yield f"event: pair\ndata: {_json.dumps({'key': key, 'value': text})}\n\n"
+            if job.done:
+                yield "event: done\ndata: {}\n\n"
+                return
+            if await req.is_disconnected():
+                return
+            await asyncio.sleep(0.2)
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
@@ -1,10 +1,7 @@
-import hashlib
-
 from fasthtml.common import RedirectResponse, Response
 
 from core.errors import CoreError
 from core.publishing.pauser import should_pause_site, get_paused_html
-from core.publishing.renderer import render_final_page
 from user_app import db
 from user_app.routes import error_page
 from user_app.middleware.rate_limiter import is_rate_limited, rate_limit_response
@@ -30,32 +27,25 @@ async def view_published(req, page_id: str):
     ip = req.client.host if req.client else "unknown"
     if is_rate_limited(f"site:{ip}", limit=120, window_seconds=60):
         return rate_limit_response("Too many requests.")
-    row = db.get_project_row(page_id)
-    if row is None:
-        return Response("Not found", status_code=404)
-
-    if row["state"] != "published":
-        return Response("Site not published", status_code=404)
 
     # TESTING MODE — trial enforcement disabled
 
-    # Serve the published site directly
-    project = db.get_project(page_id)
-    if project is None or project.site_version is None or not project.site_version.html:
-        return Response("Published site not found", status_code=404)
-
-    rendered = render_final_page(project.site_version.html, project.site_version.css or "")
-    etag = f'"{hashlib.md5(rendered.encode()).hexdigest()}"'
-
-    if_none_match = req.headers.get("if-none-match", "")
-    if if_none_match == etag:
-        return Response(status_code=304)
-
-    return Response(
-        rendered,
-        media_type="text/html",
-        headers={
-            "Cache-Control": "public, max-age=3600",
-            "ETag": etag,
-        },
-    )
+    # Serve the published site: rendered, ETagged and compressed once per version,
+    # read from the local published store — no page row or Project load
+    artifact = db.get_site_artifact(page_id)
+    if artifact is None:
+        return Response("Site not published", status_code=404)
+
+    coding, body = artifact.negotiate(req.headers.get("accept-encoding", ""))
+    headers = {
+        "Cache-Control": "public, max-age=3600",
+        "ETag": artifact.etag_for(coding),
+        "Vary": "Accept-Encoding",
+    }
+    if artifact.matches(req.headers.get("if-none-match", ""), coding):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        # Already encoded — GZipMiddleware leaves responses with Content-Encoding alone
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type="text/html", headers=headers)
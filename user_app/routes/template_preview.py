@@ -1,30 +1,81 @@
-"""Serve a raw template as a full-page preview (public, no auth required)."""
+"""Serve raw templates as full-page previews and picker cards (public, no auth required)."""
 
 from functools import lru_cache
-from starlette.responses import HTMLResponse, Response
+from starlette.responses import FileResponse, HTMLResponse, Response
 
-from core.raw_template.loader import get_raw_template, read_template_html
+from core.publishing.artifacts import SiteArtifact, encode_site
+from core.raw_template.loader import (
+    CARD_IMAGE_WIDTH,
+    build_preview_html,
+    get_raw_template,
+    get_template_srcdoc,
+)
+from core.raw_template.template_blob import template_blob
+from core.raw_template.thumbnails import thumbnail_path
 
 _CACHE_HEADERS = {
     "Cache-Control": "public, max-age=3600, stale-while-revalidate=86400",
 }
 
 
+def _preview_html(tpl_id: str, html_path: str) -> memoryview | str:
+    """A zero-copy view into the shared template blob when preloaded, else built once per template."""
+    blob = template_blob()
+    html = blob.view(f"preview/{tpl_id}") if blob is not None else None
+    return html if html is not None else _build_preview_html(tpl_id, html_path)
+
+
 @lru_cache(maxsize=256)
 def _build_preview_html(tpl_id: str, html_path: str) -> str:
-    """Read + base-tag inject — cached per template, file never changes at runtime."""
-    html = read_template_html(html_path)
-    base_tag = f'<base href="/raw-asset/{tpl_id}/">'
-    if "<head>" in html:
-        return html.replace("<head>", f"<head>{base_tag}", 1)
-    if "<HEAD>" in html:
-        return html.replace("<HEAD>", f"<HEAD>{base_tag}", 1)
-    return base_tag + html
+    return build_preview_html(tpl_id, html_path)
 
 
 def serve(tpl_id: str):
     tpl = get_raw_template(tpl_id)
     if not tpl:
         return Response("Template not found", status_code=404)
-    html = _build_preview_html(tpl_id, tpl["html_path"])
+    html = _preview_html(tpl_id, tpl["html_path"])
     return HTMLResponse(html, headers=_CACHE_HEADERS)
+
+
+@lru_cache(maxsize=256)
+def _card_artifact(tpl_id: str) -> SiteArtifact:
+    """
+    Self-contained card document, ETagged and compressed once per template —
+    zero-copy views into the shared template blob when preloaded.
+    """
+    blob = template_blob()
+    etag = blob.meta.get(f"card/{tpl_id}") if blob is not None else None
+    if etag is not None:
+        bodies = {
+            coding: blob.view(f"card/{tpl_id}/{coding}")
+            for coding in ("identity", "gzip", "br")
+            if f"card/{tpl_id}/{coding}" in blob
+        }
+        return SiteArtifact(version=0, etag=etag, bodies=bodies)
+    return encode_site(get_template_srcdoc(tpl_id, image_width=CARD_IMAGE_WIDTH), 0)
+
+
+def serve_card(req, tpl_id: str):
+    """The document a picker/showcase card iframe loads once it scrolls into view."""
+    if not get_raw_template(tpl_id):
+        return Response("Template not found", status_code=404)
+    artifact = _card_artifact(tpl_id)
+
+    coding, body = artifact.negotiate(req.headers.get("accept-encoding", ""))
+    headers = {**_CACHE_HEADERS, "ETag": artifact.etag_for(coding), "Vary": "Accept-Encoding"}
+    if artifact.matches(req.headers.get("if-none-match", ""), coding):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type="text/html", headers=headers)
+
+
+def serve_thumb(name: str):
+    """A pre-rendered template thumbnail — content-addressed, so cached for good."""
+    path = thumbnail_path(name)
+    if path is None:
+        return Response("Not found", status_code=404)
+    return FileResponse(path, media_type="image/webp",
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
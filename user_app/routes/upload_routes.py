@@ -1,9 +1,9 @@
 """Routes for raw-template image upload and asset serving."""
 
+import asyncio
 import io
 import logging
 import uuid
-from pathlib import Path
 
 log = logging.getLogger(__name__)
 
@@ -13,22 +13,23 @@ from starlette.responses import FileResponse
 
 from config.settings import SUPABASE_ASSETS_BUCKET
 from core.models.brand_memory import BrandMemory, LabeledAsset
+from core.publishing.artifacts import coding_etag, etag_matches, pick_coding
+from core.raw_template import derivatives
+from core.raw_template.asset_manifest import get_manifest
 from core.raw_template.loader import get_raw_template
-from core.raw_template.slot_analyzer import analyze_slots
+from core.raw_template.slot_analyzer import template_slots
 from core.state_machine.engine import transition
 from core.state_machine.states import ProjectState
 from user_app import db
 from user_app.routes import error_page
 from user_app.frontend.pages.image_upload import image_upload_page
 
-_TEMPLATE_BASE = Path(__file__).parent.parent.parent / "template"
-
 
 def _advance_past_upload(project) -> None:
     """Mark the upload step as done by advancing DRAFT → INPUT_READY, then save."""
     if project.state == ProjectState.DRAFT:
         transition(project, ProjectState.INPUT_READY)
-    db.save_project(project)
+    db.save_project(project, fields=("brand_memory", "state"))
 
 
 # ── GET /pages/{page_id}/upload ─────────────────────────────────────────────
@@ -67,7 +68,7 @@ async def handle_upload(req, page_id: str):
         return RedirectResponse(f"/pages/{page_id}", status_code=303)
 
     # Build full list of individual image stems from the template
-    slots = analyze_slots(tpl["html_path"])
+    slots = template_slots(tpl)
     all_stems = [
         fname.rsplit(".", 1)[0]
         for slot in slots
@@ -142,30 +143,67 @@ async def handle_upload(req, page_id: str):
 # ── GET /raw-asset/{rest:path} ───────────────────────────────────────────────
 
 async def serve_raw_asset(req, rest: str):
-    """Serve static files from the template/ folder (original template assets)."""
-    # Prevent path traversal
-    try:
-        target = (_TEMPLATE_BASE / rest).resolve()
-        _TEMPLATE_BASE.resolve()  # ensure base is resolved
-        if not str(target).startswith(str(_TEMPLATE_BASE.resolve())):
-            return Response("Forbidden", status_code=403)
-    except Exception:
-        return Response("Bad request", status_code=400)
-
-    if not target.exists() or not target.is_file():
+    """
+    Serve static files from the template/ folder (original template assets).
+
+    Only files in the startup manifest are served — that doubles as the
+    path-traversal guard. Strong per-coding ETags, 304s, byte ranges (via
+    FileResponse) and precompressed text bodies. Images are answered with a
+    resized WebP/AVIF derivative when ?w= or the Accept header allows one.
+
+    These URLs aren't fingerprinted — a template file can change under the
+    same path — so originals are revalidated after max-age rather than
+    marked immutable; only content-addressed derivatives are.
+    """
+    entry = get_manifest().get(rest)
+    if entry is None:
         return Response("Not found", status_code=404)
 
-    suffix = target.suffix.lower()
-    media_types = {
-        ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-        ".webp": "image/webp", ".gif": "image/gif", ".svg": "image/svg+xml",
-        ".css": "text/css", ".js": "application/javascript",
-        ".woff": "font/woff", ".woff2": "font/woff2", ".ttf": "font/ttf",
-    }
-    media = media_types.get(suffix, "application/octet-stream")
-    return FileResponse(str(target), media_type=media, headers={
+    headers = {
         "Cache-Control": "public, max-age=86400",
-    })
+        "ETag": entry.etag,
+    }
+    if entry.encodings:
+        headers["Vary"] = "Accept-Encoding"
+
+    if derivatives.resizable(entry):
+        headers["Vary"] = "Accept"
+        choice = derivatives.choose(entry, _width_hint(req), req.headers.get("accept", ""))
+        derived = None
+        if choice is not None:
+            derived = derivatives.cached(entry, *choice) or await asyncio.to_thread(derivatives.ensure, entry, *choice)
+        if derived is not None:
+            headers["Cache-Control"] = "public, max-age=86400, immutable"
+            headers["ETag"] = derived.etag
+            if etag_matches(req.headers.get("if-none-match", ""), derived.etag):
+                return Response(status_code=304, headers=headers)
+            return FileResponse(derived.path, media_type=derived.media_type, headers=headers, stat_result=derived.stat)
+
+    # Ranges are only offered on the identity body
+    coding = "identity"
+    if entry.encodings and "range" not in req.headers:
+        coding = pick_coding(req.headers.get("accept-encoding", ""), entry.encodings)
+    headers["ETag"] = coding_etag(entry.etag, coding)
+    if etag_matches(req.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        return Response(
+            entry.encodings[coding],
+            media_type=entry.media_type,
+            headers={**headers, "Content-Encoding": coding},
+        )
+
+    return FileResponse(entry.path, media_type=entry.media_type, headers=headers, stat_result=entry.stat)
+
+
+def _width_hint(req) -> int | None:
+    """?w= as a positive int, or None."""
+    try:
+        width = int(req.query_params.get("w", ""))
+    except ValueError:
+        return None
+    return width if width > 0 else None
 
 
 def _orientation(w: int, h: int) -> str:
@@ -1,4 +1,12 @@
-from core.ai.gateway import generate_plan, generate_site, generate_and_render
+import asyncio
+
+from core.ai.gateway import (
+    generate_plan,
+    generate_site,
+    generate_and_render,
+    generate_site_async,
+    generate_and_render_async,
+)
 from core.ai.schemas import SitePlan
 from core.models.project import Project
 from core.models.user import User
@@ -42,3 +50,25 @@ def run_generate_and_render(project: Project, user: User) -> SiteVersion:
     site_version = generate_and_render(project, user)
     db.save_project(project)
     return site_version
+
+
+async def run_generator_for_project_async(project: Project, user: User) -> SiteVersion:
+    """Async variant of run_generator_for_project, awaited directly from route handlers.
+
+    The LLM calls are awaited; the Supabase write runs in a thread."""
+    if project.state != ProjectState.PLAN_APPROVED:
+        raise CoreError("Project must be in plan_approved state to generate site")
+    site_version = await generate_site_async(project, user)
+    await asyncio.to_thread(db.save_project, project)
+    return site_version
+
+
+async def run_generate_and_render_async(project: Project, user: User) -> SiteVersion:
+    """Async variant of run_generate_and_render, awaited directly from route handlers.
+
+    The LLM calls are awaited; the Supabase write runs in a thread."""
+    if project.state != ProjectState.MEMORY_READY:
+        raise CoreError("Project must be in memory_ready state to generate")
+    site_version = await generate_and_render_async(project, user)
+    await asyncio.to_thread(db.save_project, project)
+    return site_version
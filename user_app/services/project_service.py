@@ -30,17 +30,17 @@ def save_brand_memory(project: Project, memory: BrandMemory) -> None:
         transition(project, ProjectState.INPUT_READY)
     if project.state == ProjectState.INPUT_READY:
         transition(project, ProjectState.MEMORY_READY)
-    db.save_project(project)
+    db.save_project(project, fields=("brand_memory", "state"))
 
 
 def approve_plan(project: Project) -> None:
     transition(project, ProjectState.PLAN_APPROVED)
-    db.save_project(project)
+    db.save_project(project, fields=("state",))
 
 
 def move_to_preview(project: Project) -> None:
     transition(project, ProjectState.PREVIEW)
-    db.save_project(project)
+    db.save_project(project, fields=("state",))
 
 
 def update_text_content(project: Project, updates: dict[str, str]) -> None:
@@ -56,7 +56,7 @@ def update_text_content(project: Project, updates: dict[str, str]) -> None:
         html = html.replace(old_text, new_text)
 
     project.site_version.html = html
-    db.save_project(project)
+    db.save_project(project, fields=("site_version",))
 
 
 def rerender_site(project: Project) -> None:
@@ -73,4 +73,4 @@ def rerender_site(project: Project) -> None:
         project.brand_memory
     )
     project.site_version = site_version
-    db.save_project(project)
+    db.save_project(project, fields=("site_version",))
@@ -1,4 +1,6 @@
+import logging
 from datetime import datetime, timezone
+from pathlib import Path
 
 from core.models.project import Project
 from core.models.user import User
@@ -6,23 +8,30 @@ from core.state_machine.engine import transition
 from core.state_machine.states import ProjectState
 from core.publishing.validator import validate_for_publish
 from core.publishing.renderer import render_final_page
-from core.publishing.storage import upload_site
+from core.publishing.storage import upload_site, upload_site_encodings
+from core.publishing.artifacts import encode_site
 from core.publishing.urls import get_public_url
+from core.publishing.static_export import export_site, remove_export
 from core.errors import CoreError
-from config.settings import SUPABASE_STORAGE_BUCKET
+from config.settings import SUPABASE_STORAGE_BUCKET, STATIC_EXPORT_PATH, STATIC_EXPORT_BASE_URL
 from user_app import db
 
+log = logging.getLogger(__name__)
+
+_ROOT = Path(__file__).parent.parent.parent
+
 
 def publish_project(project: Project, user: User) -> str:
     """
     Orchestrate the full publish flow:
     1. Validate state + HTML + CSS
     2. Render final page (inline CSS)
-    3. Upload to storage
+    3. Upload to storage (plus gzip/brotli copies)
     4. Record published site
     5. Transition state
     6. Set trial timer
-    7. Persist everything
+    7. Persist everything (which also writes the static export bundle, see export_static)
+    8. Pre-build the encoded page served by view_published
 
     Returns: public URL
     """
@@ -50,6 +59,8 @@ def publish_project(project: Project, user: User) -> str:
     try:
         storage_client = db.get_storage()
         storage_path = upload_site(storage_client, project.id, version, rendered, SUPABASE_STORAGE_BUCKET)
+        # Pre-compressed copies alongside, encoded once here instead of per request
+        upload_site_encodings(storage_client, storage_path, encode_site(rendered, version), SUPABASE_STORAGE_BUCKET)
     except CoreError:
         raise
     except Exception as e:
@@ -75,8 +86,57 @@ def publish_project(project: Project, user: User) -> str:
     transition(project, ProjectState.PUBLISHED)
 
     # 7. Persist project
-    db.save_project(project)
+    db.save_project(project, fields=("state", "published_at", "site_version"))
+
+    # 8. Warm the served artifact so the first public hit is a cache lookup
+    db.get_site_artifact(project.id)
 
     # trial_ends_at is set at generation time in braindump() — not touched here.
 
     return public_url
+
+
+def static_export_root() -> Path | None:
+    """Directory static bundles are written to, or None when export is off."""
+    if STATIC_EXPORT_PATH.lower() in ("", "off", "none"):
+        return None
+    return _ROOT / STATIC_EXPORT_PATH
+
+
+def export_static(page_id: str) -> Path | None:
+    """
+    Export the page exactly as /sites/{page_id} serves it. Best-effort: a
+    failed export is logged and the app keeps serving the page itself.
+
+    Runs after every site_version save of a published page (publish, live
+    edits, re-renders) via db.on_published_site_saved, so `current` never
+    points at HTML the app no longer serves.
+    """
+    root = static_export_root()
+    if root is None:
+        return None
+    artifact = db.get_site_artifact(page_id)
+    if artifact is None:
+        return None
+    try:
+        return export_site(
+            bytes(artifact.bodies["identity"]).decode("utf-8"),
+            page_id,
+            artifact.version,
+            root,
+            _ROOT / "template",
+            base_url=STATIC_EXPORT_BASE_URL,
+        )
+    except (OSError, ValueError) as exc:
+        log.warning("[publish] static export failed for %s: %s", page_id, exc)
+        return None
+
+
+db.on_published_site_saved = export_static
+
+
+def unexport_static(page_id: str) -> None:
+    """Remove a page's static bundles (e.g. when the page is deleted)."""
+    root = static_export_root()
+    if root is not None:
+        remove_export(root, page_id)
@@ -0,0 +1,56 @@
+"""
+In-process registry of running copy rewrites, for the progressive braindump preview.
+
+braindump() registers a job with a keyed preview page, then pushes every
+rewritten text as it streams in; the live-preview iframe follows along over
+SSE. State lives in the worker that runs the generation — if a preview
+request lands on another worker it simply keeps showing the waiting page.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+# Finished jobs stay readable this long so a late SSE client still gets "done".
+_FINISHED_TTL = 120
+
+
+@dataclass
+class RewriteJob:
+    user_id: str
+    preview_html: str
+    pairs: list[tuple[str, str]] = field(default_factory=list)
+    done: bool = False
+    finished_at: float | None = None
+
+
+_jobs: dict[str, RewriteJob] = {}
+
+
+def start(page_id: str, user_id: str, preview_html: str) -> RewriteJob:
+    _sweep()
+    job = RewriteJob(user_id=user_id, preview_html=preview_html)
+    _jobs[page_id] = job
+    return job
+
+
+def push(page_id: str, key: str, text: str) -> None:
+    job = _jobs.get(page_id)
+    if job is not None and not job.done:
+        job.pairs.append((key, text))
+
+
+def finish(page_id: str) -> None:
+    job = _jobs.get(page_id)
+    if job is not None:
+        job.done = True
+        job.finished_at = time.monotonic()
+
+
+def get(page_id: str) -> RewriteJob | None:
+    return _jobs.get(page_id)
+
+
+def _sweep() -> None:
+    cutoff = time.monotonic() - _FINISHED_TTL
+    for page_id in [p for p, j in _jobs.items() if j.finished_at and j.finished_at < cutoff]:
+        _jobs.pop(page_id, None)